@@ -0,0 +1,76 @@
+"""Composite indexes for keyset pagination of validated_predictions
+
+Revision ID: 002_keyset_pagination
+Revises: 001_initial
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002_keyset_pagination'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (validation_date, id) matches the history ordering and its cursor;
+    # user_id first serves the per-user history. Both supersede the
+    # single-column indexes (same leading column).
+    # CONCURRENTLY: no write lock on a large table, outside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_predictions_validation_date_id',
+            'validated_predictions',
+            ['validation_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_predictions_user_id_validation_date_id',
+            'validated_predictions',
+            ['user_id', 'validation_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_predictions_validation_date',
+            table_name='validated_predictions',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_predictions_user_id',
+            table_name='validated_predictions',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_predictions_user_id',
+            'validated_predictions',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_predictions_validation_date',
+            'validated_predictions',
+            ['validation_date'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_predictions_user_id_validation_date_id',
+            table_name='validated_predictions',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_predictions_validation_date_id',
+            table_name='validated_predictions',
+            postgresql_concurrently=True,
+        )
@@ -3,7 +3,7 @@ from typing import Annotated
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError, ExpiredSignatureError
-from ..utils.config import SECRET_KEY, ALGORITHM
+from ..utils.config import SECRET_KEY, ALGORITHM, ADMIN_ROLE
 
 # Configuration du schéma OAuth2 avec l'URL du endpoint de token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -67,3 +67,25 @@ def check_authorization(token: Annotated[str, Depends(oauth2_scheme)]) -> dict:
         )
 
     return payload
+
+
+def check_admin(payload: Annotated[dict, Depends(check_authorization)]) -> dict:
+    """
+    Vérifie que le token JWT appartient à un administrateur.
+
+    Args:
+        payload: Les données décodées du token, injectées par check_authorization
+
+    Returns:
+        dict: Les données décodées du token
+
+    Raises:
+        HTTPException: 403 Forbidden si le rôle n'est pas ADMIN_ROLE
+    """
+    if payload.get("role") != ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="not_authorized",
+        )
+
+    return payload
@@ -7,28 +7,50 @@ de 22 features médicales, en utilisant un modèle XGBoost pré-entraîné.
 RGPD: Les données médicales ne sont JAMAIS persistées.
 """
 
-import os
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from .routers.admin import router as admin_router
 from .routers.predictions import (
-    prediction_engine,
+    prediction_batcher,
+    prediction_memo,
     router as predictions_router,
-    initialize_shap_explainer,
+    validation_writer,
 )
+from .services.executors import inference_executor, shap_executor
+from .services.explanation_store import deferred_explanations
+from .services.metrics import (
+    imputed_features_total,
+    predictions_total,
+    render_gauge,
+    render_histogram,
+    request_duration,
+    stage_duration,
+)
+from .services.model_registry import model_registry
+from .services.prediction_cache import prediction_cache
 from .services.prediction_engine import ModelNotLoadedError
-from .utils.config import MODEL_PATH, SHAP_ENABLED
+from .utils.config import MODEL_REGISTRY_POLL_SECONDS
 from .sql import models
-from .utils.database import engine
+from .utils.database import async_engine, engine
 from app.utils.config import ENVIRONMENT
 
 
-# Les migrations sont gérées par alembic
-if ENVIRONMENT != "production":
-    models.Base.metadata.create_all(bind=engine)
+def create_tables() -> None:
+    """
+    Crée les tables manquantes hors production (les migrations sont gérées
+    par alembic).
+
+    Appelée au démarrage et non à l'import: app.server importe ce module
+    dans le processus maître, qui ne doit garder aucune connexion ouverte au
+    moment du fork.
+    """
+    if ENVIRONMENT != "production":
+        models.Base.metadata.create_all(bind=engine)
 
 
 class PredictionError(Exception):
@@ -42,38 +64,47 @@ async def lifespan(app: FastAPI):
     """
     Gère le cycle de vie de l'application.
 
-    Startup: Charge le modèle XGBoost depuis le chemin configuré.
+    Startup: Charge et préchauffe la version cible du registre de modèles
+    (ou MODEL_PATH à défaut), puis surveille le registre.
     Shutdown: Cleanup si nécessaire.
     """
+    # Lancement direct (uvicorn app.main:app): sinon les tables sont créées
+    # par le processus maître (app.server), qui a déjà chargé le modèle
+    if model_registry.active is None:
+        create_tables()
+
     # Startup: charger le modèle
     try:
-        prediction_engine.load_model(MODEL_PATH)
-    except FileNotFoundError:
-        raise RuntimeError(f"Model file not found: {MODEL_PATH}")
+        if model_registry.active is None:
+            model_registry.load_initial()
+        else:
+            # Modèle chargé par le processus maître (app.server) avant le fork:
+            # ce worker n'accepte des connexions qu'une fois préchauffé
+            model_registry.warm_up_active()
+    except FileNotFoundError as e:
+        raise RuntimeError(f"Model file not found: {e}")
     except Exception as e:
         raise RuntimeError(f"Failed to load model: {e}")
 
-    # Load feature means for imputation
-    try:
-        means_path = os.path.join(os.path.dirname(MODEL_PATH), "feature_means.json")
-        prediction_engine.load_feature_means(means_path)
-    except Exception as e:
-        raise RuntimeError(f"Failed to load feature means: {e}")
+    # Hot reload when the registry target changes
+    model_registry.start_watcher(MODEL_REGISTRY_POLL_SECONDS)
 
-    # Initialize SHAP explainer if enabled
-    if SHAP_ENABLED:
-        try:
-            initialize_shap_explainer()
-        except Exception as e:
-            # SHAP initialization failure is not fatal - log and continue
-            import logging
+    # Start the micro-batching scheduler for /predict
+    await prediction_batcher.start()
 
-            logging.warning(f"Failed to initialize SHAP explainer: {e}")
+    # Start the write-behind buffer for validations
+    await validation_writer.start()
 
     yield
 
-    # Shutdown: cleanup si nécessaire
-    pass
+    # Shutdown: servir les requêtes en attente puis arrêter le scheduler
+    await model_registry.stop_watcher()
+    await prediction_batcher.stop()
+    await validation_writer.stop()
+    await async_engine.dispose()
+    await deferred_explanations.stop()
+    inference_executor.shutdown()
+    shap_executor.shutdown()
 
 
 app = FastAPI(
@@ -97,6 +128,27 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def observe_request_duration(request: Request, call_next):
+    """Mesure la durée de chaque requête, par route (gabarit, pas l'URL)."""
+    started = time.perf_counter()
+    # Lu par les endpoints pour mesurer la durée de validation
+    request.state.received_at = started
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        request_duration.observe(
+            time.perf_counter() - started,
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status_code),
+        )
+
+
 # Gestionnaires d'erreurs
 @app.exception_handler(PredictionError)
 async def prediction_error_handler(request, exc):
@@ -118,6 +170,7 @@ async def model_not_loaded_handler(request, exc):
 
 # Inclusion des routers
 app.include_router(predictions_router)
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -125,5 +178,117 @@ async def health_check():
     """Endpoint de vérification de santé du service."""
     return {
         "status": "healthy",
-        "model_loaded": prediction_engine.is_loaded,
+        "model_loaded": model_registry.active is not None,
+        "models": model_registry.status(),
+        "batching": prediction_batcher.stats(),
+        "prediction_cache": prediction_cache.stats(),
+        "prediction_memo": prediction_memo.stats(),
+        "deferred_explanations": deferred_explanations.stats(),
+        "validation_writer": validation_writer.stats(),
+        "executors": {
+            inference_executor.name: inference_executor.stats(),
+            shap_executor.name: shap_executor.stats(),
+        },
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métriques du worker au format texte Prometheus."""
+    bundle = model_registry.active
+    memo_stats = prediction_memo.stats()
+    cache_stats = prediction_cache.stats()
+    executors = [inference_executor, shap_executor]
+    pool_stats = (
+        bundle.facility_pool.stats()
+        if bundle is not None and bundle.facility_pool is not None
+        else None
+    )
+
+    lines = [
+        *stage_duration.render(),
+        *request_duration.render(),
+        *imputed_features_total.render(),
+        *predictions_total.render(),
+        *render_gauge(
+            "cmv_ml_model_info",
+            "Model version currently served",
+            [({"version": bundle.version}, 1)] if bundle is not None else [],
+        ),
+        *render_gauge(
+            "cmv_ml_facility_models_loaded",
+            "Facility models currently loaded",
+            [({"facility": facility}, 1) for facility in pool_stats["loaded"]]
+            if pool_stats
+            else [],
+        ),
+        *render_gauge(
+            "cmv_ml_facility_models_memory_bytes",
+            "Estimated size of the loaded facility models",
+            [({}, pool_stats["memory_bytes"])] if pool_stats else [],
+        ),
+        *render_gauge(
+            "cmv_ml_facility_model_lookups_total",
+            "Facility model pool lookups by result",
+            [({"result": result}, pool_stats[result]) for result in ("hits", "misses")]
+            if pool_stats
+            else [],
+            metric_type="counter",
+        ),
+        *render_gauge(
+            "cmv_ml_facility_model_evictions_total",
+            "Facility models evicted from the pool",
+            [({}, pool_stats["evictions"])] if pool_stats else [],
+            metric_type="counter",
+        ),
+        *render_gauge(
+            "cmv_ml_prediction_memo_lookups_total",
+            "Prediction memo lookups by result",
+            [
+                ({"result": result}, memo_stats[result])
+                for result in ("hits", "misses", "coalesced")
+            ],
+            metric_type="counter",
+        ),
+        *render_gauge(
+            "cmv_ml_prediction_cache_lookups_total",
+            "Prediction cache lookups by result",
+            [({"result": result}, cache_stats[result]) for result in ("hits", "misses")],
+            metric_type="counter",
+        ),
+        *render_histogram(
+            "cmv_ml_batch_size",
+            "Realized batch sizes sent to the model and written to the database",
+            [
+                (
+                    {"queue": queue},
+                    batch_sizes.buckets(),
+                    batch_sizes.items,
+                    batch_sizes.flushes,
+                )
+                for queue, batch_sizes in (
+                    ("predict", prediction_batcher.batch_sizes),
+                    ("validation", validation_writer.batch_sizes),
+                )
+            ],
+        ),
+        *render_gauge(
+            "cmv_ml_batcher_queue_depth",
+            "Requests waiting in the micro-batching queue",
+            [({}, prediction_batcher.stats()["queue_depth"])],
+        ),
+        *render_gauge(
+            "cmv_ml_executor_queue_depth",
+            "Tasks waiting for an executor thread",
+            [({"pool": ex.name}, ex.stats()["queue_depth"]) for ex in executors],
+        ),
+        *render_gauge(
+            "cmv_ml_executor_saturation",
+            "Pending tasks over executor capacity",
+            [({"pool": ex.name}, ex.stats()["saturation"]) for ex in executors],
+        ),
+    ]
+    return PlainTextResponse(
+        "\n".join(lines) + "\n",
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,84 @@
+"""
+Repository asynchrone des prédictions validées (asyncpg, aiosqlite en test).
+
+Les validations sont insérées par lots en une seule requête
+INSERT ... ON CONFLICT DO NOTHING RETURNING id: une prédiction déjà
+validée est détectée par l'absence de son id dans le retour, sans
+requête d'existence préalable. PostgreSQL et SQLite (>= 3.35) acceptent
+tous deux cette syntaxe, seul l'objet insert du dialecte diffère.
+
+RGPD: Ce repository ne stocke que les métadonnées de prédiction.
+Les features médicales ne sont JAMAIS persistées.
+"""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..sql.models import ValidatedPrediction
+
+
+class AsyncPgPredictionsRepository:
+    """Implémentation asynchrone des écritures de validations."""
+
+    async def insert_many(
+        self,
+        session: AsyncSession,
+        rows: list[dict],
+    ) -> set[UUID]:
+        """
+        Insère des prédictions validées en une seule requête multi-lignes.
+
+        Args:
+            session: Session asynchrone de base de données
+            rows: Lignes (id, predicted_value, user_id, validation_date)
+
+        Returns:
+            set[UUID]: Identifiants effectivement insérés (les autres
+            étaient déjà validés)
+        """
+        if not rows:
+            return set()
+        created_at = datetime.utcnow()
+        if session.bind.dialect.name == "postgresql":
+            insert = postgresql.insert
+        else:
+            insert = sqlite.insert
+        statement = (
+            insert(ValidatedPrediction)
+            .values([{**row, "created_at": created_at} for row in rows])
+            .on_conflict_do_nothing(index_elements=[ValidatedPrediction.id])
+            .returning(ValidatedPrediction.id)
+        )
+        result = await session.execute(statement)
+        inserted = set(result.scalars().all())
+        await session.commit()
+        return inserted
+
+    async def existing_ids(
+        self, session: AsyncSession, prediction_ids: list[UUID]
+    ) -> set[UUID]:
+        """
+        Retourne les identifiants déjà présents dans l'historique.
+
+        Args:
+            session: Session asynchrone de base de données
+            prediction_ids: Identifiants à vérifier
+
+        Returns:
+            set[UUID]: Sous-ensemble des identifiants déjà validés
+        """
+        if not prediction_ids:
+            return set()
+        result = await session.execute(
+            select(ValidatedPrediction.id).where(
+                ValidatedPrediction.id.in_(prediction_ids)
+            )
+        )
+        return set(result.scalars().all())
+
+
+# Instance singleton du repository asynchrone
+async_predictions_repository = AsyncPgPredictionsRepository()
@@ -4,15 +4,21 @@ Repository pour la gestion des prédictions validées.
 RGPD: Ce repository ne stocke que les métadonnées de prédiction.
 Les features médicales ne sont JAMAIS persistées.
 """
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import func, text, tuple_
 from sqlalchemy.orm import Session
 
 from ..sql.models import ValidatedPrediction
+from ..utils.config import PREDICTIONS_COUNT_CACHE_SECONDS
+
+# En dessous, le COUNT exact reste peu coûteux et est préféré à l'estimation
+ESTIMATE_MIN_ROWS = 100_000
 
 
 class PredictionRepositoryProtocol(Protocol):
@@ -29,16 +35,31 @@ class PredictionRepositoryProtocol(Protocol):
         """Persiste une prédiction validée (métadonnées uniquement)."""
         ...
     
-    def get_all(self, db: Session, limit: int, offset: int) -> list[dict]:
-        """Récupère l'historique des prédictions validées."""
+    def get_all(
+        self,
+        db: Session,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> list[ValidatedPrediction]:
+        """Récupère une page de l'historique des prédictions validées."""
         ...
     
     def exists(self, db: Session, prediction_id: UUID) -> bool:
         """Vérifie si une prédiction existe."""
         ...
     
-    def count(self, db: Session) -> int:
-        """Retourne le nombre total de prédictions validées."""
+    def count(
+        self,
+        db: Session,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        exact: bool = False,
+    ) -> tuple[int, bool]:
+        """Retourne le nombre de prédictions validées et s'il est exact."""
         ...
 
 
@@ -58,8 +79,16 @@ class PredictionCrud(ABC):
         pass
 
     @abstractmethod
-    def get_all(self, db: Session, limit: int, offset: int) -> list[ValidatedPrediction]:
-        """Récupère l'historique des prédictions validées avec pagination."""
+    def get_all(
+        self,
+        db: Session,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> list[ValidatedPrediction]:
+        """Récupère une page de l'historique des prédictions validées."""
         pass
 
     @abstractmethod
@@ -68,8 +97,15 @@ class PredictionCrud(ABC):
         pass
 
     @abstractmethod
-    def count(self, db: Session) -> int:
-        """Retourne le nombre total de prédictions validées."""
+    def count(
+        self,
+        db: Session,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        exact: bool = False,
+    ) -> tuple[int, bool]:
+        """Retourne le nombre de prédictions validées et s'il est exact."""
         pass
 
 
@@ -81,6 +117,33 @@ class PgPredictionsRepository(PredictionCrud):
     Les features médicales ne sont JAMAIS persistées.
     """
 
+    def __init__(self, count_cache_seconds: float = PREDICTIONS_COUNT_CACHE_SECONDS):
+        """
+        Args:
+            count_cache_seconds: Durée de validité des totaux en cache
+                (0 = total toujours recalculé)
+        """
+        self._count_cache_seconds = count_cache_seconds
+        # (user_id, date_from, date_to) -> (expiration, total)
+        self._count_cache: dict[tuple, tuple[float, int]] = {}
+        self._count_lock = threading.Lock()
+
+    @staticmethod
+    def _filtered(
+        query,
+        user_id: int | None,
+        date_from: datetime | None,
+        date_to: datetime | None,
+    ):
+        """Applique les filtres optionnels (utilisateur, période [from, to[)."""
+        if user_id is not None:
+            query = query.filter(ValidatedPrediction.user_id == user_id)
+        if date_from is not None:
+            query = query.filter(ValidatedPrediction.validation_date >= date_from)
+        if date_to is not None:
+            query = query.filter(ValidatedPrediction.validation_date < date_to)
+        return query
+
     def save_validated(
         self,
         db: Session,
@@ -114,22 +177,48 @@ class PgPredictionsRepository(PredictionCrud):
         db.refresh(db_prediction)
         return db_prediction
 
-    def get_all(self, db: Session, limit: int, offset: int) -> list[ValidatedPrediction]:
+    def get_all(
+        self,
+        db: Session,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> list[ValidatedPrediction]:
         """
-        Récupère l'historique des prédictions validées avec pagination.
+        Récupère une page de l'historique, de la plus récente à la plus ancienne.
+        
+        Pagination par clé sur (validation_date, id): la page suivante part
+        de la dernière ligne lue au lieu de sauter OFFSET lignes, ce qui
+        garde un coût constant quelle que soit la profondeur de la page.
         
         Args:
             db: Session de base de données
             limit: Nombre maximum de résultats à retourner
-            offset: Nombre de résultats à ignorer (pour la pagination)
+            after: (validation_date, id) de la dernière ligne de la page
+                précédente, None pour la première page
+            user_id: Filtre optionnel sur l'utilisateur ayant validé
+            date_from: Début de période optionnel (inclus)
+            date_to: Fin de période optionnelle (exclue)
             
         Returns:
             list[ValidatedPrediction]: Liste des prédictions validées
         """
+        query = self._filtered(
+            db.query(ValidatedPrediction), user_id, date_from, date_to
+        )
+        if after is not None:
+            # Comparaison de lignes: parcours direct des index composites
+            query = query.filter(
+                tuple_(ValidatedPrediction.validation_date, ValidatedPrediction.id)
+                < tuple_(*after)
+            )
         return (
-            db.query(ValidatedPrediction)
-            .order_by(ValidatedPrediction.validation_date.desc())
-            .offset(offset)
+            query.order_by(
+                ValidatedPrediction.validation_date.desc(),
+                ValidatedPrediction.id.desc(),
+            )
             .limit(limit)
             .all()
         )
@@ -152,17 +241,78 @@ class PgPredictionsRepository(PredictionCrud):
         )
         return result is not None
 
-    def count(self, db: Session) -> int:
+    def count(
+        self,
+        db: Session,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        exact: bool = False,
+    ) -> tuple[int, bool]:
         """
-        Retourne le nombre total de prédictions validées.
+        Retourne le nombre de prédictions validées correspondant aux filtres.
+        
+        Sans exact, le total sans filtre d'une grande table est l'estimation
+        des statistiques PostgreSQL (pg_class.reltuples, mise à jour par
+        ANALYZE); les autres totaux sont mis en cache count_cache_seconds
+        secondes.
         
         Args:
             db: Session de base de données
+            user_id: Filtre optionnel sur l'utilisateur ayant validé
+            date_from: Début de période optionnel (inclus)
+            date_to: Fin de période optionnelle (exclue)
+            exact: Force un COUNT exact (et rafraîchit le cache)
             
         Returns:
-            int: Nombre total de prédictions validées
+            tuple[int, bool]: (total, True si le total vient d'un COUNT
+            exécuté par cet appel)
         """
-        return db.query(func.count(ValidatedPrediction.id)).scalar() or 0
+        key = (user_id, date_from, date_to)
+        if not exact:
+            if key == (None, None, None):
+                estimate = self._estimate_total(db)
+                if estimate is not None:
+                    return estimate, False
+            with self._count_lock:
+                cached = self._count_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1], False
+
+        total = (
+            self._filtered(
+                db.query(func.count(ValidatedPrediction.id)),
+                user_id,
+                date_from,
+                date_to,
+            ).scalar()
+            or 0
+        )
+        if self._count_cache_seconds > 0:
+            with self._count_lock:
+                # Purger les entrées expirées: les clés de période sont libres
+                now = time.monotonic()
+                self._count_cache = {
+                    k: v for k, v in self._count_cache.items() if v[0] > now
+                }
+                self._count_cache[key] = (now + self._count_cache_seconds, total)
+        return total, True
+
+    def _estimate_total(self, db: Session) -> int | None:
+        """Nombre de lignes estimé par PostgreSQL, None s'il est inconnu."""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = db.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table_name)"
+            ),
+            {"table_name": ValidatedPrediction.__tablename__},
+        ).scalar()
+        # -1 tant que la table n'a jamais été analysée
+        if estimate is None or estimate < ESTIMATE_MIN_ROWS:
+            return None
+        return int(estimate)
 
 
 # Instance singleton du repository pour injection de dépendances
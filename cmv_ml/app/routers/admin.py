@@ -0,0 +1,85 @@
+"""
+Router d'administration du service ML.
+
+Permet de consulter le registre des modèles et d'activer une version sans
+redémarrer le conteneur. Réservé au rôle ADMIN_ROLE.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..dependancies.auth import check_admin
+from ..services.model_registry import (
+    ModelActivationInProgressError,
+    ModelVersionNotFoundError,
+    model_registry,
+)
+
+router = APIRouter(prefix="/admin/models", tags=["admin"])
+
+
+@router.get("/")
+async def get_models(current_user: dict = Depends(check_admin)) -> dict:
+    """
+    Retourne la version active, le chargement en cours et les versions disponibles.
+
+    Args:
+        current_user: Administrateur authentifié (injecté via JWT)
+    """
+    return model_registry.status()
+
+
+@router.post("/{version}/activate")
+async def activate_model(
+    version: str,
+    current_user: dict = Depends(check_admin),
+) -> dict:
+    """
+    Active une version du registre sans redémarrer le service.
+
+    Le chargement et le préchauffage ont lieu dans un thread dédié: les
+    prédictions continuent d'être servies par la version active jusqu'à la
+    substitution, et les requêtes en cours ne sont pas interrompues. La
+    version est ensuite écrite dans CURRENT pour les autres workers.
+
+    Args:
+        version: Nom du répertoire de la version dans le registre
+        current_user: Administrateur authentifié (injecté via JWT)
+
+    Returns:
+        Statut du registre après activation
+
+    Raises:
+        HTTPException 404: Si la version n'existe pas dans le registre
+        HTTPException 409: Si une version est déjà en cours de chargement
+        HTTPException 500: Si la version ne peut pas être chargée
+    """
+    try:
+        await model_registry.activate(version)
+    except ModelVersionNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model version not found",
+        )
+    except ModelActivationInProgressError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A model version is already being loaded",
+        )
+    except Exception as e:
+        import logging
+
+        logging.exception(f"Model activation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Model activation failed: {str(e)}",
+        )
+
+    # Les autres workers suivent CURRENT via la surveillance du registre
+    try:
+        model_registry.set_current(version)
+    except OSError as e:
+        import logging
+
+        logging.warning(f"Failed to write CURRENT for model version {version}: {e}")
+
+    return model_registry.status()
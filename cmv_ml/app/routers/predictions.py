@@ -5,66 +5,145 @@ RGPD: Les données médicales (features) ne sont JAMAIS persistées.
 Seules les métadonnées de prédiction validées sont stockées.
 """
 
+import time
 from datetime import datetime, timezone
+from typing import get_args
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ..dependancies.auth import check_authorization
 from ..dependancies.db_session import get_db
+from ..repositories.async_predictions_crud import async_predictions_repository
 from ..repositories.predictions_crud import predictions_repository
-from ..schemas.features import PredictionFeatures
+from ..schemas.features import (
+    BatchPredictionFeatures,
+    PredictionFeatures,
+    SensitivityRequest,
+)
 from ..schemas.predictions import (
+    BatchPredictionItem,
+    BatchPredictionResponse,
+    BatchValidationItem,
+    BatchValidationRequest,
+    BatchValidationResponse,
+    ExplanationResponse,
+    FeatureImportanceResponse,
     PaginatedPredictions,
     PredictionResponse,
+    SensitivityResponse,
     ValidatedPredictionSchema,
 )
-from ..services.prediction_cache import prediction_cache
-from ..services.prediction_engine import (
-    ModelNotLoadedError,
-    XGBoostPredictionEngine,
+from ..services.executors import (
+    ExecutorSaturatedError,
+    inference_executor,
+    shap_executor,
+)
+from ..services.explanation_store import (
+    FAILED,
+    PENDING,
+    deferred_explanations,
+)
+from ..services.metrics import (
+    imputed_features_total,
+    predictions_total,
+    stage_duration,
 )
-from ..services.shap_explainer import (
-    XGBoostShapExplainer,
-    ShapDisabledError,
-    create_shap_explainer,
+from ..services.model_registry import ModelBundle, model_registry
+from ..services.prediction_batcher import PredictionBatcher
+from ..services.prediction_cache import prediction_cache
+from ..services.prediction_memo import PredictionMemo
+from ..services.prediction_engine import ModelNotLoadedError
+from ..services.sensitivity import sensitivity_matrix
+from ..services.shap_explainer import ShapDisabledError
+from ..services.validation_writer import ValidationWriter
+from ..utils.config import (
+    PREDICT_ARRAY_MAX_ROWS,
+    PREDICTION_MEMO_MAX_SIZE,
+    PREDICT_MICROBATCH_MAX_SIZE,
+    PREDICT_MICROBATCH_MAX_WAIT_MS,
+    SHAP_ENABLED,
+    VALIDATION_FLUSH_MAX_SIZE,
+    VALIDATION_FLUSH_MAX_WAIT_MS,
 )
-from ..utils.config import SHAP_ENABLED
+from ..utils.database import AsyncSessionLocal
+from ..utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/predictions", tags=["predictions"])
 
-# Instance du moteur de prédiction (sera initialisée au démarrage de l'app)
-prediction_engine = XGBoostPredictionEngine()
+# Regroupe les appels /predict concurrents en lots (démarré dans le lifespan)
+prediction_batcher = PredictionBatcher(
+    max_batch_size=PREDICT_MICROBATCH_MAX_SIZE,
+    max_wait_ms=PREDICT_MICROBATCH_MAX_WAIT_MS,
+    executor=inference_executor,
+)
 
-# Instance du SHAP explainer (sera initialisée après le chargement du modèle)
-shap_explainer: XGBoostShapExplainer | None = None
+# Mémoïsation des prédictions répétées (empreinte du vecteur imputé)
+prediction_memo = PredictionMemo(max_size=PREDICTION_MEMO_MAX_SIZE)
 
+# Écriture groupée des validations (démarrée dans le lifespan)
+validation_writer = ValidationWriter(
+    AsyncSessionLocal,
+    async_predictions_repository,
+    max_batch_size=VALIDATION_FLUSH_MAX_SIZE,
+    max_wait_ms=VALIDATION_FLUSH_MAX_WAIT_MS,
+)
 
-def initialize_shap_explainer() -> None:
-    """
-    Initialize the SHAP explainer after the model is loaded.
 
-    Should be called after prediction_engine.load_model() in the app lifespan.
+def _observe_validation(request: Request) -> None:
+    """Durée entre la réception de la requête et l'entrée dans l'endpoint.
+
+    Couvre la lecture du corps, la validation pydantic et l'authentification
+    (request.state.received_at est posé par le middleware de main.py).
     """
-    global shap_explainer
+    received_at = getattr(request.state, "received_at", None)
+    if received_at is not None:
+        stage_duration.observe(time.perf_counter() - received_at, "validation")
+
 
-    if not prediction_engine.is_loaded:
-        return
+def _count_imputed(imputed_features: dict[str, float]) -> None:
+    """Compte les features imputées (noms uniquement, jamais les valeurs)."""
+    for feature_name in imputed_features:
+        imputed_features_total.inc(feature_name)
 
-    if SHAP_ENABLED:
-        shap_explainer = create_shap_explainer(
-            model=prediction_engine._model,
-            feature_order=prediction_engine.get_feature_order(),
+
+async def _predict_matrix(
+    bundle: ModelBundle, feature_matrix: np.ndarray, imputed: bool = False
+) -> np.ndarray:
+    """
+    Prédit une matrice, routée par établissement si la version en a.
+
+    imputed=True pour une matrice déjà passée par impute_array: le moteur
+    ne refait pas l'imputation (seule l'entrée binaire brute en a besoin).
+    """
+    if bundle.facility_pool is None:
+        predict_fn = (
+            bundle.engine.predict_imputed_array
+            if imputed
+            else bundle.engine.predict_array
         )
+        return await inference_executor.run(predict_fn, feature_matrix)
+    return await bundle.facility_pool.predict_array(
+        bundle.engine, feature_matrix, inference_executor, imputed=imputed
+    )
 
 
 @router.post("/predict", response_model=PredictionResponse)
 async def predict(
+    request: Request,
     features: PredictionFeatures,
     explain: bool = Query(
         False, description="Inclure les valeurs SHAP pour l'explicabilité"
     ),
+    deferred: bool = Query(
+        False,
+        description=(
+            "Avec explain, calculer les valeurs SHAP en arrière-plan "
+            "(GET /predictions/{prediction_id}/explain)"
+        ),
+    ),
     current_user: dict = Depends(check_authorization),
 ) -> PredictionResponse:
     """
@@ -74,8 +153,10 @@ async def predict(
     Elles sont traitées uniquement en mémoire pendant la prédiction.
 
     Args:
+        request: Requête HTTP (mesure de la durée de validation)
         features: Les 22 features médicales du patient
         explain: Si True, inclut les valeurs SHAP (si disponible)
+        deferred: Si True (avec explain), répond sans attendre les valeurs SHAP
         current_user: Utilisateur authentifié (injecté via JWT)
 
     Returns:
@@ -83,43 +164,82 @@ async def predict(
         - prediction_id: UUID unique pour validation ultérieure
         - predicted_length_of_stay: Durée prédite en jours
         - shap_values: Contributions SHAP par feature (optionnel)
+        - explanation_status: pending si l'explication est différée
+        - model_version: Version du modèle ayant produit la prédiction
 
     Raises:
         HTTPException 503: Si le modèle n'est pas chargé
         HTTPException 500: Si une erreur survient pendant la prédiction
     """
-    # Vérifier que le modèle est chargé
-    if not prediction_engine.is_loaded:
+    _observe_validation(request)
+
+    # Version servie, lue une seule fois: un rechargement en cours
+    # n'affecte pas cette requête
+    bundle = model_registry.active
+    if bundle is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service unavailable",
         )
+    prediction_engine = bundle.engine
+    shap_explainer = bundle.shap_explainer
 
     try:
-        # Convertir les features en dictionnaire
-        features_dict = features.model_dump()
-
-        # Impute missing continuous features with training-set means
-        clean_features, imputed_features = prediction_engine.imputation_service.impute(features_dict)
-
-        print(
-            f"Received prediction request from user {current_user.get('id_user')}: {clean_features}"
+        # Features imputées avec la moyenne d'entraînement (lecture directe des champs)
+        with stage_duration.time("imputation"):
+            imputed_features = prediction_engine.imputation_service.imputed_features(
+                features
+            )
+        _count_imputed(imputed_features)
+
+        # Modèle de l'établissement s'il en existe un, global sinon
+        routed_engine = prediction_engine
+        if bundle.facility_pool is not None:
+            routed_engine = await bundle.facility_pool.engine_for(
+                features, prediction_engine
+            )
+
+        # Exécuter la prédiction (regroupée avec les appels concurrents,
+        # l'imputation est faite par le moteur), sauf si ce vecteur imputé
+        # a déjà été prédit par le même modèle
+        with stage_duration.time("memo_fingerprint"):
+            memo_key = prediction_memo.fingerprint(
+                routed_engine.feature_vector(features),
+                routed_engine.model_version,
+            )
+        predicted_value = await prediction_memo.get_or_compute(
+            memo_key, lambda: prediction_batcher.predict(routed_engine, features)
         )
-
-        # Exécuter la prédiction
-        predicted_value = prediction_engine.predict(clean_features)
+        predictions_total.inc("predict")
 
         # Générer un ID unique pour cette prédiction
         prediction_id = uuid4()
 
         # Stocker dans le cache pour validation ultérieure
-        # prediction_cache.store(prediction_id, predicted_value)
+        await prediction_cache.store(prediction_id, predicted_value)
 
         # Préparer les valeurs SHAP si demandées
         shap_values = None
-        if explain and SHAP_ENABLED and shap_explainer is not None:
+        explanation_status = None
+        if explain and deferred and SHAP_ENABLED and shap_explainer is not None:
+            # Les features ne vivent que dans cette closure, le temps du calcul
+            async def compute_explanation() -> dict[str, float]:
+                clean_features, _ = prediction_engine.imputation_service.impute(
+                    features.model_dump()
+                )
+                return await shap_executor.run(shap_explainer.explain, clean_features)
+
+            await deferred_explanations.submit(prediction_id, compute_explanation)
+            explanation_status = PENDING
+        elif explain and SHAP_ENABLED and shap_explainer is not None:
             try:
-                shap_values = shap_explainer.explain(clean_features)
+                clean_features, _ = prediction_engine.imputation_service.impute(
+                    features.model_dump()
+                )
+                # Pool SHAP séparé: une explication lente ne bloque pas l'inférence
+                shap_values = await shap_executor.run(
+                    shap_explainer.explain, clean_features
+                )
             except ShapDisabledError:
                 # SHAP is disabled, return prediction without SHAP values
                 shap_values = None
@@ -131,10 +251,12 @@ async def predict(
             prediction_id=prediction_id,
             predicted_length_of_stay=predicted_value,
             shap_values=shap_values,
+            explanation_status=explanation_status,
             imputed_features=imputed_features,
+            model_version=bundle.version,
         )
 
-    except ModelNotLoadedError:
+    except (ModelNotLoadedError, ExecutorSaturatedError):
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service unavailable",
@@ -149,22 +271,445 @@ async def predict(
         )
 
 
+@router.post("/predict-batch", response_model=BatchPredictionResponse)
+async def predict_batch(
+    request: Request,
+    batch: BatchPredictionFeatures,
+    explain: bool = Query(
+        False, description="Inclure les valeurs SHAP pour l'explicabilité"
+    ),
+    current_user: dict = Depends(check_authorization),
+) -> BatchPredictionResponse:
+    """
+    Prédit la durée d'hospitalisation de plusieurs patients en un seul appel.
+
+    Les features sont imputées puis évaluées en une seule passe du modèle,
+    ce qui évite le coût fixe d'un appel /predict par patient (ex: re-prévision
+    d'un service entier lors d'un changement d'équipe). Un lot mêlant
+    plusieurs établissements est scindé par modèle (voir facility_pool).
+
+    ⚠️ **RGPD**: Les données médicales (features) ne sont PAS stockées.
+
+    Args:
+        request: Requête HTTP (mesure de la durée de validation)
+        batch: Liste des features médicales des patients
+        explain: Si True, inclut les valeurs SHAP (calculées en un seul appel)
+        current_user: Utilisateur authentifié (injecté via JWT)
+
+    Returns:
+        BatchPredictionResponse contenant la version du modèle et, pour chaque
+        patient et dans l'ordre:
+        - prediction_id: UUID unique pour validation ultérieure
+        - predicted_length_of_stay: Durée prédite en jours
+        - shap_values: Contributions SHAP par feature (optionnel)
+        - imputed_features: Features imputées avec la moyenne d'entraînement
+
+    Raises:
+        HTTPException 503: Si le modèle n'est pas chargé
+        HTTPException 500: Si une erreur survient pendant la prédiction
+    """
+    _observe_validation(request)
+
+    bundle = model_registry.active
+    if bundle is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    prediction_engine = bundle.engine
+    shap_explainer = bundle.shap_explainer
+
+    try:
+        imputation_service = prediction_engine.imputation_service
+
+        # Matrice du lot (NaN = manquante) imputée en une opération vectorisée
+        with stage_duration.time("array_build"):
+            feature_matrix = prediction_engine.features_matrix(batch.items)
+        with stage_duration.time("imputation"):
+            clean_matrix, imputed_mask = imputation_service.impute_array(
+                feature_matrix, prediction_engine.get_feature_order()
+            )
+        for feature_name, count in zip(
+            imputation_service.CONTINUOUS_FEATURES, imputed_mask.sum(axis=0).tolist()
+        ):
+            if count:
+                imputed_features_total.inc(feature_name, amount=count)
+
+        predicted_values = (
+            await _predict_matrix(bundle, clean_matrix, imputed=True)
+        ).tolist()
+        predictions_total.inc("predict_batch", amount=len(predicted_values))
+
+        # Explications du lot en un seul appel, sur le pool SHAP
+        shap_values_list = [None] * len(predicted_values)
+        if explain and SHAP_ENABLED and shap_explainer is not None:
+            try:
+                shap_values_list = await shap_executor.run(
+                    shap_explainer.explain_array, clean_matrix
+                )
+            except Exception:
+                # SHAP calculation failed, return predictions without SHAP values
+                pass
+
+        items = [
+            BatchPredictionItem(
+                prediction_id=uuid4(),
+                predicted_length_of_stay=predicted_value,
+                shap_values=shap_values,
+                imputed_features=imputation_service.imputed_features_from_mask(
+                    mask_row
+                ),
+            )
+            for predicted_value, shap_values, mask_row in zip(
+                predicted_values, shap_values_list, imputed_mask
+            )
+        ]
+
+        # Stocker dans le cache pour validation ultérieure
+        await prediction_cache.store_many(
+            [(item.prediction_id, item.predicted_length_of_stay) for item in items]
+        )
+
+        return BatchPredictionResponse(items=items, model_version=bundle.version)
+
+    except (ModelNotLoadedError, ExecutorSaturatedError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    except Exception as e:
+        import logging
+
+        logging.exception(f"Batch prediction failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Prediction failed: {str(e)}",
+        )
+
+
+# Format binaire: float32 little-endian, une ligne par patient
+ARRAY_MEDIA_TYPE = "application/octet-stream"
+ARRAY_DTYPE = np.dtype("<f4")
+
+# Features pouvant être NaN en binaire: celles que le JSON accepte à null
+NULLABLE_FEATURES = frozenset(
+    name
+    for name, field in PredictionFeatures.model_fields.items()
+    if type(None) in get_args(field.annotation)
+)
+
+
+@router.post(
+    "/predict-array",
+    response_class=Response,
+    responses={200: {"content": {ARRAY_MEDIA_TYPE: {}}}},
+)
+async def predict_array(
+    request: Request,
+    current_user: dict = Depends(check_authorization),
+) -> Response:
+    """
+    Prédiction en volume au format binaire, pour les appelants internes.
+
+    Le corps est une matrice N×27 de float32 little-endian, ligne par
+    ligne, dans l'ordre de get_feature_order(); NaN signale une feature
+    manquante là où PredictionFeatures accepte null (features continues,
+    imputées avec la moyenne d'entraînement, et rcount). Le corps est lu sans copie (np.frombuffer) et sans validation pydantic.
+
+    Les prédictions ne sont pas mises en cache: elles ne sont pas
+    validables et n'ont pas d'identifiant.
+
+    Args:
+        request: Requête HTTP (corps binaire)
+        current_user: Utilisateur authentifié (injecté via JWT)
+
+    Returns:
+        Response application/octet-stream: N float32 little-endian, dans
+        l'ordre des lignes; version du modèle dans l'en-tête X-Model-Version
+
+    Raises:
+        HTTPException 400: Si la taille du corps n'est pas un multiple de
+            27 float32, si une valeur est infinie ou si une feature non
+            nullable dans PredictionFeatures est manquante
+        HTTPException 413: Si le corps dépasse PREDICT_ARRAY_MAX_ROWS lignes
+        HTTPException 415: Si le Content-Type n'est pas application/octet-stream
+        HTTPException 503: Si le modèle n'est pas chargé
+        HTTPException 500: Si une erreur survient pendant la prédiction
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() != ARRAY_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {ARRAY_MEDIA_TYPE}",
+        )
+
+    bundle = model_registry.active
+    if bundle is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    prediction_engine = bundle.engine
+    feature_order = prediction_engine.get_feature_order()
+    row_size = len(feature_order) * ARRAY_DTYPE.itemsize
+
+    body = await request.body()
+    if not body or len(body) % row_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Body must contain N rows of {len(feature_order)} float32 values",
+        )
+    if len(body) // row_size > PREDICT_ARRAY_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {PREDICT_ARRAY_MAX_ROWS} rows per request",
+        )
+
+    with stage_duration.time("validation"):
+        # Vue en lecture seule sur le corps, sans copie
+        feature_matrix = np.frombuffer(body, dtype=ARRAY_DTYPE).reshape(
+            -1, len(feature_order)
+        )
+        if np.isinf(feature_matrix).any():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Infinite values are not allowed",
+            )
+        # Mêmes valeurs manquantes que le JSON: features nullables du schéma
+        required = [
+            i for i, name in enumerate(feature_order) if name not in NULLABLE_FEATURES
+        ]
+        if np.isnan(feature_matrix[:, required]).any():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only features nullable in PredictionFeatures may be NaN",
+            )
+
+    try:
+        predicted_values = await _predict_matrix(bundle, feature_matrix)
+    except (ModelNotLoadedError, ExecutorSaturatedError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    except Exception as e:
+        import logging
+
+        logging.exception(f"Array prediction failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Prediction failed: {str(e)}",
+        )
+    predictions_total.inc("predict_array", amount=len(predicted_values))
+
+    return Response(
+        content=predicted_values.astype(ARRAY_DTYPE).tobytes(),
+        media_type=ARRAY_MEDIA_TYPE,
+        headers={"X-Model-Version": bundle.version},
+    )
+
+
+@router.post("/sensitivity", response_model=SensitivityResponse)
+async def predict_sensitivity(
+    request: Request,
+    sensitivity: SensitivityRequest,
+    current_user: dict = Depends(check_authorization),
+) -> SensitivityResponse:
+    """
+    Analyse de sensibilité: prédictions lorsque une ou deux features varient.
+
+    Répond aux questions "et si l'IMC ou la créatinine étaient différents?"
+    en un seul appel: la grille est développée en une matrice (une ligne
+    par point, plus la ligne de référence) évaluée en une seule passe du
+    modèle, au lieu d'un appel /predict par valeur.
+
+    Les prédictions ne sont pas mises en cache: elles ne sont pas
+    validables et n'ont pas d'identifiant.
+
+    ⚠️ **RGPD**: Les données médicales (features) ne sont PAS stockées.
+
+    Args:
+        request: Requête HTTP (mesure de la durée de validation)
+        sensitivity: Features de référence et grilles de valeurs (1 ou 2 axes)
+        current_user: Utilisateur authentifié (injecté via JWT)
+
+    Returns:
+        SensitivityResponse contenant:
+        - features / values: Features qui varient et leurs grilles
+        - predictions: Courbe (1 axe) ou surface (2 axes) des durées prédites
+        - baseline: Durée prédite pour les features de référence
+        - imputed_features: Features imputées avec la moyenne d'entraînement
+          (hors features qui varient)
+
+    Raises:
+        HTTPException 503: Si le modèle n'est pas chargé
+        HTTPException 500: Si une erreur survient pendant la prédiction
+    """
+    _observe_validation(request)
+
+    bundle = model_registry.active
+    if bundle is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    prediction_engine = bundle.engine
+
+    try:
+        imputation_service = prediction_engine.imputation_service
+        feature_order = prediction_engine.get_feature_order()
+        names = [axis.feature for axis in sensitivity.axes]
+        grids = [axis.values for axis in sensitivity.axes]
+
+        with stage_duration.time("imputation"):
+            base_matrix, imputed_mask = imputation_service.impute_array(
+                prediction_engine.features_matrix([sensitivity.features]),
+                feature_order,
+            )
+        # Une feature qui varie n'est plus imputée
+        imputed_features = {
+            name: value
+            for name, value in imputation_service.imputed_features_from_mask(
+                imputed_mask[0]
+            ).items()
+            if name not in names
+        }
+        _count_imputed(imputed_features)
+
+        with stage_duration.time("array_build"):
+            # Ligne 0: référence, puis un point de grille par ligne
+            feature_matrix = np.vstack(
+                [
+                    base_matrix,
+                    sensitivity_matrix(
+                        base_matrix[0],
+                        [feature_order.index(name) for name in names],
+                        grids,
+                    ),
+                ]
+            )
+
+        predicted_values = await _predict_matrix(bundle, feature_matrix, imputed=True)
+        predictions_total.inc("sensitivity", amount=len(predicted_values))
+
+        return SensitivityResponse(
+            features=names,
+            values=grids,
+            predictions=predicted_values[1:]
+            .reshape([len(grid) for grid in grids])
+            .tolist(),
+            baseline=float(predicted_values[0]),
+            imputed_features=imputed_features,
+            model_version=bundle.version,
+        )
+
+    except (ModelNotLoadedError, ExecutorSaturatedError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+    except Exception as e:
+        import logging
+
+        logging.exception(f"Sensitivity analysis failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Prediction failed: {str(e)}",
+        )
+
+
+@router.get("/feature-importance", response_model=FeatureImportanceResponse)
+async def get_feature_importance(
+    current_user: dict = Depends(check_authorization),
+) -> FeatureImportanceResponse:
+    """
+    Retourne l'importance globale des features du modèle chargé.
+
+    Calculée une seule fois au chargement du modèle (gain total des splits,
+    normalisé à 1), elle ne dépend d'aucune donnée patient.
+
+    Raises:
+        HTTPException 503: Si le modèle n'est pas chargé ou si le backend
+            ne permet pas de calculer l'importance
+    """
+    bundle = model_registry.active
+    if bundle is None or bundle.feature_importance is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service unavailable",
+        )
+
+    return FeatureImportanceResponse(
+        importance_type="total_gain",
+        importances=bundle.feature_importance,
+        model_version=bundle.version,
+    )
+
+
+@router.get(
+    "/{prediction_id}/explain",
+    response_model=ExplanationResponse,
+    responses={202: {"model": ExplanationResponse}},
+)
+async def get_explanation(
+    prediction_id: UUID,
+    response: Response,
+    current_user: dict = Depends(check_authorization),
+) -> ExplanationResponse:
+    """
+    Récupère l'explication différée d'une prédiction (POST /predict?explain=true&deferred=true).
+
+    Args:
+        prediction_id: UUID de la prédiction expliquée
+        response: Réponse HTTP (code 202 tant que le calcul est en cours)
+        current_user: Utilisateur authentifié (injecté via JWT)
+
+    Returns:
+        ExplanationResponse avec le statut et, une fois prêtes, les valeurs SHAP
+
+    Raises:
+        HTTPException 404: Si l'explication n'existe pas ou a expiré
+        HTTPException 500: Si le calcul de l'explication a échoué
+    """
+    explanation = await deferred_explanations.get(prediction_id)
+
+    if explanation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Explanation not found",
+        )
+
+    explanation_status, shap_values = explanation
+    if explanation_status == FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Explanation failed",
+        )
+    if explanation_status == PENDING:
+        response.status_code = status.HTTP_202_ACCEPTED
+
+    return ExplanationResponse(
+        prediction_id=prediction_id,
+        status=explanation_status,
+        shap_values=shap_values,
+    )
+
+
 @router.post("/{prediction_id}/validate")
 async def validate_prediction(
     prediction_id: UUID,
     current_user: dict = Depends(check_authorization),
-    db: Session = Depends(get_db),
 ) -> dict:
     """
     Valide une prédiction pour l'enregistrer dans l'historique.
 
     La prédiction doit avoir été générée précédemment via POST /predict
-    et ne pas avoir expiré du cache (TTL: 30 minutes).
+    et ne pas avoir expiré du cache (TTL: 30 minutes). L'écriture est
+    regroupée avec les validations concurrentes (INSERT multi-lignes).
 
     Args:
         prediction_id: UUID de la prédiction à valider
         current_user: Utilisateur authentifié (injecté via JWT)
-        db: Session de base de données
 
     Returns:
         dict avec message de confirmation et détails de la prédiction validée
@@ -173,17 +718,20 @@ async def validate_prediction(
         HTTPException 404: Si la prédiction n'existe pas ou a expiré
         HTTPException 409: Si la prédiction a déjà été validée
     """
-    # Vérifier si la prédiction existe déjà en base (déjà validée)
-    if predictions_repository.exists(db, prediction_id):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Prediction already validated",
-        )
-
     # Récupérer la prédiction du cache
-    predicted_value = prediction_cache.get(prediction_id)
+    predicted_value = await prediction_cache.get(prediction_id)
 
     if predicted_value is None:
+        # Retirée du cache à la validation: distinguer déjà validée / inconnue
+        async with AsyncSessionLocal() as session:
+            existing = await async_predictions_repository.existing_ids(
+                session, [prediction_id]
+            )
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Prediction already validated",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prediction not found",
@@ -193,18 +741,25 @@ async def validate_prediction(
     # user_id = current_user.get("user_id")
     user_id = current_user.get("id_user")
 
-    # Persister la prédiction validée
+    # Persister la prédiction validée (ON CONFLICT DO NOTHING: pas de
+    # vérification d'existence préalable)
     validation_date = datetime.now(timezone.utc)
-    predictions_repository.save_validated(
-        db=db,
-        prediction_id=prediction_id,
-        predicted_value=predicted_value,
-        user_id=user_id,
-        validation_date=validation_date,
+    inserted = await validation_writer.submit(
+        {
+            "id": prediction_id,
+            "predicted_value": predicted_value,
+            "user_id": user_id,
+            "validation_date": validation_date,
+        }
     )
+    if not inserted:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Prediction already validated",
+        )
 
     # Supprimer du cache après validation
-    prediction_cache.remove(prediction_id)
+    await prediction_cache.remove(prediction_id)
 
     return {
         "message": "Prediction validated successfully",
@@ -214,34 +769,147 @@ async def validate_prediction(
     }
 
 
+@router.post("/validate-batch", response_model=BatchValidationResponse)
+async def validate_predictions_batch(
+    batch: BatchValidationRequest,
+    current_user: dict = Depends(check_authorization),
+) -> BatchValidationResponse:
+    """
+    Valide plusieurs prédictions en une seule requête.
+
+    Lecture du cache et suppression en un aller-retour chacune, une
+    seule écriture multi-lignes pour l'ensemble des prédictions trouvées.
+
+    Args:
+        batch: Identifiants des prédictions à valider
+        current_user: Utilisateur authentifié (injecté via JWT)
+
+    Returns:
+        BatchValidationResponse avec le statut de chaque prédiction, dans
+        l'ordre de la requête: validated, already_validated ou not_found
+    """
+    prediction_ids = batch.prediction_ids
+    user_id = current_user.get("id_user")
+    validation_date = datetime.now(timezone.utc)
+
+    predicted_values = await prediction_cache.get_many(prediction_ids)
+
+    # Une seule écriture pour toutes les prédictions trouvées en cache
+    found = [i for i, value in enumerate(predicted_values) if value is not None]
+    inserted = await validation_writer.submit_many(
+        [
+            {
+                "id": prediction_ids[i],
+                "predicted_value": predicted_values[i],
+                "user_id": user_id,
+                "validation_date": validation_date,
+            }
+            for i in found
+        ]
+    )
+    statuses = [None] * len(prediction_ids)
+    for i, was_inserted in zip(found, inserted):
+        statuses[i] = "validated" if was_inserted else "already_validated"
+
+    # Absentes du cache: déjà validées (retirées du cache) ou inconnues
+    missing = [i for i, value in enumerate(predicted_values) if value is None]
+    if missing:
+        async with AsyncSessionLocal() as session:
+            existing = await async_predictions_repository.existing_ids(
+                session, [prediction_ids[i] for i in missing]
+            )
+        for i in missing:
+            statuses[i] = (
+                "already_validated" if prediction_ids[i] in existing else "not_found"
+            )
+
+    validated_ids = [
+        prediction_ids[i] for i, was_inserted in zip(found, inserted) if was_inserted
+    ]
+    await prediction_cache.remove_many(validated_ids)
+
+    return BatchValidationResponse(
+        items=[
+            BatchValidationItem(
+                prediction_id=prediction_id,
+                status=item_status,
+                predicted_value=value,
+            )
+            for prediction_id, item_status, value in zip(
+                prediction_ids, statuses, predicted_values
+            )
+        ],
+        validated=len(validated_ids),
+        validation_date=validation_date,
+    )
+
+
 @router.get("/", response_model=PaginatedPredictions)
 async def get_predictions(
     limit: int = Query(20, ge=1, le=100, description="Nombre de résultats par page"),
-    offset: int = Query(0, ge=0, description="Nombre de résultats à ignorer"),
+    cursor: str | None = Query(
+        None, description="Curseur next_cursor de la page précédente"
+    ),
+    user_id: int | None = Query(None, description="Filtre sur l'utilisateur"),
+    date_from: datetime | None = Query(
+        None, description="Début de période (inclus) sur la date de validation"
+    ),
+    date_to: datetime | None = Query(
+        None, description="Fin de période (exclue) sur la date de validation"
+    ),
+    exact: bool = Query(False, description="Compter exactement le total"),
     current_user: dict = Depends(check_authorization),
     db: Session = Depends(get_db),
 ) -> PaginatedPredictions:
     """
-    Récupère l'historique des prédictions validées avec pagination.
+    Récupère l'historique des prédictions validées, paginé par curseur.
 
     Args:
         limit: Nombre maximum de résultats (1-100, défaut: 20)
-        offset: Position de départ pour la pagination (défaut: 0)
+        cursor: Curseur opaque renvoyé par la page précédente (None = début)
+        user_id: Filtre optionnel sur l'utilisateur ayant validé
+        date_from: Début de période optionnel
+        date_to: Fin de période optionnelle
+        exact: Total exact plutôt qu'estimé ou mis en cache
         current_user: Utilisateur authentifié (injecté via JWT)
         db: Session de base de données
 
     Returns:
         PaginatedPredictions contenant:
         - items: Liste des prédictions validées
-        - total: Nombre total de prédictions
+        - total: Nombre de prédictions correspondant aux filtres
+        - total_is_exact: False si total est estimé ou en cache
         - limit: Limite utilisée
-        - offset: Offset utilisé
+        - next_cursor: Curseur de la page suivante (None = dernière page)
+
+    Raises:
+        HTTPException 400: Si le curseur est invalide
     """
-    # Récupérer les prédictions avec pagination
-    predictions = predictions_repository.get_all(db, limit=limit, offset=offset)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    predictions = predictions_repository.get_all(
+        db,
+        limit=limit + 1,
+        after=after,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    has_more = len(predictions) > limit
+    predictions = predictions[:limit]
 
-    # Compter le total pour la pagination
-    total = predictions_repository.count(db)
+    total, total_is_exact = predictions_repository.count(
+        db, user_id=user_id, date_from=date_from, date_to=date_to, exact=exact
+    )
 
     # Convertir en schemas
     items = [
@@ -254,9 +922,15 @@ async def get_predictions(
         for p in predictions
     ]
 
+    next_cursor = None
+    if has_more:
+        last = predictions[-1]
+        next_cursor = encode_cursor(last.validation_date, last.id)
+
     return PaginatedPredictions(
         items=items,
         total=total,
+        total_is_exact=total_is_exact,
         limit=limit,
-        offset=offset,
+        next_cursor=next_cursor,
     )
@@ -1,5 +1,5 @@
 # Schemas package
 
-from .features import PredictionFeatures
+from .features import BatchPredictionFeatures, PredictionFeatures
 
-__all__ = ["PredictionFeatures"]
+__all__ = ["BatchPredictionFeatures", "PredictionFeatures"]
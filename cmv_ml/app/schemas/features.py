@@ -2,7 +2,9 @@
 
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from ..utils.config import PREDICT_BATCH_MAX_ITEMS, SENSITIVITY_MAX_GRID_POINTS
 
 
 class PredictionFeatures(BaseModel):
@@ -86,3 +88,62 @@ class PredictionFeatures(BaseModel):
             ]
         }
     }
+
+
+class BatchPredictionFeatures(BaseModel):
+    """
+    Schema de validation d'une demande de prédiction par lot.
+
+    Chaque élément est validé comme une requête /predict individuelle.
+    """
+
+    items: list[PredictionFeatures] = Field(
+        min_length=1, max_length=PREDICT_BATCH_MAX_ITEMS
+    )
+
+
+class SensitivityAxis(BaseModel):
+    """Feature à faire varier et valeurs à évaluer."""
+
+    feature: str
+    values: list[float] = Field(min_length=1, max_length=SENSITIVITY_MAX_GRID_POINTS)
+
+
+class SensitivityRequest(BaseModel):
+    """
+    Schema de validation d'une analyse de sensibilité ("et si ...?").
+
+    Une ou deux features varient sur leur grille, les autres gardent les
+    valeurs de features. Chaque valeur de grille est validée avec les
+    mêmes contraintes qu'une requête /predict.
+    """
+
+    features: PredictionFeatures
+    axes: list[SensitivityAxis] = Field(min_length=1, max_length=2)
+
+    @model_validator(mode="after")
+    def check_axes(self) -> "SensitivityRequest":
+        names = [axis.feature for axis in self.axes]
+        unknown = [name for name in names if name not in PredictionFeatures.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(unknown)}")
+        if len(set(names)) != len(names):
+            raise ValueError("Each feature may only appear in one axis")
+
+        base = self.features.model_dump()
+        for axis in self.axes:
+            values = []
+            for value in axis.values:
+                try:
+                    features = PredictionFeatures.model_validate(
+                        {**base, axis.feature: value}
+                    )
+                except ValidationError as e:
+                    raise ValueError(
+                        f"Invalid value {value} for {axis.feature}: "
+                        f"{e.errors()[0]['msg']}"
+                    )
+                # Valeur normalisée par le schema (ex: pulse entier)
+                values.append(getattr(features, axis.feature))
+            axis.values = values
+        return self
@@ -1,10 +1,13 @@
 """Schemas de réponse pour les endpoints de prédiction."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from ..utils.config import PREDICT_BATCH_MAX_ITEMS
+
 
 class PredictionResponse(BaseModel):
     """
@@ -14,12 +17,112 @@ class PredictionResponse(BaseModel):
     prédite, et optionnellement les valeurs SHAP pour l'explicabilité.
     """
 
+    prediction_id: UUID
+    predicted_length_of_stay: float
+    shap_values: dict[str, float] | None = None
+    explanation_status: str | None = Field(default=None, description="'pending' when the explanation is deferred to GET /predictions/{prediction_id}/explain.")
+    imputed_features: dict[str, float] = Field(default_factory=dict, description="Map of imputed feature names to the training-mean value used.")
+    model_version: str = Field(default="", description="Version of the model that produced the prediction.")
+
+
+class BatchPredictionItem(BaseModel):
+    """
+    Résultat d'une prédiction au sein d'un lot.
+
+    Chaque élément possède son propre identifiant, validable individuellement.
+    """
+
     prediction_id: UUID
     predicted_length_of_stay: float
     shap_values: dict[str, float] | None = None
     imputed_features: dict[str, float] = Field(default_factory=dict, description="Map of imputed feature names to the training-mean value used.")
 
 
+class BatchPredictionResponse(BaseModel):
+    """
+    Réponse de l'endpoint /predict-batch.
+
+    Les éléments sont retournés dans le même ordre que la requête.
+    """
+
+    items: list[BatchPredictionItem]
+    model_version: str = Field(default="", description="Version of the model that produced the predictions.")
+
+
+class ExplanationResponse(BaseModel):
+    """
+    Réponse de l'endpoint /{prediction_id}/explain.
+
+    status vaut pending tant que le calcul n'est pas terminé, puis ready
+    (shap_values renseigné) ou failed.
+    """
+
+    prediction_id: UUID
+    status: str
+    shap_values: dict[str, float] | None = None
+
+
+class FeatureImportanceResponse(BaseModel):
+    """
+    Réponse de l'endpoint /feature-importance.
+
+    Importance globale de chaque feature, triée par ordre décroissant.
+    """
+
+    importance_type: str
+    importances: dict[str, float]
+    model_version: str = ""
+
+
+class SensitivityResponse(BaseModel):
+    """
+    Schema de réponse d'une analyse de sensibilité.
+
+    predictions est une courbe (une feature: predictions[i] pour
+    values[0][i]) ou une surface (deux features: predictions[i][j] pour
+    values[0][i] et values[1][j]).
+    """
+
+    features: list[str]
+    values: list[list[float]]
+    predictions: list[float] | list[list[float]]
+    baseline: float = Field(description="Prediction for the unmodified features.")
+    imputed_features: dict[str, float] = Field(default_factory=dict, description="Map of imputed feature names to the training-mean value used, for features not varied by an axis.")
+    model_version: str = Field(default="", description="Version of the model that produced the predictions.")
+
+
+class BatchValidationRequest(BaseModel):
+    """
+    Requête de l'endpoint /validate-batch.
+
+    Identifiants de prédictions issues de /predict ou /predict-batch.
+    """
+
+    prediction_ids: list[UUID] = Field(
+        min_length=1, max_length=PREDICT_BATCH_MAX_ITEMS
+    )
+
+
+class BatchValidationItem(BaseModel):
+    """Résultat de la validation d'une prédiction au sein d'un lot."""
+
+    prediction_id: UUID
+    status: Literal["validated", "already_validated", "not_found"]
+    predicted_value: float | None = None
+
+
+class BatchValidationResponse(BaseModel):
+    """
+    Réponse de l'endpoint /validate-batch.
+
+    Les éléments sont retournés dans le même ordre que la requête.
+    """
+
+    items: list[BatchValidationItem]
+    validated: int
+    validation_date: datetime
+
+
 class ValidatedPredictionSchema(BaseModel):
     """
     Schema d'une prédiction validée.
@@ -39,10 +142,13 @@ class PaginatedPredictions(BaseModel):
     Réponse paginée des prédictions validées.
     
     Utilisée par l'endpoint GET /predictions pour retourner l'historique
-    des prédictions avec support de pagination.
+    des prédictions avec pagination par curseur.
     """
 
     items: list[ValidatedPredictionSchema]
     total: int
+    # False si total est une estimation ou une valeur en cache
+    total_is_exact: bool
     limit: int
-    offset: int
+    # Curseur de la page suivante, None sur la dernière page
+    next_cursor: str | None = None
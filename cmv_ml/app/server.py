@@ -0,0 +1,202 @@
+"""
+Production entrypoint for the CMV ML service (python -m app.server).
+
+The master process loads the model once, then forks the uvicorn workers,
+which inherit it: the booster and the SHAP explainer are shared read-only
+between workers through copy-on-write instead of being loaded N times. All
+workers accept connections on one listening socket created by the master.
+
+Readiness: each worker runs a warm-up prediction in its lifespan before
+uvicorn starts accepting connections on the shared socket.
+"""
+
+import gc
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+
+import uvicorn
+
+from app.utils.config import (
+    EXPLANATION_STORE_BACKEND,
+    ML_HOST,
+    ML_PORT,
+    ML_WORKERS,
+    PREDICTION_CACHE_BACKEND,
+)
+from app.utils.database import engine
+
+logger = logging.getLogger("app.server")
+
+
+def available_cpus() -> int:
+    """
+    Nombre de CPU utilisables par le conteneur.
+
+    Tient compte de l'affinité du processus et du quota CPU du cgroup
+    (v2: cpu.max, v1: cpu.cfs_quota_us), os.cpu_count() ignorant les deux.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+        if limit != "max":
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def worker_count(requested: int, backends: tuple[str, ...]) -> int:
+    """
+    Nombre de workers à lancer.
+
+    Avec un cache ou un magasin d'explications en mémoire, /validate et
+    /explain échoueraient dès que la requête de suivi atteint un autre
+    worker: un seul worker est lancé par défaut, et une demande explicite
+    de plusieurs workers est refusée.
+
+    Args:
+        requested: ML_WORKERS (0 = selon les CPU disponibles)
+        backends: Backends du cache de prédictions et des explications
+
+    Raises:
+        SystemExit: Si plusieurs workers sont demandés avec un backend memory
+    """
+    if "memory" not in backends:
+        return requested if requested > 0 else available_cpus()
+    if requested > 1:
+        raise SystemExit(
+            f"ML_WORKERS={requested} requires the valkey backends for "
+            "PREDICTION_CACHE_BACKEND and EXPLANATION_STORE_BACKEND"
+        )
+    if requested == 0 and available_cpus() > 1:
+        logger.warning(
+            "In-memory prediction cache or explanation store: starting a "
+            "single worker, use the valkey backends to start more"
+        )
+    return 1
+
+
+def create_socket(host: str, port: int) -> socket.socket:
+    """Crée le socket d'écoute partagé par tous les workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket) -> None:
+    """Sert l'application sur le socket hérité (processus worker)."""
+    # Rétablir les signaux par défaut: uvicorn installe ses propres handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # Connexions du pool éventuellement héritées du maître: les oublier sans
+    # les fermer, le maître et les autres workers en partagent les sockets
+    engine.dispose(close=False)
+    config = uvicorn.Config(app, proxy_headers=True, log_level="info")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket) -> int:
+    """Fork un worker et retourne son pid (côté maître)."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, sock)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main() -> None:
+    """Charge le modèle, fork les workers puis les supervise."""
+    logging.basicConfig(level=logging.INFO)
+
+    from app.main import app, create_tables
+    from app.services.model_registry import model_registry
+
+    # Tables créées une seule fois, puis connexion rendue avant le fork:
+    # un socket PostgreSQL hérité serait partagé par tous les workers
+    create_tables()
+    engine.dispose()
+
+    # Chargement unique, sans prédiction: les pools de threads OpenMP
+    # d'XGBoost ne doivent pas exister dans le maître au moment du fork
+    model_registry.load_initial(warm_up=False)
+
+    workers = worker_count(
+        ML_WORKERS, (PREDICTION_CACHE_BACKEND, EXPLANATION_STORE_BACKEND)
+    )
+    sock = create_socket(ML_HOST, ML_PORT)
+    logger.info(
+        f"Model version {model_registry.active.version} loaded, "
+        f"starting {workers} workers on {ML_HOST}:{ML_PORT}"
+    )
+
+    # Sortir les objets chargés du suivi du GC: ses passes ne touchent plus
+    # leurs pages mémoire, qui restent partagées entre les workers
+    gc.freeze()
+
+    children: set[int] = set()
+    stopping = False
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children.add(spawn_worker(app, sock))
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            # Remplacer un worker mort de façon inattendue
+            logger.warning(
+                f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, "
+                "restarting"
+            )
+            children.add(spawn_worker(app, sock))
+
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Dedicated thread pools for CPU-bound model work.
+
+XGBoost inference and SHAP explanations run outside the event loop, in two
+separate bounded pools, so that a slow explanation can never starve plain
+predictions (nor stall other in-flight requests on the worker).
+"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.utils.config import (
+    INFERENCE_NTHREAD,
+    INFERENCE_POOL_MAX_QUEUE,
+    INFERENCE_POOL_SIZE,
+    SHAP_NTHREAD,
+    SHAP_POOL_MAX_QUEUE,
+    SHAP_POOL_SIZE,
+)
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(Exception):
+    """Exception raised when a pool has no room left for a new task."""
+
+    pass
+
+
+def _configure_xgboost_thread(nthread: int) -> None:
+    """Fixe le nombre de threads XGBoost pour le thread courant du pool."""
+    # Ne pas importer xgboost si le backend actif ne l'utilise pas
+    xgb = sys.modules.get("xgboost")
+    if nthread <= 0 or xgb is None:
+        return
+    # La configuration globale XGBoost est locale au thread appelant
+    xgb.set_config(nthread=nthread)
+
+
+class BoundedExecutor:
+    """
+    Pool de threads borné avec suivi de la profondeur de file.
+
+    Au-delà de max_workers tâches en cours et max_queue tâches en attente,
+    les nouvelles soumissions sont refusées (ExecutorSaturatedError) au lieu
+    de s'accumuler indéfiniment.
+    """
+
+    def __init__(
+        self, name: str, max_workers: int, max_queue: int, nthread: int = 0
+    ) -> None:
+        """
+        Args:
+            name: Nom du pool (préfixe des threads, clé des statistiques)
+            max_workers: Nombre de threads du pool
+            max_queue: Nombre maximal de tâches en attente d'un thread libre
+            nthread: Threads XGBoost par tâche (0 = valeur par défaut d'XGBoost)
+        """
+        self.name = name
+        self._max_workers = max(1, max_workers)
+        self._max_queue = max(0, max_queue)
+        self._nthread = nthread
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Nombre maximal de tâches en cours et en attente."""
+        return self._max_workers + self._max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Crée le pool à la première utilisation."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix=self.name,
+                initializer=_configure_xgboost_thread,
+                initargs=(self._nthread,),
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Exécute fn(*args) dans le pool et attend son résultat.
+
+        Raises:
+            ExecutorSaturatedError: Si le pool et sa file sont pleins
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise ExecutorSaturatedError(f"{self.name} pool is saturated")
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._track, fn, *args
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _track(self, fn: Callable[..., T], *args) -> T:
+        """Exécute fn dans un thread du pool en comptant les tâches actives."""
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def stats(self) -> dict:
+        """Retourne la profondeur de file et la saturation du pool."""
+        with self._lock:
+            pending = self._pending
+            active = self._active
+            return {
+                "workers": self._max_workers,
+                "nthread": self._nthread,
+                "active": active,
+                "queue_depth": max(pending - active, 0),
+                "max_queue": self._max_queue,
+                "saturation": pending / self.capacity,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Arrête le pool après la fin des tâches en cours."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Pool dédié à l'inférence XGBoost
+inference_executor = BoundedExecutor(
+    "inference",
+    max_workers=INFERENCE_POOL_SIZE,
+    max_queue=INFERENCE_POOL_MAX_QUEUE,
+    nthread=INFERENCE_NTHREAD,
+)
+
+# Pool séparé et plus petit pour les explications SHAP
+shap_executor = BoundedExecutor(
+    "shap",
+    max_workers=SHAP_POOL_SIZE,
+    max_queue=SHAP_POOL_MAX_QUEUE,
+    nthread=SHAP_NTHREAD,
+)
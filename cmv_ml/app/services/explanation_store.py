@@ -0,0 +1,249 @@
+"""Explications SHAP différées, consultées par identifiant de prédiction.
+
+/predict répond sans attendre l'explication: le calcul est planifié sur le
+pool SHAP et son résultat est conservé dans un stockage à durée de vie
+limitée, en mémoire (un seul worker) ou dans Valkey (partagé).
+
+RGPD: seules les contributions par feature sont conservées. Les features
+médicales ne vivent que le temps du calcul et ne sont jamais stockées.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Protocol
+from uuid import UUID
+
+from app.utils.config import (
+    EXPLANATION_STORE_BACKEND,
+    EXPLANATION_STORE_MAX_SIZE,
+    EXPLANATION_TTL_MINUTES,
+    VALKEY_HOST,
+    VALKEY_PORT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuts d'une explication différée
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class ExplanationStoreProtocol(Protocol):
+    """Interface du stockage des explications différées."""
+
+    async def set(
+        self, prediction_id: UUID, status: str, values: dict[str, float] | None = None
+    ) -> None:
+        """Enregistre le statut (et le résultat) d'une explication."""
+        ...
+
+    async def get(self, prediction_id: UUID) -> tuple[str, dict[str, float] | None] | None:
+        """Retourne (statut, contributions) ou None si inconnue ou expirée."""
+        ...
+
+
+class InMemoryExplanationStore:
+    """Stockage en mémoire borné des explications différées.
+
+    Le TTL étant fixe et chaque écriture réinsérant l'entrée en fin d'ordre,
+    l'ordre d'insertion est aussi l'ordre d'expiration: la purge et
+    l'éviction se font en tête.
+    """
+
+    def __init__(self, ttl_minutes: int = 30, max_size: int = 10_000):
+        """
+        Args:
+            ttl_minutes: Durée de vie des entrées en minutes (défaut: 30)
+            max_size: Nombre maximal d'explications conservées
+        """
+        self._entries: OrderedDict[
+            UUID, tuple[float, str, dict[str, float] | None]
+        ] = OrderedDict()
+        self._ttl = ttl_minutes * 60
+        self._max_size = max(1, max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def set(
+        self, prediction_id: UUID, status: str, values: dict[str, float] | None = None
+    ) -> None:
+        """Enregistre le statut (et le résultat) d'une explication."""
+        now = time.monotonic()
+        self._purge_expired(now)
+        self._entries.pop(prediction_id, None)
+        while len(self._entries) >= self._max_size:
+            self._entries.popitem(last=False)
+        self._entries[prediction_id] = (now + self._ttl, status, values)
+
+    async def get(self, prediction_id: UUID) -> tuple[str, dict[str, float] | None] | None:
+        """Retourne (statut, contributions) ou None si inconnue ou expirée."""
+        entry = self._entries.get(prediction_id)
+        if entry is None:
+            return None
+        expires_at, status, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[prediction_id]
+            return None
+        return status, values
+
+    def _purge_expired(self, now: float) -> None:
+        """Supprime les entrées expirées en tête."""
+        while self._entries:
+            prediction_id, (expires_at, _, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                return
+            del self._entries[prediction_id]
+
+
+class ValkeyExplanationStore:
+    """Stockage Valkey des explications différées, partagé entre les workers."""
+
+    KEY_PREFIX = "ml:explanation:"
+
+    def __init__(self, url: str, ttl_minutes: int = 30):
+        """
+        Args:
+            url: URL de connexion (redis://host:port)
+            ttl_minutes: Durée de vie des entrées en minutes (défaut: 30)
+        """
+        from redis import asyncio as aioredis
+
+        self._client = aioredis.from_url(url, decode_responses=True)
+        self._ttl = ttl_minutes * 60
+
+    def _key(self, prediction_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}{prediction_id}"
+
+    async def set(
+        self, prediction_id: UUID, status: str, values: dict[str, float] | None = None
+    ) -> None:
+        """Enregistre le statut (et le résultat) avec expiration côté Valkey."""
+        from redis.exceptions import RedisError
+
+        try:
+            await self._client.setex(
+                self._key(prediction_id),
+                self._ttl,
+                json.dumps({"status": status, "values": values}),
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to store explanation in Valkey: {e}")
+
+    async def get(self, prediction_id: UUID) -> tuple[str, dict[str, float] | None] | None:
+        """Retourne (statut, contributions) ou None si inconnue ou expirée."""
+        from redis.exceptions import RedisError
+
+        try:
+            raw = await self._client.get(self._key(prediction_id))
+        except RedisError as e:
+            logger.warning(f"Failed to read explanation from Valkey: {e}")
+            return None
+
+        if raw is None:
+            return None
+        document = json.loads(raw)
+        return document["status"], document["values"]
+
+
+class DeferredExplanations:
+    """
+    Planifie les explications en arrière-plan et conserve leurs résultats.
+
+    Chaque explication passe par les statuts pending -> ready (ou failed).
+    """
+
+    def __init__(self, store: ExplanationStoreProtocol) -> None:
+        """
+        Args:
+            store: Stockage des statuts et résultats
+        """
+        self._store = store
+        self._tasks: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.failed = 0
+
+    async def submit(
+        self,
+        prediction_id: UUID,
+        compute: Callable[[], Awaitable[dict[str, float]]],
+    ) -> None:
+        """
+        Marque l'explication comme en attente et lance son calcul.
+
+        Args:
+            prediction_id: Identifiant de la prédiction expliquée
+            compute: Coroutine de calcul (porte seule les features, jetées
+                dès la fin du calcul)
+        """
+        await self._store.set(prediction_id, PENDING)
+        task = asyncio.create_task(self._run(prediction_id, compute))
+        # Référence forte tant que la tâche s'exécute
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.submitted += 1
+
+    async def _run(
+        self,
+        prediction_id: UUID,
+        compute: Callable[[], Awaitable[dict[str, float]]],
+    ) -> None:
+        """Calcule l'explication et enregistre le résultat ou l'échec."""
+        try:
+            values = await compute()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Deferred explanation failed: {e}")
+            await self._store.set(prediction_id, FAILED)
+            return
+        await self._store.set(prediction_id, READY, values)
+
+    async def get(self, prediction_id: UUID) -> tuple[str, dict[str, float] | None] | None:
+        """Retourne (statut, contributions) ou None si inconnue ou expirée."""
+        return await self._store.get(prediction_id)
+
+    async def stop(self) -> None:
+        """Annule les calculs en cours (arrêt du service)."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Retourne le nombre d'explications soumises, en cours et échouées."""
+        return {
+            "submitted": self.submitted,
+            "in_progress": len(self._tasks),
+            "failed": self.failed,
+        }
+
+
+def create_explanation_store(backend: str = "memory") -> ExplanationStoreProtocol:
+    """Crée le stockage des explications pour le backend configuré.
+
+    Args:
+        backend: "memory" (un seul worker) ou "valkey" (partagé)
+
+    Returns:
+        Instance du stockage
+    """
+    if backend == "valkey":
+        return ValkeyExplanationStore(
+            f"redis://{VALKEY_HOST}:{VALKEY_PORT}",
+            ttl_minutes=EXPLANATION_TTL_MINUTES,
+        )
+    return InMemoryExplanationStore(
+        ttl_minutes=EXPLANATION_TTL_MINUTES,
+        max_size=EXPLANATION_STORE_MAX_SIZE,
+    )
+
+
+# Instance singleton des explications différées pour l'application
+deferred_explanations = DeferredExplanations(
+    create_explanation_store(EXPLANATION_STORE_BACKEND)
+)
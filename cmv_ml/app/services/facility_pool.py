@@ -0,0 +1,266 @@
+"""
+Per-facility specialized models, loaded on demand.
+
+A model version may ship one model per facility next to the global model:
+
+    models/registry/2026-10-15/
+        model.ubj
+        feature_means.json
+        facilities/B/model.ubj
+        facilities/D/model.ubj
+
+Facility A is encoded by all facid_B..facid_E one-hot features at 0.
+Requests are routed by that one-hot. A facility without a model of its
+own, or a row with several facid features set, is scored by the global
+model. Imputation always uses the global feature means, so the imputed
+values reported to clients do not depend on routing. SHAP explanations
+and feature importance remain those of the global model.
+
+Facility models are loaded lazily, outside the event loop, and kept in an
+LRU bounded by a memory budget. The footprint of a model is estimated from
+its file size. Evicting a model only drops the pool's reference: requests
+already holding it finish normally.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from app.schemas.features import PredictionFeatures
+from app.services.executors import BoundedExecutor
+from app.services.prediction_engine import (
+    PredictionEngineProtocol,
+    create_prediction_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+FACILITIES_DIRNAME = "facilities"
+# Établissement de référence: aucune feature facid_* à 1
+REFERENCE_FACILITY = "A"
+FACILITY_FEATURES = {
+    "B": "facid_B",
+    "C": "facid_C",
+    "D": "facid_D",
+    "E": "facid_E",
+}
+
+
+def facility_of(features: PredictionFeatures) -> str | None:
+    """
+    Établissement d'une requête d'après l'encodage one-hot.
+
+    Returns:
+        Lettre de l'établissement, None si plusieurs features facid_* sont à 1
+    """
+    facilities = [
+        facility
+        for facility, name in FACILITY_FEATURES.items()
+        if getattr(features, name) == 1
+    ]
+    if not facilities:
+        return REFERENCE_FACILITY
+    return facilities[0] if len(facilities) == 1 else None
+
+
+def facilities_of(feature_matrix: np.ndarray, feature_order: list[str]) -> np.ndarray:
+    """
+    Établissement de chaque ligne d'une matrice (version vectorisée de facility_of).
+
+    Returns:
+        Tableau de lettres, "" pour les lignes à l'encodage ambigu
+    """
+    one_hot = feature_matrix[
+        :, [feature_order.index(name) for name in FACILITY_FEATURES.values()]
+    ] == 1
+    counts = one_hot.sum(axis=1)
+    letters = np.array(list(FACILITY_FEATURES))[one_hot.argmax(axis=1)]
+    return np.where(
+        counts == 0, REFERENCE_FACILITY, np.where(counts == 1, letters, "")
+    )
+
+
+class FacilityModelPool:
+    """
+    Modèles spécialisés par établissement, en LRU sous budget mémoire.
+
+    Utilisé depuis l'event loop uniquement: les chargements sont faits dans
+    un thread, un seul par établissement même sous requêtes concurrentes.
+    """
+
+    def __init__(
+        self,
+        facilities_dir: str,
+        means_path: str,
+        backend: str = "xgboost",
+        memory_budget_mb: float = 512.0,
+        model_filenames: tuple[str, ...] = ("model.ubj", "model.json"),
+    ) -> None:
+        """
+        Args:
+            facilities_dir: Répertoire contenant un sous-répertoire par établissement
+            means_path: Moyennes d'entraînement du modèle global
+            backend: Backend d'inférence des moteurs créés
+            memory_budget_mb: Taille cumulée maximale des modèles chargés
+            model_filenames: Fichiers de modèle reconnus, par priorité
+        """
+        self._means_path = means_path
+        self._backend = backend
+        self._budget = max(0.0, memory_budget_mb) * 1024 * 1024
+        self._model_paths: dict[str, str] = {}
+        if os.path.isdir(facilities_dir):
+            for facility in sorted(os.listdir(facilities_dir)):
+                for filename in model_filenames:
+                    path = os.path.join(facilities_dir, facility, filename)
+                    if os.path.isfile(path):
+                        self._model_paths[facility] = path
+                        break
+        # Établissement -> (moteur, taille estimée en octets), du moins au plus récent
+        self._models: OrderedDict[str, tuple[PredictionEngineProtocol, int]] = (
+            OrderedDict()
+        )
+        self._loading: dict[str, asyncio.Task] = {}
+        self._failed: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def facilities(self) -> list[str]:
+        """Établissements disposant d'un modèle spécialisé."""
+        return list(self._model_paths)
+
+    async def get(self, facility: str | None) -> PredictionEngineProtocol | None:
+        """
+        Moteur spécialisé d'un établissement, chargé au besoin.
+
+        Returns:
+            Le moteur, ou None si l'établissement n'a pas de modèle (ou si
+            son chargement a échoué): le modèle global doit être utilisé
+        """
+        if facility not in self._model_paths or facility in self._failed:
+            return None
+        entry = self._models.get(facility)
+        if entry is not None:
+            self._models.move_to_end(facility)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        task = self._loading.get(facility)
+        if task is None:
+            task = asyncio.create_task(self._load(facility))
+            self._loading[facility] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, facility: str) -> PredictionEngineProtocol | None:
+        """Charge un modèle hors event loop puis l'insère dans le LRU."""
+        path = self._model_paths[facility]
+        try:
+            engine = await asyncio.to_thread(self._build_engine, path)
+        except Exception as e:
+            # Ne pas retenter à chaque requête: le modèle global prend le relais
+            self._failed.add(facility)
+            logger.warning(f"Failed to load model of facility {facility}: {e}")
+            return None
+        finally:
+            self._loading.pop(facility, None)
+
+        size = os.path.getsize(path)
+        self._models[facility] = (engine, size)
+        self._evict(keep=facility)
+        logger.info(f"Model of facility {facility} loaded ({size} bytes)")
+        return engine
+
+    def _build_engine(self, path: str) -> PredictionEngineProtocol:
+        """Crée et charge un moteur (bloquant)."""
+        engine = create_prediction_engine(self._backend)
+        engine.load_model(path)
+        engine.load_feature_means(self._means_path)
+        return engine
+
+    def _evict(self, keep: str) -> None:
+        """Retire les modèles les moins récemment utilisés au-delà du budget."""
+        while self.memory_bytes > self._budget and len(self._models) > 1:
+            facility = next(iter(self._models))
+            if facility == keep:
+                # Le modèle qui vient d'être chargé dépasse seul le budget
+                self._models.move_to_end(facility)
+                continue
+            del self._models[facility]
+            self.evictions += 1
+            logger.info(f"Model of facility {facility} evicted")
+
+    @property
+    def memory_bytes(self) -> int:
+        """Taille estimée des modèles chargés."""
+        return sum(size for _, size in self._models.values())
+
+    async def engine_for(
+        self, features: PredictionFeatures, default: PredictionEngineProtocol
+    ) -> PredictionEngineProtocol:
+        """Moteur à utiliser pour une requête (modèle global à défaut)."""
+        return await self.get(facility_of(features)) or default
+
+    async def predict_array(
+        self,
+        default: PredictionEngineProtocol,
+        feature_matrix: np.ndarray,
+        executor: BoundedExecutor,
+        imputed: bool = False,
+    ) -> np.ndarray:
+        """
+        Prédit une matrice en routant chaque ligne vers son modèle.
+
+        Les lignes d'un même modèle sont évaluées en un seul appel, les
+        différents modèles en parallèle dans le pool d'inférence.
+
+        Args:
+            default: Moteur global (établissements sans modèle spécialisé)
+            feature_matrix: Matrice (N, n_features) dans l'ordre du modèle
+            executor: Pool dans lequel évaluer chaque groupe
+            imputed: True si la matrice est déjà imputée (pas de NaN)
+
+        Returns:
+            Prédictions (N valeurs) dans l'ordre des lignes
+        """
+        facilities = facilities_of(feature_matrix, default.get_feature_order())
+        groups: dict[PredictionEngineProtocol, list[np.ndarray]] = {}
+        for facility in np.unique(facilities):
+            engine = await self.get(str(facility)) or default
+            groups.setdefault(engine, []).append(np.flatnonzero(facilities == facility))
+
+        def predict_fn(engine: PredictionEngineProtocol):
+            return engine.predict_imputed_array if imputed else engine.predict_array
+
+        if len(groups) == 1:
+            (engine,) = groups
+            return await executor.run(predict_fn(engine), feature_matrix)
+
+        row_groups = [np.concatenate(rows) for rows in groups.values()]
+        results = await asyncio.gather(
+            *(
+                executor.run(predict_fn(engine), feature_matrix[rows])
+                for engine, rows in zip(groups, row_groups)
+            )
+        )
+        predictions = np.empty(len(feature_matrix), dtype=np.float64)
+        for rows, values in zip(row_groups, results):
+            predictions[rows] = values
+        return predictions
+
+    def stats(self) -> dict:
+        """Retourne l'occupation et les compteurs du pool."""
+        return {
+            "available": self.facilities,
+            "loaded": list(self._models),
+            "failed": sorted(self._failed),
+            "memory_bytes": self.memory_bytes,
+            "memory_budget_bytes": int(self._budget),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -3,10 +3,20 @@ Imputation Service for missing continuous features.
 
 Replaces None continuous features with training-set means
 before passing the feature vector to the XGBoost model.
+
+Two modes are available:
+- dict mode (impute, impute_batch): one feature dict at a time;
+- array mode (impute_array): a whole (N, n_features) matrix at once, with
+  NaN for missing values, returning the missing-value mask from which the
+  per-row imputed_features maps are derived only when a response needs them.
 """
 
 import math
 
+import numpy as np
+
+from app.schemas.features import PredictionFeatures
+
 
 class ImputationService:
     """Replaces None continuous features with training-set means."""
@@ -56,6 +66,13 @@ class ImputationService:
         self._feature_means: dict[str, float] = {
             f: float(feature_means[f]) for f in self.CONTINUOUS_FEATURES
         }
+        # Moyennes dans l'ordre de CONTINUOUS_FEATURES (mode matriciel)
+        self._means_vector = np.array(
+            [self._feature_means[f] for f in self.CONTINUOUS_FEATURES],
+            dtype=np.float32,
+        )
+        # Ordre des features -> indices des colonnes continues
+        self._columns: dict[tuple[str, ...], np.ndarray] = {}
 
     @property
     def feature_means(self) -> dict[str, float]:
@@ -84,3 +101,94 @@ class ImputationService:
                 imputed_features[feature_name] = mean_value
 
         return clean_features, imputed_features
+
+    def imputed_features(self, features: PredictionFeatures) -> dict[str, float]:
+        """
+        Return the means that will replace missing fields, without copying the features.
+
+        Args:
+            features: Validated PredictionFeatures instance.
+
+        Returns:
+            {feature_name: mean_value_used} for imputed fields only.
+        """
+        return {
+            feature_name: self._feature_means[feature_name]
+            for feature_name in self.CONTINUOUS_FEATURES
+            if getattr(features, feature_name) is None
+        }
+
+    def impute_batch(
+        self, features_list: list[dict]
+    ) -> tuple[list[dict], list[dict[str, float]]]:
+        """
+        Replace None values with training means for several feature dicts.
+
+        Args:
+            features_list: Raw feature dicts from PredictionFeatures.model_dump().
+
+        Returns:
+            (clean_features_list, imputed_features_list), aligned with the input.
+        """
+        clean_features_list: list[dict] = []
+        imputed_features_list: list[dict[str, float]] = []
+
+        for features in features_list:
+            clean_features, imputed_features = self.impute(features)
+            clean_features_list.append(clean_features)
+            imputed_features_list.append(imputed_features)
+
+        return clean_features_list, imputed_features_list
+
+    def impute_array(
+        self, feature_matrix: np.ndarray, feature_order: list[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Replace NaN continuous values of a whole matrix with training means.
+
+        Args:
+            feature_matrix: (N, n_features) float matrix, NaN for missing values.
+                            Not modified (may be a read-only view).
+            feature_order: Column names of feature_matrix.
+
+        Returns:
+            (clean_matrix, mask)
+            - clean_matrix: feature_matrix itself if nothing is missing,
+              otherwise a copy with the NaN continuous values replaced.
+            - mask: (N, len(CONTINUOUS_FEATURES)) bool array, True where the
+              feature was imputed (columns in CONTINUOUS_FEATURES order).
+        """
+        columns = self._continuous_columns(feature_order)
+        continuous = feature_matrix[:, columns]
+        mask = np.isnan(continuous)
+        if not mask.any():
+            return feature_matrix, mask
+
+        clean_matrix = feature_matrix.copy()
+        clean_matrix[:, columns] = np.where(mask, self._means_vector, continuous)
+        return clean_matrix, mask
+
+    def imputed_features_from_mask(self, mask_row: np.ndarray) -> dict[str, float]:
+        """
+        Build the imputed_features map of one row of an impute_array mask.
+
+        Args:
+            mask_row: One row of the mask returned by impute_array().
+
+        Returns:
+            {feature_name: mean_value_used} for imputed fields only.
+        """
+        items = list(self._feature_means.items())
+        return dict(items[i] for i in np.flatnonzero(mask_row))
+
+    def _continuous_columns(self, feature_order: list[str]) -> np.ndarray:
+        """Indices of the continuous features in feature_order (computed once per order)."""
+        key = tuple(feature_order)
+        columns = self._columns.get(key)
+        if columns is None:
+            columns = np.array(
+                [feature_order.index(f) for f in self.CONTINUOUS_FEATURES],
+                dtype=np.intp,
+            )
+            self._columns[key] = columns
+        return columns
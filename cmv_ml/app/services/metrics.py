@@ -0,0 +1,206 @@
+"""
+In-process metrics exposed in the Prometheus text format (GET /metrics).
+
+Histograms and counters are thread-safe: the inference stages are observed
+from the executor threads. Values are per process; with several workers,
+each scrape reflects the worker that answered it.
+
+RGPD: labels only ever carry stage, route or feature names, never values.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Bornes des buckets de latence, en secondes (50 µs à 5 s)
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label selon le format texte Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    """Formate {name="value",...}, vide s'il n'y a aucun label."""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur monotone, éventuellement étiqueté."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Incrémente le compteur des labels donnés."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogramme à buckets fixes, éventuellement étiqueté."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._buckets = buckets
+        # Par labels: [compteurs par bucket (dernier = +Inf), somme]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Enregistre une observation (en secondes pour les latences)."""
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [[0] * (len(self._buckets) + 1), 0.0]
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """Mesure la durée du bloc."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total))
+                for labels, (counts, total) in self._series.items()
+            )
+        for label_values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self._buckets, "+Inf"), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_gauge(
+    name: str,
+    documentation: str,
+    samples: list[tuple[dict[str, str], float]],
+    metric_type: str = "gauge",
+) -> list[str]:
+    """Formate des valeurs lues au moment de la collecte (statistiques existantes)."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        label_text = _format_labels(tuple(labels), tuple(labels.values()))
+        lines.append(f"{name}{label_text} {_format_value(value)}")
+    return lines
+
+
+def render_histogram(
+    name: str,
+    documentation: str,
+    samples: list[tuple[dict[str, str], list[tuple[float, int]], float, int]],
+) -> list[str]:
+    """
+    Formate un histogramme tenu ailleurs (statistiques existantes).
+
+    Chaque échantillon est (labels, [(borne, nombre)] non cumulés, somme,
+    nombre total d'observations, reporté dans le bucket +Inf).
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} histogram"]
+    for labels, buckets, total, count in samples:
+        names, values = tuple(labels), tuple(labels.values())
+        cumulative = 0
+        for bound, bucket_count in buckets:
+            cumulative += bucket_count
+            label_text = _format_labels(names, values, f'le="{bound}"')
+            lines.append(f"{name}_bucket{label_text} {cumulative}")
+        label_text = _format_labels(names, values, 'le="+Inf"')
+        lines.append(f"{name}_bucket{label_text} {count}")
+        label_text = _format_labels(names, values)
+        lines.append(f"{name}_sum{label_text} {_format_value(total)}")
+        lines.append(f"{name}_count{label_text} {count}")
+    return lines
+
+
+# Durée de chaque étape de l'inférence
+stage_duration = Histogram(
+    "cmv_ml_stage_duration_seconds",
+    "Duration of each inference stage",
+    ("stage",),
+)
+
+# Durée totale des requêtes HTTP, par route
+request_duration = Histogram(
+    "cmv_ml_request_duration_seconds",
+    "Duration of HTTP requests",
+    ("method", "route", "status"),
+)
+
+# Fréquence d'imputation par feature (nombre d'occurrences, jamais les valeurs)
+imputed_features_total = Counter(
+    "cmv_ml_imputed_features_total",
+    "Number of predictions for which the feature was imputed",
+    ("feature",),
+)
+
+# Prédictions servies par endpoint
+predictions_total = Counter(
+    "cmv_ml_predictions_total",
+    "Number of predictions served",
+    ("endpoint",),
+)
@@ -0,0 +1,380 @@
+"""
+Versioned model registry with hot reload.
+
+Each version is a sub-directory of the registry holding the model and its
+feature means:
+
+    models/registry/
+        2026-10-01/model.ubj
+        2026-10-01/feature_means.json
+        2026-10-15/model.ubj
+        2026-10-15/feature_means.json
+        2026-10-15/facilities/B/model.ubj   (optional, see facility_pool)
+        CURRENT            (optional: name of the version to serve)
+
+Without a CURRENT file, the last version in lexical order is served. A new
+version is loaded and warmed up in a background thread, then swapped in
+together with its SHAP explainer and feature importance in a single
+assignment: in-flight requests finish on the bundle they started with.
+When the registry is absent, the legacy MODEL_PATH is loaded instead.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from app.schemas.features import PredictionFeatures
+from app.services.facility_pool import FACILITIES_DIRNAME, FacilityModelPool
+from app.services.prediction_engine import (
+    PredictionEngineProtocol,
+    create_prediction_engine,
+)
+from app.services.shap_explainer import (
+    ShapExplainerProtocol,
+    compute_feature_importance,
+    create_shap_explainer,
+)
+from app.utils.config import (
+    FACILITY_POOL_MEMORY_MB,
+    MODEL_PATH,
+    MODEL_REGISTRY_DIR,
+    PREDICTION_BACKEND,
+    PREDICT_MICROBATCH_MAX_SIZE,
+    SHAP_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fichiers de modèle reconnus dans un répertoire de version, par priorité
+MODEL_FILENAMES = ("model.ubj", "model.json", "model.joblib")
+MEANS_FILENAME = "feature_means.json"
+CURRENT_FILENAME = "CURRENT"
+
+
+class ModelVersionNotFoundError(Exception):
+    """Exception raised when a version is not present in the registry."""
+    pass
+
+
+class ModelActivationInProgressError(Exception):
+    """Exception raised when a version is already being loaded."""
+    pass
+
+
+class ModelBundle:
+    """Modèle chargé et préchauffé, avec ses dépendances, remplacé d'un bloc."""
+
+    __slots__ = (
+        "version",
+        "engine",
+        "shap_explainer",
+        "feature_importance",
+        "facility_pool",
+        "loaded_at",
+        "warmup_ms",
+    )
+
+    def __init__(
+        self,
+        version: str,
+        engine: PredictionEngineProtocol,
+        shap_explainer: ShapExplainerProtocol | None,
+        feature_importance: dict[str, float] | None,
+        warmup_ms: float | None,
+        facility_pool: FacilityModelPool | None = None,
+    ) -> None:
+        self.version = version
+        self.engine = engine
+        self.shap_explainer = shap_explainer
+        self.feature_importance = feature_importance
+        self.facility_pool = facility_pool
+        self.loaded_at = time.time()
+        self.warmup_ms = warmup_ms
+
+
+class ModelRegistry:
+    """
+    Registre des versions du modèle et version actuellement servie.
+
+    Le remplacement est atomique: self._active est réassigné en une fois,
+    et chaque requête lit le bundle actif une seule fois.
+    """
+
+    def __init__(
+        self, registry_dir: str, fallback_model_path: str, backend: str = "xgboost"
+    ) -> None:
+        """
+        Args:
+            registry_dir: Répertoire contenant un sous-répertoire par version
+            fallback_model_path: Modèle chargé si le registre est absent ou vide
+            backend: Backend d'inférence des moteurs créés
+        """
+        self._registry_dir = registry_dir
+        self._fallback_model_path = fallback_model_path
+        self._backend = backend
+        self._active: ModelBundle | None = None
+        self._lock = asyncio.Lock()
+        self._loading_version: str | None = None
+        self._last_error: str | None = None
+        self._watched_target: str | None = None
+        self._watcher: asyncio.Task | None = None
+
+    @property
+    def active(self) -> ModelBundle | None:
+        """Bundle actuellement servi (None avant le premier chargement)."""
+        return self._active
+
+    def list_versions(self) -> list[str]:
+        """Liste les versions complètes (modèle + moyennes) du registre."""
+        if not os.path.isdir(self._registry_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self._registry_dir)
+            if self._model_path(name) is not None
+            and os.path.isfile(os.path.join(self._registry_dir, name, MEANS_FILENAME))
+        )
+
+    def resolve_target(self) -> str | None:
+        """Version à servir: contenu de CURRENT, sinon la dernière version."""
+        versions = self.list_versions()
+        current_path = os.path.join(self._registry_dir, CURRENT_FILENAME)
+        if os.path.isfile(current_path):
+            with open(current_path) as f:
+                current = f.read().strip()
+            if current in versions:
+                return current
+            logger.warning(f"CURRENT points to unknown model version {current!r}")
+        return versions[-1] if versions else None
+
+    def _model_path(self, version: str) -> str | None:
+        """Chemin du fichier de modèle d'une version, None si absent."""
+        for filename in MODEL_FILENAMES:
+            path = os.path.join(self._registry_dir, version, filename)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def build_bundle(self, version: str | None, warm_up: bool = True) -> ModelBundle:
+        """
+        Charge et préchauffe une version (bloquant, hors event loop).
+
+        Args:
+            version: Version du registre, None pour le modèle MODEL_PATH
+            warm_up: Exécuter les chemins de prédiction avant de servir
+
+        Raises:
+            ModelVersionNotFoundError: Si la version n'existe pas
+            FileNotFoundError: Si un fichier est absent
+            ModelLoadError: Si le modèle ne peut pas être chargé
+        """
+        if version is None:
+            model_path = self._fallback_model_path
+            means_path = os.path.join(os.path.dirname(model_path), MEANS_FILENAME)
+        else:
+            model_path = self._model_path(version)
+            if model_path is None:
+                raise ModelVersionNotFoundError(f"Unknown model version: {version}")
+            means_path = os.path.join(self._registry_dir, version, MEANS_FILENAME)
+
+        engine = create_prediction_engine(self._backend)
+        engine.load_model(model_path)
+        engine.load_feature_means(means_path)
+
+        shap_explainer = None
+        feature_importance = None
+        # Explications et importance sont lues sur le Booster, absent du backend numpy
+        if self._backend == "xgboost":
+            try:
+                feature_importance = compute_feature_importance(
+                    engine._model, engine.get_feature_order()
+                )
+            except Exception as e:
+                # Importance is informative only - log and continue
+                logger.warning(f"Failed to compute feature importance: {e}")
+            if SHAP_ENABLED:
+                try:
+                    shap_explainer = create_shap_explainer(
+                        model=engine._model,
+                        feature_order=engine.get_feature_order(),
+                    )
+                except Exception as e:
+                    # SHAP initialization failure is not fatal - log and continue
+                    logger.warning(f"Failed to initialize SHAP explainer: {e}")
+
+        # Modèles par établissement: chargés à la demande, remplacés avec la version
+        facility_pool = None
+        if FACILITY_POOL_MEMORY_MB > 0:
+            facility_pool = FacilityModelPool(
+                os.path.join(os.path.dirname(model_path), FACILITIES_DIRNAME),
+                means_path,
+                backend=self._backend,
+                memory_budget_mb=FACILITY_POOL_MEMORY_MB,
+                model_filenames=MODEL_FILENAMES,
+            )
+            if not facility_pool.facilities:
+                facility_pool = None
+
+        warmup_ms = self._warm_up(engine, shap_explainer) if warm_up else None
+        return ModelBundle(
+            version=version or engine.model_version,
+            engine=engine,
+            shap_explainer=shap_explainer,
+            feature_importance=feature_importance,
+            warmup_ms=warmup_ms,
+            facility_pool=facility_pool,
+        )
+
+    @staticmethod
+    def _warm_up(
+        engine: PredictionEngineProtocol,
+        shap_explainer: ShapExplainerProtocol | None,
+    ) -> float:
+        """Exécute les chemins de prédiction une fois avant de servir le modèle."""
+        started = time.perf_counter()
+        # Features vides: toutes les continues sont imputées par la moyenne
+        features = PredictionFeatures()
+        engine.predict_features(features)
+        engine.predict_features_batch([features] * max(2, PREDICT_MICROBATCH_MAX_SIZE))
+        if shap_explainer is not None:
+            clean_features, _ = engine.imputation_service.impute(features.model_dump())
+            try:
+                shap_explainer.explain(clean_features)
+            except Exception as e:
+                # Les explications échoueront proprement par requête
+                logger.warning(f"SHAP warm-up failed: {e}")
+        return (time.perf_counter() - started) * 1000
+
+    def load_initial(self, warm_up: bool = True) -> None:
+        """
+        Charge la version cible au démarrage (bloquant, erreurs propagées).
+
+        Args:
+            warm_up: False dans le processus maître avant le fork: les pools
+                de threads OpenMP d'XGBoost ne survivent pas au fork, chaque
+                worker se préchauffe lui-même (warm_up_active)
+        """
+        target = self.resolve_target()
+        self._active = self.build_bundle(target, warm_up=warm_up)
+        self._watched_target = target
+        logger.info(f"Model version {self._active.version} loaded")
+
+    def warm_up_active(self) -> None:
+        """Préchauffe dans ce processus le bundle chargé avant le fork."""
+        active = self._active
+        if active is not None and active.warmup_ms is None:
+            active.warmup_ms = self._warm_up(active.engine, active.shap_explainer)
+
+    def set_current(self, version: str) -> None:
+        """
+        Écrit la version servie dans CURRENT (remplacement atomique).
+
+        Les autres workers, qui surveillent le registre, activent alors la
+        même version.
+
+        Raises:
+            OSError: Si le registre n'est pas accessible en écriture
+        """
+        current_path = os.path.join(self._registry_dir, CURRENT_FILENAME)
+        tmp_path = f"{current_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{version}\n")
+        os.replace(tmp_path, current_path)
+
+    async def activate(self, version: str) -> ModelBundle:
+        """
+        Charge une version en arrière-plan puis la substitue à la version active.
+
+        Args:
+            version: Version du registre à servir
+
+        Raises:
+            ModelVersionNotFoundError: Si la version n'existe pas
+            ModelActivationInProgressError: Si un chargement est déjà en cours
+        """
+        if version not in self.list_versions():
+            raise ModelVersionNotFoundError(f"Unknown model version: {version}")
+        if self._lock.locked():
+            raise ModelActivationInProgressError(
+                f"Model version {self._loading_version} is being loaded"
+            )
+
+        async with self._lock:
+            self._loading_version = version
+            try:
+                bundle = await asyncio.to_thread(self.build_bundle, version)
+            except Exception as e:
+                self._last_error = f"{version}: {e}"
+                raise
+            finally:
+                self._loading_version = None
+
+            # Substitution atomique: une seule réassignation
+            self._active = bundle
+            self._last_error = None
+            logger.info(f"Model version {version} activated")
+            return bundle
+
+    async def watch(self, interval: float) -> None:
+        """Surveille le registre et active la version cible quand elle change."""
+        while True:
+            await asyncio.sleep(interval)
+            target = self.resolve_target()
+            if target is None or target == self._watched_target:
+                continue
+            active = self._active
+            if active is not None and target == active.version:
+                # Déjà servie (activée par l'endpoint d'administration)
+                self._watched_target = target
+                continue
+            # Mémoriser la cible même en cas d'échec: pas de rechargement en boucle
+            self._watched_target = target
+            try:
+                await self.activate(target)
+            except ModelActivationInProgressError:
+                self._watched_target = None
+            except Exception as e:
+                logger.warning(f"Failed to activate model version {target}: {e}")
+
+    def start_watcher(self, interval: float) -> None:
+        """Démarre la surveillance du registre (interval <= 0: désactivée)."""
+        if interval > 0 and self._watcher is None:
+            self._watcher = asyncio.create_task(self.watch(interval))
+
+    async def stop_watcher(self) -> None:
+        """Arrête la surveillance du registre."""
+        if self._watcher is None:
+            return
+        self._watcher.cancel()
+        try:
+            await self._watcher
+        except asyncio.CancelledError:
+            pass
+        self._watcher = None
+
+    def status(self) -> dict:
+        """Retourne la version active, le chargement en cours et les versions disponibles."""
+        active = self._active
+        return {
+            "active_version": active.version if active else None,
+            "loaded_at": active.loaded_at if active else None,
+            "warmup_ms": active.warmup_ms if active else None,
+            "warmed_up": active is not None and active.warmup_ms is not None,
+            "loading_version": self._loading_version,
+            "last_error": self._last_error,
+            "available_versions": self.list_versions(),
+            "facility_models": (
+                active.facility_pool.stats()
+                if active is not None and active.facility_pool is not None
+                else None
+            ),
+        }
+
+
+# Instance singleton du registre pour l'application
+model_registry = ModelRegistry(
+    MODEL_REGISTRY_DIR,
+    fallback_model_path=MODEL_PATH,
+    backend=PREDICTION_BACKEND,
+)
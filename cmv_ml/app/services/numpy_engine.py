@@ -0,0 +1,341 @@
+"""
+Pure-NumPy inference backend for the XGBoost model.
+
+The trees of models/model.ubj (or a JSON model) are flattened once at load
+time into contiguous NumPy arrays, then evaluated for a whole batch with a
+vectorized traversal. The xgboost package is never imported, neither at
+load time nor at request time.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from app.services.prediction_engine import (
+    ModelLoadError,
+    XGBoostPredictionEngine,
+    model_file_version,
+)
+
+# Objectifs dont la sortie est la somme brute des arbres (lien identité)
+IDENTITY_OBJECTIVES = {
+    "reg:squarederror",
+    "reg:squaredlogerror",
+    "reg:pseudohubererror",
+    "reg:absoluteerror",
+    "reg:quantileerror",
+    "reg:linear",
+}
+
+# Types scalaires UBJSON (big-endian) -> format struct
+_UBJ_SCALARS = {
+    b"i": ">b",
+    b"U": ">B",
+    b"I": ">h",
+    b"l": ">i",
+    b"L": ">q",
+    b"d": ">f",
+    b"D": ">d",
+}
+
+
+class _UBJReader:
+    """Décodeur UBJSON minimal couvrant le sous-ensemble écrit par XGBoost."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def read(self):
+        """Lit la valeur suivante."""
+        return self._read_value(self._next_marker())
+
+    def _next_marker(self) -> bytes:
+        marker = self._data[self._pos : self._pos + 1]
+        self._pos += 1
+        # N = no-op
+        while marker == b"N":
+            marker = self._data[self._pos : self._pos + 1]
+            self._pos += 1
+        return marker
+
+    def _read_scalar(self, fmt: str):
+        size = struct.calcsize(fmt)
+        (value,) = struct.unpack_from(fmt, self._data, self._pos)
+        self._pos += size
+        return value
+
+    def _read_length(self) -> int:
+        return int(self._read_value(self._next_marker()))
+
+    def _read_string(self) -> str:
+        length = self._read_length()
+        value = self._data[self._pos : self._pos + length].decode("utf-8")
+        self._pos += length
+        return value
+
+    def _read_value(self, marker: bytes):
+        if marker in _UBJ_SCALARS:
+            return self._read_scalar(_UBJ_SCALARS[marker])
+        if marker == b"S":
+            return self._read_string()
+        if marker == b"C":
+            value = self._data[self._pos : self._pos + 1].decode("utf-8")
+            self._pos += 1
+            return value
+        if marker == b"T":
+            return True
+        if marker == b"F":
+            return False
+        if marker == b"Z":
+            return None
+        if marker == b"[":
+            return self._read_array()
+        if marker == b"{":
+            return self._read_object()
+        raise ValueError(f"Unsupported UBJSON marker {marker!r} at {self._pos - 1}")
+
+    def _read_container_header(self) -> tuple[bytes | None, int | None]:
+        """Lit les en-têtes optimisés $type et #count."""
+        value_type = None
+        count = None
+        if self._data[self._pos : self._pos + 1] == b"$":
+            value_type = self._data[self._pos + 1 : self._pos + 2]
+            self._pos += 2
+        if self._data[self._pos : self._pos + 1] == b"#":
+            self._pos += 1
+            count = self._read_length()
+        return value_type, count
+
+    def _read_array(self):
+        value_type, count = self._read_container_header()
+
+        if value_type in _UBJ_SCALARS and count is not None:
+            # Tableau typé: lecture directe du bloc binaire
+            dtype = np.dtype(_UBJ_SCALARS[value_type])
+            end = self._pos + count * dtype.itemsize
+            values = np.frombuffer(self._data[self._pos : end], dtype=dtype)
+            self._pos = end
+            return values.astype(dtype.newbyteorder("="))
+
+        values = []
+        if count is not None:
+            for _ in range(count):
+                marker = value_type or self._next_marker()
+                values.append(self._read_value(marker))
+            return values
+
+        while True:
+            marker = self._next_marker()
+            if marker == b"]":
+                return values
+            values.append(self._read_value(marker))
+
+    def _read_object(self) -> dict:
+        value_type, count = self._read_container_header()
+        result = {}
+        if count is not None:
+            for _ in range(count):
+                key = self._read_string()
+                result[key] = self._read_value(value_type or self._next_marker())
+            return result
+
+        while True:
+            if self._data[self._pos : self._pos + 1] == b"}":
+                self._pos += 1
+                return result
+            key = self._read_string()
+            result[key] = self._read_value(self._next_marker())
+
+
+def load_model_document(path: str) -> dict:
+    """
+    Lit un modèle XGBoost sérialisé (.ubj ou .json) sans importer xgboost.
+
+    Args:
+        path: Chemin vers le fichier du modèle
+
+    Returns:
+        Le document du modèle (structure du format JSON d'XGBoost)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if path.endswith(".json") or data[:1] == b"{" and data[1:2] in (b'"', b"\n", b" "):
+        return json.loads(data)
+    return _UBJReader(data).read()
+
+
+def _parse_base_score(value) -> float:
+    """Lit base_score, stocké '0.5' ou '[4.0017624E0]' selon la version d'XGBoost."""
+    if isinstance(value, str):
+        value = value.strip().strip("[]").split(",")[0]
+    return float(value)
+
+
+class CompiledForest:
+    """
+    Forêt XGBoost aplatie en tableaux NumPy contigus.
+
+    Tous les noeuds de tous les arbres sont concaténés; les index d'enfants
+    sont globaux. Les feuilles pointent sur elles-mêmes, ce qui permet de
+    parcourir tous les arbres en max_depth itérations vectorisées.
+    """
+
+    def __init__(self, document: dict) -> None:
+        """
+        Args:
+            document: Document du modèle (format JSON d'XGBoost)
+
+        Raises:
+            ValueError: Si le modèle utilise une fonctionnalité non supportée
+        """
+        learner = document["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective: {objective}")
+
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster: {booster['name']}")
+
+        model_param = learner["learner_model_param"]
+        if int(model_param.get("num_target", 1)) != 1 or int(
+            model_param.get("num_class", 0)
+        ) > 1:
+            raise ValueError("Only single-target regression models are supported")
+
+        self.base_score = np.float32(_parse_base_score(model_param["base_score"]))
+        self.num_feature = int(model_param["num_feature"])
+        self.feature_names: list[str] = list(learner.get("feature_names") or [])
+
+        trees = booster["model"]["trees"]
+        features, thresholds, lefts, rights, default_lefts, values = (
+            [], [], [], [], [], []
+        )
+        roots = []
+        offset = 0
+        max_depth = 0
+        for tree in trees:
+            if np.any(np.asarray(tree["split_type"]) != 0):
+                raise ValueError("Categorical splits are not supported")
+
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            is_leaf = left == -1
+            node_ids = np.arange(len(left), dtype=np.int32)
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+            # Pour une feuille, split_conditions contient la valeur de la feuille
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            thresholds.append(conditions)
+            values.append(np.where(is_leaf, conditions, 0.0).astype(np.float32))
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            default_lefts.append(np.asarray(tree["default_left"], dtype=bool))
+
+            max_depth = max(max_depth, self._tree_depth(left, right))
+            offset += len(left)
+
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.int32)
+        self.right = np.concatenate(rights).astype(np.int32)
+        self.default_left = np.concatenate(default_lefts)
+        self.leaf_value = np.concatenate(values)
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+        """Profondeur maximale d'un arbre (nombre de décisions jusqu'à une feuille)."""
+        depth = 0
+        frontier = np.array([0])
+        while True:
+            frontier = frontier[left[frontier] != -1]
+            if frontier.size == 0:
+                return depth
+            frontier = np.concatenate([left[frontier], right[frontier]])
+            depth += 1
+
+    @property
+    def num_trees(self) -> int:
+        """Nombre d'arbres de la forêt."""
+        return len(self.roots)
+
+    def predict(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """
+        Évalue tous les arbres pour un lot.
+
+        Args:
+            feature_matrix: Matrice (N, num_feature) float32, NaN = manquant
+
+        Returns:
+            Prédictions brutes (N,) float32
+        """
+        x = np.ascontiguousarray(feature_matrix, dtype=np.float32)
+        n_rows, n_features = x.shape
+        flat = x.ravel()
+        # Offset de chaque ligne dans la matrice aplatie
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.num_trees)).copy()
+
+        for _ in range(self.max_depth):
+            values = flat.take(row_offsets + self.feature.take(nodes))
+            # NaN < seuil est faux: les manquants suivent la direction par défaut
+            go_left = (values < self.threshold.take(nodes)) | (
+                np.isnan(values) & self.default_left.take(nodes)
+            )
+            nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+
+        return self.leaf_value.take(nodes).sum(axis=1, dtype=np.float32) + self.base_score
+
+
+class NumpyTreePredictionEngine(XGBoostPredictionEngine):
+    """
+    Implémentation sans xgboost: évaluation vectorisée des arbres en NumPy.
+
+    Partage l'imputation, l'ordre des features et l'API du moteur XGBoost;
+    seuls le chargement et l'évaluation du modèle diffèrent.
+    """
+
+    def load_model(self, path: str) -> None:
+        """
+        Charge et aplatit le modèle XGBoost (.ubj ou .json).
+
+        Args:
+            path: Chemin vers le fichier du modèle
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ModelLoadError: Si le modèle ne peut pas être chargé
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+
+        try:
+            forest = CompiledForest(load_model_document(path))
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load model from {path}: {e}")
+
+        if forest.feature_names and forest.feature_names != self._feature_order:
+            raise ModelLoadError(
+                f"Feature order of {path} does not match the expected order"
+            )
+        if forest.num_feature != len(self._feature_order):
+            raise ModelLoadError(
+                f"Model expects {forest.num_feature} features, got {len(self._feature_order)}"
+            )
+
+        self._model = forest
+        self._model_version = model_file_version(path)
+
+    def _execute_batch_prediction(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Execute prediction on a (N, n_features) matrix and return N clipped values."""
+        predictions = self._model.predict(feature_matrix)
+
+        # Ensure positive values (length of stay cannot be negative)
+        return np.maximum(predictions.astype(np.float64), 0.0)
@@ -0,0 +1,250 @@
+"""
+ONNX Runtime inference backend for the XGBoost model.
+
+The trees of models/model.ubj are exported once into an ONNX
+TreeEnsembleRegressor (python -m app.services.onnx_engine), then evaluated
+by onnxruntime's CPU execution provider. Neither xgboost nor shap is
+imported with this backend.
+
+Export (from cmv_ml/, writes models/model.onnx next to the model):
+    python -m app.services.onnx_engine models/model.ubj
+"""
+
+import logging
+import os
+import sys
+
+import numpy as np
+
+from app.services.numpy_engine import CompiledForest, load_model_document
+from app.services.prediction_engine import (
+    ModelLoadError,
+    XGBoostPredictionEngine,
+    model_file_version,
+)
+from app.utils.config import INFERENCE_NTHREAD
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAME = "model.onnx"
+# Version du modèle source, pour détecter un export périmé
+SOURCE_VERSION_KEY = "source_model_version"
+INPUT_NAME = "features"
+# Versions fixées: le package onnx produit par défaut des modèles plus
+# récents que ceux acceptés par onnxruntime
+ONNX_OPSET = 17
+ONNX_ML_OPSET = 1
+ONNX_IR_VERSION = 8
+
+
+def forest_to_onnx(forest: CompiledForest, source_version: str = ""):
+    """
+    Convertit une forêt aplatie en modèle ONNX (opérateur TreeEnsembleRegressor).
+
+    Même sémantique que le Booster: branche gauche si valeur < seuil, les
+    valeurs manquantes (NaN) suivent la direction par défaut du noeud.
+
+    Args:
+        forest: Forêt chargée depuis le document du modèle XGBoost
+        source_version: Version du fichier source, stockée en métadonnée
+
+    Returns:
+        onnx.ModelProto: entrée "features" (N, num_feature) float32,
+        sortie "predictions" (N, 1) float32
+    """
+    import onnx
+    from onnx import TensorProto, helper
+
+    bounds = list(forest.roots) + [len(forest.feature)]
+    nodes = {
+        "nodes_treeids": [],
+        "nodes_nodeids": [],
+        "nodes_featureids": [],
+        "nodes_values": [],
+        "nodes_modes": [],
+        "nodes_truenodeids": [],
+        "nodes_falsenodeids": [],
+        "nodes_missing_value_tracks_true": [],
+    }
+    targets = {
+        "target_treeids": [],
+        "target_nodeids": [],
+        "target_ids": [],
+        "target_weights": [],
+    }
+    for tree_id, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        for node in range(start, end):
+            node_id = node - start
+            # Dans CompiledForest, une feuille pointe sur elle-même
+            is_leaf = forest.left[node] == node
+            nodes["nodes_treeids"].append(tree_id)
+            nodes["nodes_nodeids"].append(node_id)
+            nodes["nodes_featureids"].append(int(forest.feature[node]))
+            nodes["nodes_values"].append(
+                0.0 if is_leaf else float(forest.threshold[node])
+            )
+            nodes["nodes_modes"].append("LEAF" if is_leaf else "BRANCH_LT")
+            nodes["nodes_truenodeids"].append(
+                0 if is_leaf else int(forest.left[node]) - start
+            )
+            nodes["nodes_falsenodeids"].append(
+                0 if is_leaf else int(forest.right[node]) - start
+            )
+            nodes["nodes_missing_value_tracks_true"].append(
+                int(not is_leaf and forest.default_left[node])
+            )
+            if is_leaf:
+                targets["target_treeids"].append(tree_id)
+                targets["target_nodeids"].append(node_id)
+                targets["target_ids"].append(0)
+                targets["target_weights"].append(float(forest.leaf_value[node]))
+
+    ensemble = helper.make_node(
+        "TreeEnsembleRegressor",
+        inputs=[INPUT_NAME],
+        outputs=["predictions"],
+        domain="ai.onnx.ml",
+        n_targets=1,
+        aggregate_function="SUM",
+        post_transform="NONE",
+        base_values=[float(forest.base_score)],
+        **nodes,
+        **targets,
+    )
+    graph = helper.make_graph(
+        [ensemble],
+        "cmv_ml_length_of_stay",
+        [helper.make_tensor_value_info(INPUT_NAME, TensorProto.FLOAT, [None, forest.num_feature])],
+        [helper.make_tensor_value_info("predictions", TensorProto.FLOAT, [None, 1])],
+    )
+    model = helper.make_model(
+        graph,
+        opset_imports=[
+            helper.make_opsetid("", ONNX_OPSET),
+            helper.make_opsetid("ai.onnx.ml", ONNX_ML_OPSET),
+        ],
+        producer_name="cmv_ml",
+        ir_version=ONNX_IR_VERSION,
+    )
+    helper.set_model_props(model, {SOURCE_VERSION_KEY: source_version})
+    onnx.checker.check_model(model)
+    return model
+
+
+def export_onnx(model_path: str, output_path: str | None = None) -> str:
+    """
+    Exporte un modèle XGBoost (.ubj ou .json) au format ONNX.
+
+    Args:
+        model_path: Chemin du modèle XGBoost
+        output_path: Fichier ONNX à écrire (défaut: model.onnx à côté du modèle)
+
+    Returns:
+        Chemin du fichier ONNX écrit
+    """
+    forest = CompiledForest(load_model_document(model_path))
+    model = forest_to_onnx(forest, model_file_version(model_path))
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(model_path), ONNX_FILENAME)
+    with open(output_path, "wb") as f:
+        f.write(model.SerializeToString())
+    return output_path
+
+
+class OnnxPredictionEngine(XGBoostPredictionEngine):
+    """
+    Implémentation onnxruntime (CPU) du moteur de prédiction.
+
+    Partage l'imputation, l'ordre des features et l'API du moteur XGBoost;
+    seuls le chargement et l'évaluation du modèle diffèrent.
+    """
+
+    def __init__(self, nthread: int = INFERENCE_NTHREAD):
+        """
+        Args:
+            nthread: Threads onnxruntime par appel (0 = valeur par défaut)
+        """
+        super().__init__()
+        self._nthread = nthread
+
+    def load_model(self, path: str) -> None:
+        """
+        Charge le modèle ONNX exporté à côté du modèle XGBoost.
+
+        Si model.onnx est absent ou a été exporté depuis une autre version
+        du modèle, la conversion est faite en mémoire (package onnx requis).
+
+        Args:
+            path: Chemin vers le modèle XGBoost (.ubj ou .json) ou un .onnx
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ModelLoadError: Si le modèle ne peut pas être chargé
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+
+        import onnxruntime as ort
+
+        version = model_file_version(path)
+        onnx_path = (
+            path
+            if path.endswith(".onnx")
+            else os.path.join(os.path.dirname(path), ONNX_FILENAME)
+        )
+        options = ort.SessionOptions()
+        if self._nthread > 0:
+            options.intra_op_num_threads = self._nthread
+
+        try:
+            session = None
+            if os.path.isfile(onnx_path):
+                session = ort.InferenceSession(
+                    onnx_path, options, providers=["CPUExecutionProvider"]
+                )
+                source_version = session.get_modelmeta().custom_metadata_map.get(
+                    SOURCE_VERSION_KEY
+                )
+                if path != onnx_path and source_version != version:
+                    logger.warning(
+                        f"{onnx_path} was exported from another model version, "
+                        "converting in memory"
+                    )
+                    session = None
+            if session is None:
+                forest = CompiledForest(load_model_document(path))
+                session = ort.InferenceSession(
+                    forest_to_onnx(forest, version).SerializeToString(),
+                    options,
+                    providers=["CPUExecutionProvider"],
+                )
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load model from {path}: {e}")
+
+        num_feature = session.get_inputs()[0].shape[1]
+        if num_feature != len(self._feature_order):
+            raise ModelLoadError(
+                f"Model expects {num_feature} features, got {len(self._feature_order)}"
+            )
+
+        self._model = session
+        self._model_version = version
+
+    def _execute_batch_prediction(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Execute prediction on a (N, n_features) matrix and return N clipped values."""
+        (predictions,) = self._model.run(
+            None, {INPUT_NAME: np.ascontiguousarray(feature_matrix, dtype=np.float32)}
+        )
+
+        # Ensure positive values (length of stay cannot be negative)
+        return np.maximum(predictions[:, 0].astype(np.float64), 0.0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print(
+            "Usage: python -m app.services.onnx_engine MODEL_PATH [OUTPUT_PATH]",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    print(f"ONNX model written to {export_onnx(*sys.argv[1:])}")
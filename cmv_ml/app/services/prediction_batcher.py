@@ -0,0 +1,248 @@
+"""
+Micro-batching scheduler for single-patient predictions.
+
+Concurrent /predict calls are queued and flushed as one batched booster
+call when either the maximum batch size or the maximum wait is reached.
+Each caller then receives its own row back. Requests carry the engine they
+were issued against, so a model swap never mixes two models in one call.
+"""
+
+import asyncio
+
+from app.schemas.features import PredictionFeatures
+from app.services.executors import BoundedExecutor
+from app.services.prediction_engine import PredictionEngineProtocol
+
+
+class BatchSizeStats:
+    """Compteurs des tailles de lots effectivement envoyés au modèle."""
+
+    def __init__(self, max_batch_size: int) -> None:
+        # Bornes supérieures des buckets: 1, 2, 4, ... jusqu'à max_batch_size
+        self._bounds: list[int] = []
+        bound = 1
+        while bound < max_batch_size:
+            self._bounds.append(bound)
+            bound *= 2
+        self._bounds.append(max_batch_size)
+        self._bucket_counts = [0] * len(self._bounds)
+        self.flushes = 0
+        self.items = 0
+        self.max_size = 0
+        self.last_size = 0
+
+    def record(self, size: int) -> None:
+        """Enregistre la taille d'un lot envoyé au modèle."""
+        self.flushes += 1
+        self.items += size
+        self.last_size = size
+        self.max_size = max(self.max_size, size)
+        for i, bound in enumerate(self._bounds):
+            if size <= bound:
+                self._bucket_counts[i] += 1
+                break
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """Retourne (borne supérieure, nombre de lots) par bucket, non cumulés."""
+        return list(zip(self._bounds, self._bucket_counts))
+
+    def as_dict(self) -> dict:
+        """Retourne un instantané des compteurs."""
+        return {
+            "flushes": self.flushes,
+            "items": self.items,
+            "mean_size": self.items / self.flushes if self.flushes else 0.0,
+            "max_size": self.max_size,
+            "last_size": self.last_size,
+            "size_buckets": {f"le_{bound}": count for bound, count in self.buckets()},
+        }
+
+
+class PredictionBatcher:
+    """
+    Regroupe les appels concurrents à predict en un seul appel au modèle.
+
+    Un lot est envoyé dès que max_batch_size requêtes sont en attente ou
+    que max_wait_ms s'est écoulé depuis la première. Sous faible charge
+    (file vide et lot précédent de taille 1), la requête est envoyée
+    immédiatement pour ne pas ajouter de latence.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        executor: BoundedExecutor | None = None,
+    ) -> None:
+        """
+        Args:
+            max_batch_size: Nombre maximal de requêtes par lot
+            max_wait_ms: Attente maximale avant l'envoi d'un lot incomplet
+            executor: Pool dans lequel évaluer les lots (None = event loop)
+        """
+        self._executor = executor
+        self._inflight: set[asyncio.Task] = set()
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: asyncio.Queue[
+            tuple[PredictionEngineProtocol, PredictionFeatures, asyncio.Future]
+        ] | None = None
+        self._worker: asyncio.Task | None = None
+        # Lot en cours de collecte au moment de l'arrêt
+        self._unflushed: list[
+            tuple[PredictionEngineProtocol, PredictionFeatures, asyncio.Future]
+        ] = []
+        self._stats = BatchSizeStats(self._max_batch_size)
+
+    async def start(self) -> None:
+        """Démarre la tâche de fond qui vide la file."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de fond après avoir servi les requêtes en attente."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Servir le lot interrompu pendant sa collecte et la file
+        pending, self._unflushed = self._unflushed, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+        if self._inflight:
+            await asyncio.gather(*self._inflight)
+        self._queue = None
+
+    @property
+    def is_running(self) -> bool:
+        """Indique si la tâche de fond est active."""
+        return self._worker is not None
+
+    @property
+    def batch_sizes(self) -> BatchSizeStats:
+        """Tailles des lots envoyés au modèle (exportées dans /metrics)."""
+        return self._stats
+
+    async def predict(
+        self, engine: PredictionEngineProtocol, features: PredictionFeatures
+    ) -> float:
+        """
+        Soumet une requête au prochain lot et attend sa prédiction.
+
+        Si le scheduler n'est pas démarré, la prédiction est exécutée
+        directement.
+
+        Args:
+            engine: Moteur de prédiction exposant predict_features_batch()
+            features: Features médicales validées (imputées par le moteur)
+
+        Returns:
+            Prédiction de durée d'hospitalisation en jours
+        """
+        if self._worker is None or self._max_batch_size == 1:
+            self._stats.record(1)
+            return await self._call(engine.predict_features, features)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((engine, features, future))
+        return await future
+
+    def stats(self) -> dict:
+        """Retourne les statistiques des tailles de lots réalisées."""
+        return {
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": self._max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            **self._stats.as_dict(),
+        }
+
+    async def _run(self) -> None:
+        """Boucle de fond: collecte les requêtes en lots puis les évalue."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+
+            # Récupérer sans attendre ce qui est déjà dans la file
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Attendre les retardataires seulement si la charge le justifie
+            if len(batch) > 1 or self._stats.last_size > 1:
+                deadline = loop.time() + self._max_wait
+                try:
+                    while len(batch) < self._max_batch_size:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            batch.append(
+                                await asyncio.wait_for(self._queue.get(), timeout)
+                            )
+                        except TimeoutError:
+                            break
+                except asyncio.CancelledError:
+                    # Arrêt pendant la collecte: le lot est servi par stop()
+                    self._unflushed = batch
+                    raise
+
+            # Évaluer le lot sans bloquer la collecte du suivant
+            task = asyncio.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _call(self, fn, *args):
+        """Exécute fn dans le pool configuré, ou directement à défaut."""
+        if self._executor is None:
+            return fn(*args)
+        return await self._executor.run(fn, *args)
+
+    async def _flush(
+        self,
+        batch: list[
+            tuple[PredictionEngineProtocol, PredictionFeatures, asyncio.Future]
+        ],
+    ) -> None:
+        """Évalue un lot et distribue chaque ligne à son appelant."""
+        # Un groupe par moteur: changement de modèle ou modèles par
+        # établissement, évalués en parallèle
+        groups: dict[
+            PredictionEngineProtocol,
+            list[tuple[PredictionFeatures, asyncio.Future]],
+        ] = {}
+        for engine, features, future in batch:
+            groups.setdefault(engine, []).append((features, future))
+
+        await asyncio.gather(
+            *(self._flush_group(engine, group) for engine, group in groups.items())
+        )
+
+    async def _flush_group(
+        self,
+        engine: PredictionEngineProtocol,
+        group: list[tuple[PredictionFeatures, asyncio.Future]],
+    ) -> None:
+        """Évalue les requêtes d'un même moteur en un seul appel."""
+        self._stats.record(len(group))
+        try:
+            predictions = await self._call(
+                engine.predict_features_batch,
+                [features for features, _ in group],
+            )
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(group, predictions):
+            if not future.done():
+                future.set_result(prediction)
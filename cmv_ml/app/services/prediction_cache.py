@@ -1,60 +1,370 @@
-"""Cache en mémoire des prédictions en attente de validation."""
+"""Cache des prédictions en attente de validation.
 
-from datetime import datetime, timedelta, timezone
+Deux implémentations sont disponibles:
+- InMemoryPredictionCache: bornée en taille, expiration via un tas de TTL
+  (un seul worker uvicorn);
+- ValkeyPredictionCache: partagée entre les workers et les conteneurs.
+
+Seule la valeur prédite est stockée, jamais les features médicales (RGPD).
+"""
+
+import heapq
+import logging
+import time
+from itertools import count
+from typing import Protocol
 from uuid import UUID
 
+from app.utils.config import (
+    PREDICTION_CACHE_BACKEND,
+    PREDICTION_CACHE_MAX_SIZE,
+    PREDICTION_CACHE_TTL_MINUTES,
+    VALKEY_HOST,
+    VALKEY_PORT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCacheProtocol(Protocol):
+    """Interface du cache de prédictions en attente de validation."""
+
+    async def store(self, prediction_id: UUID, value: float) -> None:
+        """Stocke une prédiction temporairement."""
+        ...
+
+    async def store_many(self, items: list[tuple[UUID, float]]) -> None:
+        """Stocke plusieurs prédictions en une seule opération."""
+        ...
+
+    async def get(self, prediction_id: UUID) -> float | None:
+        """Récupère une prédiction si elle existe et n'est pas expirée."""
+        ...
+
+    async def get_many(self, prediction_ids: list[UUID]) -> list[float | None]:
+        """Récupère plusieurs prédictions (None si absente ou expirée)."""
+        ...
+
+    async def remove(self, prediction_id: UUID) -> None:
+        """Supprime une prédiction du cache."""
+        ...
+
+    async def remove_many(self, prediction_ids: list[UUID]) -> None:
+        """Supprime plusieurs prédictions en une seule opération."""
+        ...
+
+    def stats(self) -> dict:
+        """Retourne les compteurs hit/miss/éviction."""
+        ...
+
+
+class CacheStats:
+    """Compteurs d'utilisation du cache."""
+
+    __slots__ = ("hits", "misses", "stores", "expirations", "evictions", "errors")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        """Retourne un instantané des compteurs."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _CacheEntry:
+    """Entrée compacte du cache en mémoire."""
+
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: float, expires_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+
+
+class InMemoryPredictionCache:
+    """Cache en mémoire borné des prédictions en attente de validation.
 
-class PredictionCache:
-    """Cache en mémoire des prédictions en attente de validation.
-    
-    Stocke temporairement les prédictions générées pour permettre leur
-    validation ultérieure sans re-soumettre les features médicales.
-    Les entrées expirent automatiquement après le TTL configuré.
+    Les expirations sont indexées dans un tas (expires_at, seq, id): les
+    entrées expirées sont purgées à chaque écriture, sans attendre d'être
+    relues. Quand le cache est plein, l'entrée la plus proche de son
+    expiration (donc la plus ancienne, le TTL étant fixe) est évincée.
     """
-    
-    def __init__(self, ttl_minutes: int = 1):
-        """Initialise le cache avec un TTL configurable.
-        
+
+    def __init__(self, ttl_minutes: int = 30, max_size: int = 100_000):
+        """Initialise le cache avec un TTL et une taille maximale.
+
         Args:
             ttl_minutes: Durée de vie des entrées en minutes (défaut: 30)
+            max_size: Nombre maximal d'entrées conservées
         """
-        self._cache: dict[UUID, tuple[float, datetime]] = {}
-        self._ttl = timedelta(minutes=ttl_minutes)
-    
-    def store(self, prediction_id: UUID, value: float) -> None:
+        self._entries: dict[UUID, _CacheEntry] = {}
+        self._expiry_heap: list[tuple[float, int, UUID]] = []
+        self._sequence = count()
+        self._ttl = ttl_minutes * 60
+        self._max_size = max(1, max_size)
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def store(self, prediction_id: UUID, value: float) -> None:
         """Stocke une prédiction temporairement.
-        
+
         Args:
             prediction_id: Identifiant unique de la prédiction
             value: Valeur prédite (durée d'hospitalisation en jours)
         """
-        self._cache[prediction_id] = (value, datetime.now(timezone.utc))
-    
-    def get(self, prediction_id: UUID) -> float | None:
+        self._store(prediction_id, value, time.monotonic())
+
+    async def store_many(self, items: list[tuple[UUID, float]]) -> None:
+        """Stocke plusieurs prédictions (ex: résultat de /predict-batch).
+
+        Args:
+            items: Couples (identifiant de prédiction, valeur prédite)
+        """
+        now = time.monotonic()
+        for prediction_id, value in items:
+            self._store(prediction_id, value, now)
+
+    async def get(self, prediction_id: UUID) -> float | None:
         """Récupère une prédiction si elle existe et n'est pas expirée.
-        
+
         Args:
             prediction_id: Identifiant unique de la prédiction
-            
+
         Returns:
             La valeur prédite si trouvée et non expirée, None sinon
         """
-        if prediction_id not in self._cache:
+        entry = self._entries.get(prediction_id)
+        if entry is None:
+            self._stats.misses += 1
             return None
-        value, timestamp = self._cache[prediction_id]
-        if datetime.now(timezone.utc) - timestamp > self._ttl:
-            del self._cache[prediction_id]
+        if entry.expires_at <= time.monotonic():
+            del self._entries[prediction_id]
+            self._stats.expirations += 1
+            self._stats.misses += 1
             return None
-        return value
-    
-    def remove(self, prediction_id: UUID) -> None:
+        self._stats.hits += 1
+        return entry.value
+
+    async def get_many(self, prediction_ids: list[UUID]) -> list[float | None]:
+        """Récupère plusieurs prédictions (ex: validation par lot).
+
+        Args:
+            prediction_ids: Identifiants des prédictions
+
+        Returns:
+            Valeurs dans l'ordre des identifiants, None si absente ou expirée
+        """
+        return [await self.get(prediction_id) for prediction_id in prediction_ids]
+
+    async def remove(self, prediction_id: UUID) -> None:
         """Supprime une prédiction du cache.
-        
+
         Args:
             prediction_id: Identifiant unique de la prédiction à supprimer
         """
-        self._cache.pop(prediction_id, None)
+        self._entries.pop(prediction_id, None)
+
+    async def remove_many(self, prediction_ids: list[UUID]) -> None:
+        """Supprime plusieurs prédictions du cache.
+
+        Args:
+            prediction_ids: Identifiants des prédictions à supprimer
+        """
+        for prediction_id in prediction_ids:
+            self._entries.pop(prediction_id, None)
+
+    def stats(self) -> dict:
+        """Retourne les compteurs et l'occupation du cache."""
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            **self._stats.as_dict(),
+        }
+
+    def _store(self, prediction_id: UUID, value: float, now: float) -> None:
+        """Insère une entrée après purge des expirées et éviction si plein."""
+        self._purge_expired(now)
+        if prediction_id not in self._entries:
+            while len(self._entries) >= self._max_size:
+                self._evict_oldest()
+
+        expires_at = now + self._ttl
+        self._entries[prediction_id] = _CacheEntry(value, expires_at)
+        heapq.heappush(
+            self._expiry_heap, (expires_at, next(self._sequence), prediction_id)
+        )
+        self._stats.stores += 1
+
+        # Les éléments obsolètes du tas (entrées supprimées ou réécrites)
+        # ne doivent pas le faire croître indéfiniment
+        if len(self._expiry_heap) > 2 * self._max_size:
+            self._rebuild_heap()
+
+    def _is_current(self, expires_at: float, prediction_id: UUID) -> bool:
+        """Vérifie qu'un élément du tas correspond encore à l'entrée stockée."""
+        entry = self._entries.get(prediction_id)
+        return entry is not None and entry.expires_at == expires_at
+
+    def _purge_expired(self, now: float) -> None:
+        """Supprime les entrées expirées en tête du tas."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, prediction_id = heapq.heappop(heap)
+            if self._is_current(expires_at, prediction_id):
+                del self._entries[prediction_id]
+                self._stats.expirations += 1
+
+    def _evict_oldest(self) -> None:
+        """Évince l'entrée valide la plus proche de son expiration."""
+        while self._expiry_heap:
+            expires_at, _, prediction_id = heapq.heappop(self._expiry_heap)
+            if self._is_current(expires_at, prediction_id):
+                del self._entries[prediction_id]
+                self._stats.evictions += 1
+                return
+
+    def _rebuild_heap(self) -> None:
+        """Reconstruit le tas à partir des seules entrées présentes."""
+        self._expiry_heap = [
+            (entry.expires_at, next(self._sequence), prediction_id)
+            for prediction_id, entry in self._entries.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+
+
+class ValkeyPredictionCache:
+    """Cache Valkey des prédictions, partagé entre les workers.
+
+    L'expiration est déléguée à Valkey (SETEX). Une indisponibilité de
+    Valkey n'empêche pas la prédiction: l'erreur est journalisée et la
+    prédiction ne pourra simplement pas être validée.
+    """
+
+    KEY_PREFIX = "ml:prediction:"
+
+    def __init__(self, url: str, ttl_minutes: int = 30):
+        """Initialise le client Valkey (connexion ouverte à la première requête).
+
+        Args:
+            url: URL de connexion (redis://host:port)
+            ttl_minutes: Durée de vie des entrées en minutes (défaut: 30)
+        """
+        from redis import asyncio as aioredis
+
+        self._client = aioredis.from_url(url, decode_responses=True)
+        self._ttl = ttl_minutes * 60
+        self._stats = CacheStats()
+
+    def _key(self, prediction_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}{prediction_id}"
+
+    async def store(self, prediction_id: UUID, value: float) -> None:
+        """Stocke une prédiction avec expiration côté Valkey."""
+        await self.store_many([(prediction_id, value)])
+
+    async def store_many(self, items: list[tuple[UUID, float]]) -> None:
+        """Stocke plusieurs prédictions en un seul aller-retour (pipeline)."""
+        from redis.exceptions import RedisError
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for prediction_id, value in items:
+                    pipe.setex(self._key(prediction_id), self._ttl, repr(value))
+                await pipe.execute()
+            self._stats.stores += len(items)
+        except RedisError as e:
+            self._stats.errors += 1
+            logger.warning(f"Failed to store predictions in Valkey: {e}")
+
+    async def get(self, prediction_id: UUID) -> float | None:
+        """Récupère une prédiction si elle existe (les expirées sont absentes)."""
+        from redis.exceptions import RedisError
+
+        try:
+            value = await self._client.get(self._key(prediction_id))
+        except RedisError as e:
+            self._stats.errors += 1
+            logger.warning(f"Failed to read prediction from Valkey: {e}")
+            return None
+
+        if value is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return float(value)
+
+    async def get_many(self, prediction_ids: list[UUID]) -> list[float | None]:
+        """Récupère plusieurs prédictions en un seul aller-retour (MGET)."""
+        from redis.exceptions import RedisError
+
+        if not prediction_ids:
+            return []
+
+        try:
+            values = await self._client.mget(
+                [self._key(prediction_id) for prediction_id in prediction_ids]
+            )
+        except RedisError as e:
+            self._stats.errors += 1
+            logger.warning(f"Failed to read predictions from Valkey: {e}")
+            return [None] * len(prediction_ids)
+
+        hits = sum(value is not None for value in values)
+        self._stats.hits += hits
+        self._stats.misses += len(values) - hits
+        return [float(value) if value is not None else None for value in values]
+
+    async def remove(self, prediction_id: UUID) -> None:
+        """Supprime une prédiction du cache."""
+        await self.remove_many([prediction_id])
+
+    async def remove_many(self, prediction_ids: list[UUID]) -> None:
+        """Supprime plusieurs prédictions en une seule commande DEL."""
+        from redis.exceptions import RedisError
+
+        if not prediction_ids:
+            return
+
+        try:
+            await self._client.delete(
+                *(self._key(prediction_id) for prediction_id in prediction_ids)
+            )
+        except RedisError as e:
+            self._stats.errors += 1
+            logger.warning(f"Failed to remove predictions from Valkey: {e}")
+
+    def stats(self) -> dict:
+        """Retourne les compteurs locaux à ce worker."""
+        return {"backend": "valkey", **self._stats.as_dict()}
+
+
+def create_prediction_cache(backend: str = "memory") -> PredictionCacheProtocol:
+    """Crée le cache de prédictions pour le backend configuré.
+
+    Args:
+        backend: "memory" (un seul worker) ou "valkey" (partagé)
+
+    Returns:
+        Instance du cache
+    """
+    if backend == "valkey":
+        return ValkeyPredictionCache(
+            f"redis://{VALKEY_HOST}:{VALKEY_PORT}",
+            ttl_minutes=PREDICTION_CACHE_TTL_MINUTES,
+        )
+    return InMemoryPredictionCache(
+        ttl_minutes=PREDICTION_CACHE_TTL_MINUTES,
+        max_size=PREDICTION_CACHE_MAX_SIZE,
+    )
 
 
 # Instance singleton du cache pour l'application
-prediction_cache = PredictionCache()
+prediction_cache = create_prediction_cache(PREDICTION_CACHE_BACKEND)
@@ -6,10 +6,15 @@ hospital length of stay predictions.
 """
 
 from typing import Protocol
+import hashlib
 import json
+import threading
+import time
 import numpy as np
 
+from app.schemas.features import PredictionFeatures
 from app.services.imputation_service import ImputationService
+from app.services.metrics import stage_duration
 
 
 class PredictionEngineProtocol(Protocol):
@@ -23,6 +28,26 @@ class PredictionEngineProtocol(Protocol):
         """Retourne la prédiction de durée d'hospitalisation."""
         ...
     
+    def predict_batch(self, features_list: list[dict]) -> list[float]:
+        """Retourne les prédictions pour plusieurs patients en un seul appel."""
+        ...
+    
+    def predict_features(self, features: PredictionFeatures) -> float:
+        """Retourne la prédiction à partir des features validées (imputation incluse)."""
+        ...
+    
+    def predict_features_batch(self, features_list: list[PredictionFeatures]) -> list[float]:
+        """Retourne les prédictions de plusieurs features validées (imputation incluse)."""
+        ...
+    
+    def predict_array(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Retourne les prédictions d'une matrice (N, n_features), NaN = manquante."""
+        ...
+    
+    def predict_imputed_array(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Retourne les prédictions d'une matrice déjà imputée (sans NaN)."""
+        ...
+    
     def get_feature_order(self) -> list[str]:
         """Retourne l'ordre des features attendu par le modèle."""
         ...
@@ -38,11 +63,21 @@ class ModelLoadError(Exception):
     pass
 
 
+def model_file_version(path: str) -> str:
+    """Return a short content hash identifying a model file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
 class XGBoostPredictionEngine:
     """Implémentation avec XGBoost."""
     
     def __init__(self):
         self._model = None
+        self._model_version = ""
         self._imputation_service: ImputationService | None = None
         self._feature_means: dict[str, float] | None = None
         # Ordre des features tel qu'attendu par le modèle XGBoost
@@ -54,6 +89,10 @@ class XGBoostPredictionEngine:
             "creatinine", "bmi", "pulse", "respiration", "secondarydiagnosisnonicd9",
             "facid_B", "facid_C", "facid_D", "facid_E"
         ]
+        # Valeur de remplacement par feature (moyenne d'entraînement ou NaN)
+        self._fill_values: tuple[float, ...] = (np.nan,) * len(self._feature_order)
+        # Buffer de ligne préalloué, un par thread (inplace_predict)
+        self._row_buffers = threading.local()
     
     def load_model(self, path: str) -> None:
         """
@@ -86,6 +125,8 @@ class XGBoostPredictionEngine:
             raise
         except Exception as e:
             raise ModelLoadError(f"Failed to load model from {path}: {e}")
+        
+        self._model_version = model_file_version(path)
     
     def _load_json_model(self, path: str) -> None:
         """Load model from native XGBoost JSON format."""
@@ -117,33 +158,247 @@ class XGBoostPredictionEngine:
             raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
         
         # Convert features dict to numpy array in correct order
+        started = time.perf_counter()
         feature_array = self._features_to_array(features)
+        stage_duration.observe(time.perf_counter() - started, "array_build")
         
         # Execute prediction based on model type
         return self._execute_prediction(feature_array)
     
+    def predict_batch(self, features_list: list[dict]) -> list[float]:
+        """
+        Exécute la prédiction pour plusieurs patients en un seul appel au modèle.
+        
+        Args:
+            features_list: Liste de dictionnaires des features médicales
+            
+        Returns:
+            Prédictions de durée d'hospitalisation en jours, dans l'ordre d'entrée
+            
+        Raises:
+            ModelNotLoadedError: Si le modèle n'est pas chargé
+        """
+        if self._model is None:
+            raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
+        
+        if not features_list:
+            return []
+        
+        started = time.perf_counter()
+        feature_matrix = self._features_to_matrix(features_list)
+        stage_duration.observe(time.perf_counter() - started, "array_build")
+        return self._timed_batch_prediction(feature_matrix).tolist()
+    
+    def predict_features(self, features: PredictionFeatures) -> float:
+        """
+        Chemin rapide pour un seul patient.
+        
+        Lit directement les champs validés (sans model_dump()), remplace les
+        valeurs manquantes par les moyennes d'entraînement et écrit la ligne
+        dans un buffer float32 réutilisé, propre au thread courant, évalué
+        via Booster.inplace_predict (sans DMatrix).
+        
+        Args:
+            features: Features médicales validées du patient
+            
+        Returns:
+            Prédiction de durée d'hospitalisation en jours (float positif)
+            
+        Raises:
+            ModelNotLoadedError: Si le modèle n'est pas chargé
+        """
+        if self._model is None:
+            raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
+        
+        started = time.perf_counter()
+        row = self._get_row_buffer()
+        self._fill_row(features, row[0])
+        stage_duration.observe(time.perf_counter() - started, "array_build")
+        
+        if not hasattr(self._model, "inplace_predict"):
+            # sklearn-style model (from joblib)
+            return float(self._timed_batch_prediction(row)[0])
+        
+        started = time.perf_counter()
+        result = float(self._model.inplace_predict(row)[0])
+        stage_duration.observe(time.perf_counter() - started, "booster_predict")
+        return max(result, 0.0)
+    
+    def predict_features_batch(self, features_list: list[PredictionFeatures]) -> list[float]:
+        """
+        Exécute la prédiction pour plusieurs features validées (imputation incluse).
+        
+        Un lot d'un seul élément passe par le chemin rapide predict_features().
+        
+        Args:
+            features_list: Features médicales validées des patients
+            
+        Returns:
+            Prédictions de durée d'hospitalisation en jours, dans l'ordre d'entrée
+            
+        Raises:
+            ModelNotLoadedError: Si le modèle n'est pas chargé
+        """
+        if len(features_list) == 1:
+            return [self.predict_features(features_list[0])]
+        
+        if self._model is None:
+            raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
+        
+        if not features_list:
+            return []
+        
+        started = time.perf_counter()
+        feature_matrix = np.empty((len(features_list), len(self._feature_order)), dtype=np.float32)
+        for row, features in zip(feature_matrix, features_list):
+            self._fill_row(features, row)
+        stage_duration.observe(time.perf_counter() - started, "array_build")
+        return self._timed_batch_prediction(feature_matrix).tolist()
+    
+    def predict_array(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """
+        Exécute la prédiction sur une matrice déjà ordonnée (entrée binaire).
+        
+        Les valeurs manquantes (NaN) sont remplacées par les moyennes
+        d'entraînement en une seule opération vectorisée
+        (ImputationService.impute_array); la matrice d'entrée, éventuellement
+        en lecture seule, n'est pas modifiée.
+        
+        Args:
+            feature_matrix: Matrice float32 (N, n_features) dans l'ordre
+                de get_feature_order()
+            
+        Returns:
+            Prédictions de durée d'hospitalisation en jours (N valeurs)
+            
+        Raises:
+            ModelNotLoadedError: Si le modèle n'est pas chargé
+        """
+        if self._model is None:
+            raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
+        
+        if self._imputation_service is not None:
+            started = time.perf_counter()
+            feature_matrix, _ = self._imputation_service.impute_array(
+                feature_matrix, self._feature_order
+            )
+            stage_duration.observe(time.perf_counter() - started, "imputation")
+        return self._timed_batch_prediction(feature_matrix)
+    
+    def predict_imputed_array(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """
+        Exécute la prédiction sur une matrice déjà imputée par l'appelant.
+        
+        Évite un second parcours des NaN et une seconde copie lorsque
+        l'appelant a besoin du masque d'imputation (/predict-batch,
+        /sensitivity) et a donc déjà appelé impute_array.
+        
+        Args:
+            feature_matrix: Matrice float32 (N, n_features) sans valeur
+                manquante, dans l'ordre de get_feature_order()
+            
+        Returns:
+            Prédictions de durée d'hospitalisation en jours (N valeurs)
+            
+        Raises:
+            ModelNotLoadedError: Si le modèle n'est pas chargé
+        """
+        if self._model is None:
+            raise ModelNotLoadedError("Model not loaded. Call load_model() first.")
+        
+        return self._timed_batch_prediction(feature_matrix)
+    
+    def features_matrix(self, features_list: list[PredictionFeatures]) -> np.ndarray:
+        """
+        Construit la matrice (N, n_features) float32 des features validées.
+        
+        Les valeurs manquantes restent NaN: l'imputation est faite ensuite
+        sur toute la matrice (ImputationService.impute_array).
+        
+        Args:
+            features_list: Features médicales validées des patients
+            
+        Returns:
+            Matrice dans l'ordre de get_feature_order()
+        """
+        matrix = np.empty((len(features_list), len(self._feature_order)), dtype=np.float32)
+        for row, features in zip(matrix, features_list):
+            for i, name in enumerate(self._feature_order):
+                value = getattr(features, name)
+                row[i] = np.nan if value is None else value
+        return matrix
+    
+    def feature_vector(self, features: PredictionFeatures) -> bytes:
+        """
+        Retourne le vecteur imputé et ordonné tel que vu par le modèle.
+        
+        Sert d'entrée à l'empreinte de mémoïsation: deux requêtes dont les
+        vecteurs sont identiques produisent la même prédiction.
+        
+        Args:
+            features: Features médicales validées du patient
+            
+        Returns:
+            Octets du vecteur float32 (n_features valeurs)
+        """
+        row = self._get_row_buffer()
+        self._fill_row(features, row[0])
+        return row.tobytes()
+    
+    def _get_row_buffer(self) -> np.ndarray:
+        """Return the (1, n_features) float32 buffer owned by the calling thread."""
+        row = getattr(self._row_buffers, "row", None)
+        if row is None:
+            row = np.empty((1, len(self._feature_order)), dtype=np.float32)
+            self._row_buffers.row = row
+        return row
+    
+    def _fill_row(self, features: PredictionFeatures, row: np.ndarray) -> None:
+        """Write validated feature values into row, in model order, imputing missing ones."""
+        for i, (name, fill_value) in enumerate(zip(self._feature_order, self._fill_values)):
+            value = getattr(features, name)
+            row[i] = fill_value if value is None else value
+    
     def _features_to_array(self, features: dict) -> np.ndarray:
         """Convert features dictionary to numpy array in correct order, replacing None with np.nan."""
-        values = [features[name] if features[name] is not None else np.nan for name in self._feature_order]
-        return np.array([values], dtype=np.float32)
+        return self._features_to_matrix([features])
+    
+    def _features_to_matrix(self, features_list: list[dict]) -> np.ndarray:
+        """Convert a list of features dictionaries to a (N, n_features) float32 matrix, replacing None with np.nan."""
+        matrix = np.empty((len(features_list), len(self._feature_order)), dtype=np.float32)
+        for row, features in zip(matrix, features_list):
+            row[:] = [
+                features[name] if features[name] is not None else np.nan
+                for name in self._feature_order
+            ]
+        return matrix
     
     def _execute_prediction(self, feature_array: np.ndarray) -> float:
         """Execute prediction based on model type."""
+        # Return single prediction value
+        return float(self._timed_batch_prediction(feature_array)[0])
+    
+    def _timed_batch_prediction(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Execute the batch prediction, recording its duration as the booster_predict stage."""
+        started = time.perf_counter()
+        predictions = self._execute_batch_prediction(feature_matrix)
+        stage_duration.observe(time.perf_counter() - started, "booster_predict")
+        return predictions
+    
+    def _execute_batch_prediction(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Execute prediction on a (N, n_features) matrix and return N clipped values."""
         import xgboost as xgb
         
         # Check if model is a Booster (native XGBoost) or sklearn-style
         if isinstance(self._model, xgb.Booster):
-            dmatrix = xgb.DMatrix(feature_array, feature_names=self._feature_order)
-            prediction = self._model.predict(dmatrix)
+            dmatrix = xgb.DMatrix(feature_matrix, feature_names=self._feature_order)
+            predictions = self._model.predict(dmatrix)
         else:
             # sklearn-style model (from joblib)
-            prediction = self._model.predict(feature_array)
-        
-        # Return single prediction value
-        result = float(prediction[0])
+            predictions = self._model.predict(feature_matrix)
         
-        # Ensure positive value (length of stay cannot be negative)
-        return max(result, 0.0)
+        # Ensure positive values (length of stay cannot be negative)
+        return np.maximum(np.asarray(predictions, dtype=np.float64), 0.0)
     
     def get_feature_order(self) -> list[str]:
         """Retourne l'ordre des features attendu par le modèle."""
@@ -153,6 +408,11 @@ class XGBoostPredictionEngine:
     def is_loaded(self) -> bool:
         """Check if the model is loaded."""
         return self._model is not None
+    
+    @property
+    def model_version(self) -> str:
+        """Short hash of the loaded model file (empty if no model is loaded)."""
+        return self._model_version
 
     def load_feature_means(self, path: str) -> None:
         """
@@ -172,6 +432,9 @@ class XGBoostPredictionEngine:
 
         self._imputation_service = ImputationService(means)
         self._feature_means = self._imputation_service.feature_means
+        self._fill_values = tuple(
+            self._feature_means.get(name, np.nan) for name in self._feature_order
+        )
 
     @property
     def imputation_service(self) -> ImputationService | None:
@@ -182,3 +445,27 @@ class XGBoostPredictionEngine:
     def feature_means(self) -> dict[str, float] | None:
         """Read-only access to the loaded feature means dict."""
         return dict(self._feature_means) if self._feature_means is not None else None
+
+
+def create_prediction_engine(backend: str = "xgboost") -> PredictionEngineProtocol:
+    """
+    Factory function to create the prediction engine for the configured backend.
+    
+    Args:
+        backend: "xgboost" (Booster), "numpy" (compiled trees, no xgboost import)
+            or "onnx" (onnxruntime CPU, no xgboost import)
+        
+    Returns:
+        An unloaded prediction engine instance
+    """
+    if backend == "numpy":
+        from app.services.numpy_engine import NumpyTreePredictionEngine
+        
+        return NumpyTreePredictionEngine()
+    
+    if backend == "onnx":
+        from app.services.onnx_engine import OnnxPredictionEngine
+        
+        return OnnxPredictionEngine()
+    
+    return XGBoostPredictionEngine()
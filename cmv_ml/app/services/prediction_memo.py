@@ -0,0 +1,125 @@
+"""
+Memoization of predictions for repeated feature vectors.
+
+Clinicians often re-submit the same features (form reopened, retry after
+a network error). Results are kept in an LRU keyed by a keyed hash of the
+imputed, ordered feature vector and the model version.
+
+RGPD: only the hash and the predicted value are held, never the features.
+The hash key is random per process, so fingerprints cannot be matched
+against a dictionary of feature vectors.
+"""
+
+import asyncio
+import hashlib
+import secrets
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+
+class PredictionMemo:
+    """
+    Cache LRU des prédictions, indexé par empreinte du vecteur de features.
+
+    Les requêtes identiques concurrentes sont fusionnées: une seule
+    prédiction est calculée et son résultat est partagé.
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        """
+        Args:
+            max_size: Nombre maximal d'empreintes conservées (0 = désactivé)
+        """
+        self._max_size = max(0, max_size)
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        self._inflight: dict[bytes, asyncio.Future[float]] = {}
+        self._hash_key = secrets.token_bytes(32)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indique si la mémoïsation est active."""
+        return self._max_size > 0
+
+    def fingerprint(self, feature_vector: bytes, model_version: str) -> bytes:
+        """
+        Calcule l'empreinte d'un vecteur de features imputé et ordonné.
+
+        Args:
+            feature_vector: Octets du vecteur float32 dans l'ordre du modèle
+            model_version: Version du modèle qui produit la prédiction
+
+        Returns:
+            Empreinte de 16 octets (BLAKE2b à clé propre au processus)
+        """
+        digest = hashlib.blake2b(digest_size=16, key=self._hash_key)
+        digest.update(model_version.encode())
+        digest.update(feature_vector)
+        return digest.digest()
+
+    async def get_or_compute(
+        self, key: bytes, compute: Callable[[], Awaitable[float]]
+    ) -> float:
+        """
+        Retourne la prédiction mémorisée, ou la calcule une seule fois.
+
+        Args:
+            key: Empreinte calculée par fingerprint()
+            compute: Coroutine de calcul de la prédiction en cas d'absence
+
+        Returns:
+            La valeur prédite
+        """
+        if not self.enabled:
+            return await compute()
+
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            # Requête identique déjà en cours: partager son résultat
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # Tâche indépendante: l'annulation d'un appelant n'interrompt
+            # pas le calcul attendu par les autres
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_computed(key, done))
+
+        return await asyncio.shield(task)
+
+    def _on_computed(self, key: bytes, task: asyncio.Future) -> None:
+        """Mémorise le résultat d'un calcul terminé avec succès."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._entries[key] = task.result()
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Vide le cache (les calculs en cours ne sont pas interrompus)."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Retourne les statistiques d'utilisation pour dimensionner le cache."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
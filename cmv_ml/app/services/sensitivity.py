@@ -0,0 +1,41 @@
+"""
+What-if sensitivity grids.
+
+The base feature vector is repeated once per grid point and the varied
+columns are filled from the cartesian product of the axis values, so a
+whole curve or surface is scored in a single predict_array call.
+"""
+
+import numpy as np
+
+
+def sensitivity_matrix(
+    base_row: np.ndarray,
+    columns: list[int],
+    grids: list[list[float]],
+) -> np.ndarray:
+    """
+    Construit la matrice des points de la grille.
+
+    Args:
+        base_row: Vecteur imputé (n_features,) dans l'ordre du modèle
+        columns: Index des features qui varient (une ou deux)
+        grids: Valeurs de chaque feature, dans l'ordre de columns
+
+    Returns:
+        Matrice float32 (prod(len(grid)), n_features); la dernière feature
+        varie le plus vite, de sorte que reshape(len(grid) ...) donne la
+        courbe ou la surface
+    """
+    shape = tuple(len(grid) for grid in grids)
+    matrix = np.repeat(
+        base_row.astype(np.float32, copy=False)[np.newaxis, :],
+        int(np.prod(shape)),
+        axis=0,
+    )
+    mesh = np.meshgrid(
+        *(np.asarray(grid, dtype=np.float32) for grid in grids), indexing="ij"
+    )
+    for column, values in zip(columns, mesh):
+        matrix[:, column] = values.ravel()
+    return matrix
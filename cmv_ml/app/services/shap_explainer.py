@@ -3,12 +3,19 @@ SHAP Explainer for XGBoost model predictions.
 
 This module provides explainability for predictions using SHAP
 (SHapley Additive exPlanations) values.
+
+Two implementations are available:
+- NativeContribsExplainer: Booster.predict(pred_contribs=True), exact
+  TreeSHAP computed by XGBoost itself (or approx_contribs for a faster
+  approximation), without importing the shap package;
+- XGBoostShapExplainer: shap.TreeExplainer.
 """
 
 from typing import Protocol
 import numpy as np
 
-from app.utils.config import SHAP_ENABLED
+from app.services.metrics import stage_duration
+from app.utils.config import SHAP_ENABLED, SHAP_MODE
 
 
 class ShapExplainerProtocol(Protocol):
@@ -17,6 +24,14 @@ class ShapExplainerProtocol(Protocol):
     def explain(self, features: dict) -> dict[str, float]:
         """Retourne les contributions SHAP par feature."""
         ...
+    
+    def explain_batch(self, features_list: list[dict]) -> list[dict[str, float]]:
+        """Retourne les contributions SHAP de plusieurs patients en un seul appel."""
+        ...
+    
+    def explain_array(self, feature_matrix: np.ndarray) -> list[dict[str, float]]:
+        """Retourne les contributions SHAP d'une matrice imputée (N, n_features)."""
+        ...
 
 
 class ShapDisabledError(Exception):
@@ -24,6 +39,136 @@ class ShapDisabledError(Exception):
     pass
 
 
+def _features_to_matrix(features_list: list[dict], feature_order: list[str]) -> np.ndarray:
+    """Convert features dictionaries to a (N, n_features) float32 matrix, None as NaN."""
+    matrix = np.empty((len(features_list), len(feature_order)), dtype=np.float32)
+    for row, features in zip(matrix, features_list):
+        row[:] = [
+            np.nan if features[name] is None else features[name]
+            for name in feature_order
+        ]
+    return matrix
+
+
+def _contributions_to_dicts(
+    values: np.ndarray, feature_order: list[str]
+) -> list[dict[str, float]]:
+    """Map each row of a (N, n_features) contributions matrix to feature names."""
+    return [
+        dict(zip(feature_order, row))
+        for row in values[:, : len(feature_order)].astype(float).tolist()
+    ]
+
+
+def _get_booster(model):
+    """Return the native Booster of a Booster or sklearn-style XGBoost model."""
+    return model.get_booster() if hasattr(model, "get_booster") else model
+
+
+def compute_feature_importance(model, feature_order: list[str]) -> dict[str, float]:
+    """
+    Importance globale des features (gain total), normalisée à 1.
+    
+    Calculée une seule fois au chargement du modèle. Les features jamais
+    utilisées par les arbres ont une importance nulle.
+    
+    Args:
+        model: The XGBoost model (Booster or sklearn-style)
+        feature_order: List of feature names in the order expected by the model
+        
+    Returns:
+        Dictionnaire feature -> part du gain total, trié par importance décroissante
+    """
+    scores = _get_booster(model).get_score(importance_type="total_gain")
+    total = sum(scores.values()) or 1.0
+    importance = {name: scores.get(name, 0.0) / total for name in feature_order}
+    return dict(sorted(importance.items(), key=lambda item: item[1], reverse=True))
+
+
+class NativeContribsExplainer:
+    """
+    Contributions calculées par XGBoost (pred_contribs), sans le package shap.
+    
+    Le mode exact produit les mêmes valeurs TreeSHAP que shap.TreeExplainer;
+    le mode approximatif (approx_contribs) attribue à chaque noeud la
+    variation de sa valeur, beaucoup plus rapide sur les arbres profonds.
+    """
+    
+    def __init__(self, model, feature_order: list[str], approximate: bool = False):
+        """
+        Initialize the native contributions explainer.
+        
+        Args:
+            model: The XGBoost model (Booster or sklearn-style)
+            feature_order: List of feature names in the order expected by the model
+            approximate: Utiliser approx_contribs au lieu de TreeSHAP exact
+        """
+        self._booster = _get_booster(model)
+        self._feature_order = feature_order
+        self._approximate = approximate
+    
+    def explain(self, features: dict) -> dict[str, float]:
+        """
+        Calcule les contributions pour une prédiction.
+        
+        Args:
+            features: Dictionnaire des 22 features médicales
+            
+        Returns:
+            Dictionnaire mappant chaque nom de feature à sa contribution SHAP
+            
+        Raises:
+            ShapDisabledError: Si SHAP est désactivé dans la configuration
+        """
+        return self.explain_batch([features])[0]
+    
+    def explain_batch(self, features_list: list[dict]) -> list[dict[str, float]]:
+        """
+        Calcule les contributions de plusieurs patients en un seul appel.
+        
+        Args:
+            features_list: Features médicales imputées des patients
+            
+        Returns:
+            Contributions par feature, dans l'ordre d'entrée (biais exclu)
+            
+        Raises:
+            ShapDisabledError: Si SHAP est désactivé dans la configuration
+        """
+        return self.explain_array(_features_to_matrix(features_list, self._feature_order))
+    
+    def explain_array(self, feature_matrix: np.ndarray) -> list[dict[str, float]]:
+        """
+        Calcule les contributions d'une matrice déjà ordonnée et imputée.
+        
+        Args:
+            feature_matrix: Matrice (N, n_features) dans l'ordre du modèle
+            
+        Returns:
+            Contributions par feature, dans l'ordre des lignes (biais exclu)
+            
+        Raises:
+            ShapDisabledError: Si SHAP est désactivé dans la configuration
+        """
+        if not SHAP_ENABLED:
+            raise ShapDisabledError("SHAP is disabled in configuration")
+        
+        import xgboost as xgb
+        
+        with stage_duration.time("shap"):
+            dmatrix = xgb.DMatrix(feature_matrix, feature_names=self._feature_order)
+            # Dernière colonne: biais (valeur attendue du modèle)
+            contributions = self._booster.predict(
+                dmatrix, pred_contribs=True, approx_contribs=self._approximate
+            )
+        return _contributions_to_dicts(contributions, self._feature_order)
+    
+    @property
+    def is_enabled(self) -> bool:
+        """Check if SHAP is enabled in configuration."""
+        return SHAP_ENABLED
+
+
 class XGBoostShapExplainer:
     """Implémentation SHAP pour XGBoost."""
     
@@ -64,6 +209,37 @@ class XGBoostShapExplainer:
         Returns:
             Dictionnaire mappant chaque nom de feature à sa contribution SHAP
             
+        Raises:
+            ShapDisabledError: Si SHAP est désactivé dans la configuration
+        """
+        return self.explain_batch([features])[0]
+    
+    def explain_batch(self, features_list: list[dict]) -> list[dict[str, float]]:
+        """
+        Calcule les valeurs SHAP de plusieurs patients en un seul appel.
+        
+        Args:
+            features_list: Features médicales imputées des patients
+            
+        Returns:
+            Contributions SHAP par feature, dans l'ordre d'entrée
+            
+        Raises:
+            ShapDisabledError: Si SHAP est désactivé dans la configuration
+        """
+        # Convert features to numpy array in correct order
+        return self.explain_array(_features_to_matrix(features_list, self._feature_order))
+    
+    def explain_array(self, feature_matrix: np.ndarray) -> list[dict[str, float]]:
+        """
+        Calcule les valeurs SHAP d'une matrice déjà ordonnée et imputée.
+        
+        Args:
+            feature_matrix: Matrice (N, n_features) dans l'ordre du modèle
+            
+        Returns:
+            Contributions SHAP par feature, dans l'ordre des lignes
+            
         Raises:
             ShapDisabledError: Si SHAP est désactivé dans la configuration
         """
@@ -73,32 +249,17 @@ class XGBoostShapExplainer:
         # Initialize explainer on first use
         self._initialize_explainer()
         
-        # Convert features to numpy array in correct order
-        feature_array = self._features_to_array(features)
-        
         # Calculate SHAP values
-        shap_values = self._explainer.shap_values(feature_array)
+        with stage_duration.time("shap"):
+            shap_values = self._explainer.shap_values(feature_matrix)
         
         # Handle different SHAP output formats
         if isinstance(shap_values, list):
             # Multi-class output - take first class for regression
-            values = shap_values[0][0]
-        elif len(shap_values.shape) == 2:
-            # Single output - shape (1, n_features)
-            values = shap_values[0]
-        else:
-            values = shap_values
-        
-        # Map SHAP values to feature names
-        return {
-            name: float(values[i])
-            for i, name in enumerate(self._feature_order)
-        }
-    
-    def _features_to_array(self, features: dict) -> np.ndarray:
-        """Convert features dictionary to numpy array in correct order."""
-        values = [features[name] for name in self._feature_order]
-        return np.array([values], dtype=np.float32)
+            shap_values = shap_values[0]
+        values = np.asarray(shap_values).reshape(len(feature_matrix), -1)
+        
+        return _contributions_to_dicts(values, self._feature_order)
     
     @property
     def is_enabled(self) -> bool:
@@ -106,18 +267,24 @@ class XGBoostShapExplainer:
         return SHAP_ENABLED
 
 
-def create_shap_explainer(model, feature_order: list[str]) -> XGBoostShapExplainer | None:
+def create_shap_explainer(
+    model, feature_order: list[str], mode: str = SHAP_MODE
+) -> ShapExplainerProtocol | None:
     """
     Factory function to create a SHAP explainer if enabled.
     
     Args:
         model: The XGBoost model
         feature_order: List of feature names
+        mode: "native" (pred_contribs), "approx" (approx_contribs) or "shap" (TreeExplainer)
         
     Returns:
-        XGBoostShapExplainer instance if SHAP is enabled, None otherwise
+        Explainer instance if SHAP is enabled, None otherwise
     """
     if not SHAP_ENABLED:
         return None
     
-    return XGBoostShapExplainer(model, feature_order)
+    if mode == "shap":
+        return XGBoostShapExplainer(model, feature_order)
+    
+    return NativeContribsExplainer(model, feature_order, approximate=mode == "approx")
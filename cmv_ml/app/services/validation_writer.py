@@ -0,0 +1,199 @@
+"""
+Write-behind buffer for prediction validations.
+
+Validations are queued and flushed as one multi-row
+INSERT ... ON CONFLICT DO NOTHING when either the maximum batch size or the
+maximum wait is reached; rows arriving during a flush wait for the next
+one. Each caller is answered once its row is committed, with whether it
+was inserted or already validated.
+"""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from app.repositories.async_predictions_crud import AsyncPgPredictionsRepository
+from app.services.prediction_batcher import BatchSizeStats
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationWriter:
+    """
+    Regroupe les validations concurrentes en une seule écriture.
+
+    Les fins de tournée produisent des rafales de validations: une requête
+    multi-lignes par lot remplace, pour chaque validation, la vérification
+    d'existence, l'insertion et le commit.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        repository: AsyncPgPredictionsRepository,
+        max_batch_size: int = 500,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            session_factory: Fabrique de sessions asynchrones
+            repository: Repository exposant insert_many()
+            max_batch_size: Nombre maximal de lignes par INSERT
+            max_wait_ms: Attente maximale avant l'écriture d'un lot incomplet
+        """
+        self._session_factory = session_factory
+        self._repository = repository
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: asyncio.Queue[tuple[dict, asyncio.Future]] | None = None
+        self._worker: asyncio.Task | None = None
+        # Lot en cours d'écriture et lot collecté au moment de l'arrêt
+        self._flushing: asyncio.Future | None = None
+        self._unflushed: list[tuple[dict, asyncio.Future]] = []
+        self._stats = BatchSizeStats(self._max_batch_size)
+        self.duplicates = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        """Démarre la tâche de fond qui vide la file."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de fond après avoir écrit les validations en attente."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Attendre l'écriture en cours, puis écrire le lot interrompu
+        # pendant sa collecte et le reste de la file
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+        pending, self._unflushed = self._unflushed, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self._max_batch_size):
+            await self._flush(pending[start : start + self._max_batch_size])
+        self._queue = None
+
+    async def submit(self, row: dict) -> bool:
+        """
+        Enregistre une validation et attend son écriture.
+
+        Args:
+            row: Ligne (id, predicted_value, user_id, validation_date)
+
+        Returns:
+            True si la ligne a été insérée, False si déjà validée
+        """
+        return (await self.submit_many([row]))[0]
+
+    async def submit_many(self, rows: list[dict]) -> list[bool]:
+        """
+        Enregistre plusieurs validations et attend leur écriture.
+
+        Si la tâche de fond n'est pas démarrée, les lignes sont écrites
+        directement.
+
+        Args:
+            rows: Lignes (id, predicted_value, user_id, validation_date)
+
+        Returns:
+            Pour chaque ligne, True si insérée, False si déjà validée
+        """
+        loop = asyncio.get_running_loop()
+        items = [(row, loop.create_future()) for row in rows]
+        if self._worker is None:
+            for start in range(0, len(items), self._max_batch_size):
+                await self._flush(items[start : start + self._max_batch_size])
+        else:
+            for item in items:
+                self._queue.put_nowait(item)
+        return list(await asyncio.gather(*(future for _, future in items)))
+
+    @property
+    def batch_sizes(self) -> BatchSizeStats:
+        """Tailles des INSERT groupés (exportées dans /metrics)."""
+        return self._stats
+
+    def stats(self) -> dict:
+        """Retourne les statistiques des écritures groupées."""
+        return {
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": self._max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "duplicates": self.duplicates,
+            "errors": self.errors,
+            **self._stats.as_dict(),
+        }
+
+    async def _run(self) -> None:
+        """Boucle de fond: collecte les validations en lots puis les écrit."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            try:
+                while len(batch) < self._max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), timeout)
+                        )
+                    except TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Arrêt pendant la collecte: le lot est écrit par stop()
+                self._unflushed = batch
+                raise
+
+            # Écriture séquentielle: les validations arrivées pendant
+            # l'INSERT forment le lot suivant. L'annulation par stop() ne
+            # doit pas interrompre un INSERT: stop() attend sa fin
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        """Écrit un lot et répond à chaque appelant."""
+        # Un même id présent deux fois dans le lot: seul le premier compte
+        rows: dict[UUID, dict] = {}
+        for row, _ in batch:
+            rows.setdefault(row["id"], row)
+
+        self._stats.record(len(rows))
+        try:
+            async with self._session_factory() as session:
+                inserted = await self._repository.insert_many(
+                    session, list(rows.values())
+                )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to write {len(rows)} validations: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for row, future in batch:
+            prediction_id = row["id"]
+            # True pour la première occurrence d'un id inséré uniquement
+            result = prediction_id in inserted
+            inserted.discard(prediction_id)
+            if not result:
+                self.duplicates += 1
+            if not future.done():
+                future.set_result(result)
@@ -26,10 +26,17 @@ class ValidatedPrediction(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     predicted_value = Column(Float, nullable=False)
     validation_date = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    user_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
     
-    # Index supplémentaire pour les requêtes par date de validation
+    # Index composites de la pagination par curseur (validation_date, id),
+    # globale et par utilisateur
     __table_args__ = (
-        Index('idx_predictions_validation_date', 'validation_date'),
+        Index('idx_predictions_validation_date_id', 'validation_date', 'id'),
+        Index(
+            'idx_predictions_user_id_validation_date_id',
+            'user_id',
+            'validation_date',
+            'id',
+        ),
     )
@@ -0,0 +1,47 @@
+"""Fixtures partagées: modèle de test servi par l'application, client HTTP."""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependancies.auth import check_authorization
+from app.main import app
+from app.services.model_registry import ModelBundle, model_registry
+from app.services.numpy_engine import NumpyTreePredictionEngine
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+
+# Payload injecté à la place du JWT décodé
+USER = {"user_id": 1, "id_user": 1, "role": "home"}
+
+
+@pytest.fixture(scope="session")
+def test_bundle() -> ModelBundle:
+    """Modèle livré dans models/, backend NumPy (sans SHAP)."""
+    engine = NumpyTreePredictionEngine()
+    engine.load_model(str(MODELS_DIR / "model.ubj"))
+    engine.load_feature_means(str(MODELS_DIR / "feature_means.json"))
+    return ModelBundle(
+        version="test",
+        engine=engine,
+        shap_explainer=None,
+        feature_importance=None,
+        warmup_ms=None,
+    )
+
+
+@pytest.fixture
+def client(monkeypatch, test_bundle):
+    """
+    Client de l'application, modèle de test actif et authentification levée.
+
+    Le lifespan n'est pas exécuté: le batcher et l'écriture groupée ne sont
+    pas démarrés, les appels sont servis directement.
+    """
+    monkeypatch.setattr(model_registry, "_active", test_bundle)
+    app.dependency_overrides[check_authorization] = lambda: USER
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(check_authorization, None)
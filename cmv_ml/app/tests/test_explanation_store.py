@@ -0,0 +1,186 @@
+"""Tests des explications différées et de GET /predictions/{id}/explain."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.routers import predictions
+from app.services import explanation_store
+from app.services.explanation_store import (
+    FAILED,
+    PENDING,
+    READY,
+    DeferredExplanations,
+    InMemoryExplanationStore,
+)
+
+VALUES = {"bmi": 0.4, "rcount": -0.1}
+
+
+class Clock:
+    """Horloge monotone avancée à la main."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        explanation_store, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+class TestInMemoryExplanationStore:
+    """Durée de vie et taille maximale du stockage en mémoire."""
+
+    def test_entry_expires_after_ttl(self, clock):
+        store = InMemoryExplanationStore(ttl_minutes=1)
+        prediction_id = uuid4()
+        asyncio.run(store.set(prediction_id, READY, VALUES))
+
+        clock.now += 59
+        assert asyncio.run(store.get(prediction_id)) == (READY, VALUES)
+        clock.now += 1
+        assert asyncio.run(store.get(prediction_id)) is None
+        assert len(store) == 0
+
+    def test_write_purges_expired_entries(self, clock):
+        store = InMemoryExplanationStore(ttl_minutes=1)
+        for _ in range(3):
+            asyncio.run(store.set(uuid4(), PENDING))
+
+        clock.now += 60
+        asyncio.run(store.set(uuid4(), PENDING))
+
+        assert len(store) == 1
+
+    def test_rewrite_renews_ttl(self, clock):
+        store = InMemoryExplanationStore(ttl_minutes=1)
+        prediction_id = uuid4()
+        asyncio.run(store.set(prediction_id, PENDING))
+
+        clock.now += 30
+        asyncio.run(store.set(prediction_id, READY, VALUES))
+        clock.now += 59
+
+        assert asyncio.run(store.get(prediction_id)) == (READY, VALUES)
+
+    def test_oldest_entry_is_evicted(self, clock):
+        store = InMemoryExplanationStore(max_size=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+
+        async def scenario():
+            await store.set(first, PENDING)
+            await store.set(second, PENDING)
+            # Réécrite, la première passe en fin d'ordre
+            await store.set(first, READY, VALUES)
+            await store.set(third, PENDING)
+            return [await store.get(i) for i in (first, second, third)]
+
+        assert asyncio.run(scenario()) == [(READY, VALUES), None, (PENDING, None)]
+        assert len(store) == 2
+
+
+class TestDeferredExplanations:
+    """Cycle pending -> ready / failed."""
+
+    def test_pending_then_ready(self):
+        async def scenario():
+            deferred = DeferredExplanations(InMemoryExplanationStore())
+            gate = asyncio.Event()
+
+            async def compute():
+                await gate.wait()
+                return VALUES
+
+            prediction_id = uuid4()
+            await deferred.submit(prediction_id, compute)
+            pending = await deferred.get(prediction_id)
+            in_progress = deferred.stats()["in_progress"]
+            gate.set()
+            await asyncio.gather(*deferred._tasks)
+            ready = await deferred.get(prediction_id)
+            return pending, in_progress, ready, deferred.stats()
+
+        pending, in_progress, ready, stats = asyncio.run(scenario())
+        assert pending == (PENDING, None)
+        assert in_progress == 1
+        assert ready == (READY, VALUES)
+        assert stats == {"submitted": 1, "in_progress": 0, "failed": 0}
+
+    def test_failed_computation(self):
+        async def scenario():
+            deferred = DeferredExplanations(InMemoryExplanationStore())
+
+            async def compute():
+                raise RuntimeError("SHAP failed")
+
+            prediction_id = uuid4()
+            await deferred.submit(prediction_id, compute)
+            await asyncio.gather(*deferred._tasks)
+            return await deferred.get(prediction_id), deferred.failed
+
+        assert asyncio.run(scenario()) == ((FAILED, None), 1)
+
+    def test_stop_cancels_computations(self):
+        async def scenario():
+            deferred = DeferredExplanations(InMemoryExplanationStore())
+            prediction_id = uuid4()
+            await deferred.submit(prediction_id, asyncio.Event().wait)
+            await deferred.stop()
+            return await deferred.get(prediction_id), deferred.stats()["in_progress"]
+
+        # Annulée à l'arrêt: reste pending jusqu'à expiration
+        assert asyncio.run(scenario()) == ((PENDING, None), 0)
+
+
+class TestExplainEndpoint:
+    """GET /predictions/{prediction_id}/explain."""
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = InMemoryExplanationStore()
+        monkeypatch.setattr(
+            predictions, "deferred_explanations", DeferredExplanations(store)
+        )
+        return store
+
+    def test_pending_then_ready(self, client, store):
+        prediction_id = uuid4()
+        url = f"/predictions/{prediction_id}/explain"
+
+        asyncio.run(store.set(prediction_id, PENDING))
+        pending = client.get(url)
+        asyncio.run(store.set(prediction_id, READY, VALUES))
+        ready = client.get(url)
+
+        assert pending.status_code == 202
+        assert pending.json() == {
+            "prediction_id": str(prediction_id),
+            "status": PENDING,
+            "shap_values": None,
+        }
+        assert ready.status_code == 200
+        assert ready.json()["status"] == READY
+        assert ready.json()["shap_values"] == pytest.approx(VALUES)
+
+    def test_failed(self, client, store):
+        prediction_id = uuid4()
+        asyncio.run(store.set(prediction_id, FAILED))
+
+        response = client.get(f"/predictions/{prediction_id}/explain")
+
+        assert response.status_code == 500
+
+    def test_unknown(self, client, store):
+        response = client.get(f"/predictions/{uuid4()}/explain")
+
+        assert response.status_code == 404
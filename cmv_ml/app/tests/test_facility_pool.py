@@ -0,0 +1,129 @@
+"""Tests du routage par établissement et du pool de modèles."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.schemas.features import PredictionFeatures
+from app.services.facility_pool import FacilityModelPool, facilities_of, facility_of
+from app.services.numpy_engine import NumpyTreePredictionEngine, load_model_document
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+MEANS_PATH = str(MODELS_DIR / "feature_means.json")
+
+# Décalage de base_score de chaque modèle d'établissement
+SHIFTS = {"B": 1.0, "D": 3.0}
+
+
+class InlineExecutor:
+    """Exécute directement les appels (interface de BoundedExecutor)."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+@pytest.fixture(scope="module")
+def global_engine():
+    engine = NumpyTreePredictionEngine()
+    engine.load_model(str(MODELS_DIR / "model.ubj"))
+    engine.load_feature_means(MEANS_PATH)
+    return engine
+
+
+@pytest.fixture
+def facilities_dir(tmp_path):
+    """Modèles d'établissement: le modèle global, base_score décalé."""
+    document = load_model_document(str(MODELS_DIR / "model.ubj"))
+    param = document["learner"]["learner_model_param"]
+    base_score = float(param["base_score"].strip("[]"))
+    for facility, shift in SHIFTS.items():
+        param["base_score"] = str(base_score + shift)
+        facility_dir = tmp_path / facility
+        facility_dir.mkdir()
+        # Les tableaux typés UBJ sont lus en ndarray
+        (facility_dir / "model.json").write_text(
+            json.dumps(document, default=np.ndarray.tolist)
+        )
+    return tmp_path
+
+
+def _pool(facilities_dir, memory_budget_mb=512.0):
+    return FacilityModelPool(
+        str(facilities_dir), MEANS_PATH, backend="numpy", memory_budget_mb=memory_budget_mb
+    )
+
+
+def _features(facility):
+    return PredictionFeatures(**({f"facid_{facility}": 1} if facility != "A" else {}))
+
+
+class TestFacilityRouting:
+    """L'établissement est lu sur l'encodage one-hot facid_*."""
+
+    def test_single_and_matrix_agree(self, global_engine):
+        features_list = [_features(facility) for facility in "ABCDE"] + [
+            PredictionFeatures(facid_B=1, facid_C=1)
+        ]
+        matrix = global_engine.features_matrix(features_list)
+
+        assert [facility_of(f) for f in features_list] == [*"ABCDE", None]
+        assert facilities_of(matrix, global_engine.get_feature_order()).tolist() == [
+            *"ABCDE",
+            "",
+        ]
+
+    def test_mixed_batch_split_by_facility(self, global_engine, facilities_dir):
+        pool = _pool(facilities_dir)
+        facilities = list("ABCDEDBA")
+        matrix = global_engine.features_matrix([_features(f) for f in facilities])
+
+        predictions = asyncio.run(
+            pool.predict_array(global_engine, matrix, InlineExecutor())
+        )
+
+        expected = global_engine.predict_array(matrix) + [
+            SHIFTS.get(facility, 0.0) for facility in facilities
+        ]
+        np.testing.assert_allclose(predictions, expected, rtol=1e-5)
+        assert sorted(pool.stats()["loaded"]) == ["B", "D"]
+
+
+class TestFacilityModelPool:
+    """Chargement à la demande et éviction LRU sous budget mémoire."""
+
+    def test_unknown_facility_uses_global_model(self, facilities_dir):
+        pool = _pool(facilities_dir)
+
+        assert asyncio.run(pool.get("C")) is None
+        assert asyncio.run(pool.get(None)) is None
+        assert pool.stats()["loaded"] == []
+
+    def test_concurrent_requests_load_once(self, facilities_dir):
+        pool = _pool(facilities_dir)
+
+        async def get_concurrently():
+            return await asyncio.gather(*(pool.get("B") for _ in range(8)))
+
+        engines = asyncio.run(get_concurrently())
+
+        assert all(engine is engines[0] for engine in engines)
+        assert pool.stats()["loaded"] == ["B"]
+
+    def test_least_recently_used_evicted(self, facilities_dir):
+        model_mb = (facilities_dir / "B" / "model.json").stat().st_size / 1024 / 1024
+        # Place pour un seul modèle d'établissement
+        pool = _pool(facilities_dir, memory_budget_mb=model_mb * 1.5)
+
+        async def scenario():
+            await pool.get("B")
+            await pool.get("D")
+            return pool.stats()
+
+        stats = asyncio.run(scenario())
+
+        assert stats["loaded"] == ["D"]
+        assert stats["evictions"] == 1
+        assert stats["memory_bytes"] <= stats["memory_budget_bytes"]
@@ -0,0 +1,98 @@
+"""Tests du mode matriciel de l'ImputationService."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.schemas.features import PredictionFeatures
+from app.services.imputation_service import ImputationService
+from app.services.prediction_engine import XGBoostPredictionEngine
+
+MEANS_PATH = Path(__file__).resolve().parents[2] / "models" / "feature_means.json"
+
+FEATURE_MEANS = json.loads(MEANS_PATH.read_text())
+FEATURE_ORDER = XGBoostPredictionEngine().get_feature_order()
+CONTINUOUS_COLUMNS = [
+    FEATURE_ORDER.index(name) for name in ImputationService.CONTINUOUS_FEATURES
+]
+# Valeurs renseignées valides (entières: pulse et secondarydiagnosisnonicd9)
+OBSERVED_VALUES = {
+    name: int(FEATURE_MEANS[name]) + 1 for name in ImputationService.CONTINUOUS_FEATURES
+}
+
+
+def _service() -> ImputationService:
+    return ImputationService(FEATURE_MEANS)
+
+
+def _matrix(features_list: list[PredictionFeatures]) -> np.ndarray:
+    """Matrice au format du modèle, NaN pour les valeurs manquantes."""
+    return np.array(
+        [
+            [
+                np.nan if getattr(features, name) is None else getattr(features, name)
+                for name in FEATURE_ORDER
+            ]
+            for features in features_list
+        ],
+        dtype=np.float32,
+    )
+
+
+class TestImputeArray:
+    """impute_array doit reproduire impute() ligne à ligne."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        missing=st.lists(
+            st.lists(
+                st.sampled_from(ImputationService.CONTINUOUS_FEATURES), unique=True
+            ),
+            min_size=1,
+            max_size=8,
+        )
+    )
+    def test_matches_dict_mode(self, missing):
+        """Valeurs imputées et features signalées identiques au mode dict."""
+        service = _service()
+        features_list = [
+            PredictionFeatures(
+                **{
+                    name: None if name in row_missing else OBSERVED_VALUES[name]
+                    for name in ImputationService.CONTINUOUS_FEATURES
+                }
+            )
+            for row_missing in missing
+        ]
+
+        clean_matrix, mask = service.impute_array(_matrix(features_list), FEATURE_ORDER)
+
+        for row, mask_row, features in zip(clean_matrix, mask, features_list):
+            clean, imputed = service.impute(features.model_dump())
+            expected = np.array([clean[name] for name in FEATURE_ORDER], dtype=np.float32)
+            np.testing.assert_array_equal(row, expected)
+            assert service.imputed_features_from_mask(mask_row) == imputed
+
+    def test_input_not_modified(self):
+        """La matrice d'entrée, éventuellement en lecture seule, est préservée."""
+        matrix = _matrix([PredictionFeatures(), PredictionFeatures(bmi=25.0)])
+        matrix.flags.writeable = False
+        snapshot = matrix.copy()
+
+        clean_matrix, mask = _service().impute_array(matrix, FEATURE_ORDER)
+
+        np.testing.assert_array_equal(matrix, snapshot)
+        assert not np.isnan(clean_matrix[:, CONTINUOUS_COLUMNS]).any()
+        assert mask.sum() == 2 * len(ImputationService.CONTINUOUS_FEATURES) - 1
+
+    def test_complete_matrix_is_not_copied(self):
+        """Sans valeur manquante, la matrice est retournée telle quelle."""
+        matrix = _matrix([PredictionFeatures(**OBSERVED_VALUES)])
+
+        clean_matrix, mask = _service().impute_array(matrix, FEATURE_ORDER)
+
+        assert clean_matrix is matrix
+        assert not mask.any()
@@ -0,0 +1,92 @@
+"""Tests des métriques au format texte Prometheus (GET /metrics)."""
+
+from app.services.metrics import Counter, Histogram
+
+
+def scrape(client) -> dict[str, float]:
+    """Lit GET /metrics: série (nom et labels) -> valeur."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            samples[series] = float(value)
+    return samples
+
+
+def delta(before: dict[str, float], after: dict[str, float], series: str) -> float:
+    return after.get(series, 0.0) - before.get(series, 0.0)
+
+
+class TestRender:
+    """Format texte des compteurs et histogrammes."""
+
+    def test_counter(self):
+        counter = Counter("requests_total", "Requests", ("route",))
+        counter.inc("/b")
+        counter.inc("/a", amount=2)
+        counter.inc('say "hi"')
+
+        assert counter.render() == [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{route="/a"} 2',
+            'requests_total{route="/b"} 1',
+            'requests_total{route="say \\"hi\\""} 1',
+        ]
+
+    def test_histogram(self):
+        histogram = Histogram(
+            "duration_seconds", "Duration", ("stage",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "shap")
+
+        assert histogram.render() == [
+            "# HELP duration_seconds Duration",
+            "# TYPE duration_seconds histogram",
+            'duration_seconds_bucket{stage="shap",le="0.1"} 2',
+            'duration_seconds_bucket{stage="shap",le="1.0"} 3',
+            'duration_seconds_bucket{stage="shap",le="+Inf"} 4',
+            'duration_seconds_sum{stage="shap"} 3.65',
+            'duration_seconds_count{stage="shap"} 4',
+        ]
+
+    def test_histogram_time(self):
+        histogram = Histogram("duration_seconds", "Duration")
+
+        with histogram.time():
+            pass
+
+        assert histogram.render()[-1] == "duration_seconds_count 1"
+
+
+class TestMetricsEndpoint:
+    """Séries exportées après un appel à /predict."""
+
+    def test_predict_is_observed(self, client):
+        before = scrape(client)
+
+        response = client.post("/predictions/predict", json={"gender": 1, "pulse": 88})
+        assert response.status_code == 200
+
+        after = scrape(client)
+        stage = 'cmv_ml_stage_duration_seconds_count{stage="%s"}'
+        for name in ("validation", "imputation", "memo_fingerprint"):
+            assert delta(before, after, stage % name) == 1
+        imputed = 'cmv_ml_imputed_features_total{feature="%s"}'
+        assert delta(before, after, imputed % "bmi") == 1
+        assert delta(before, after, imputed % "pulse") == 0
+        assert delta(before, after, 'cmv_ml_predictions_total{endpoint="predict"}') == 1
+        assert (
+            delta(
+                before,
+                after,
+                "cmv_ml_request_duration_seconds_count"
+                '{method="POST",route="/predictions/predict",status="200"}',
+            )
+            == 1
+        )
+        assert after['cmv_ml_model_info{version="test"}'] == 1
@@ -0,0 +1,207 @@
+"""Tests du registre des modèles: substitution, CURRENT, surveillance, administration."""
+
+import asyncio
+import shutil
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependancies.auth import check_admin
+from app.schemas.features import PredictionFeatures
+from app.services.model_registry import (
+    MEANS_FILENAME,
+    ModelActivationInProgressError,
+    ModelRegistry,
+    ModelVersionNotFoundError,
+)
+from app.tests.conftest import MODELS_DIR
+from app.utils.config import ADMIN_ROLE
+
+
+@pytest.fixture
+def registry_dir(tmp_path):
+    """Registre à deux versions complètes et une version incomplète."""
+    for version in ("v1", "v2"):
+        version_dir = tmp_path / version
+        version_dir.mkdir()
+        shutil.copy(MODELS_DIR / "model.ubj", version_dir / "model.ubj")
+        shutil.copy(MODELS_DIR / MEANS_FILENAME, version_dir / MEANS_FILENAME)
+    # Sans moyennes: pas une version
+    (tmp_path / "incomplete").mkdir()
+    shutil.copy(MODELS_DIR / "model.ubj", tmp_path / "incomplete" / "model.ubj")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(registry_dir):
+    """Registre servant v1."""
+    registry = ModelRegistry(
+        str(registry_dir), str(MODELS_DIR / "model.ubj"), backend="numpy"
+    )
+    registry.set_current("v1")
+    registry.load_initial(warm_up=False)
+    return registry
+
+
+def gate_loading(registry, monkeypatch) -> threading.Event:
+    """Bloque le chargement des versions jusqu'à l'ouverture de la barrière."""
+    gate = threading.Event()
+    build_bundle = registry.build_bundle
+
+    def gated_build_bundle(version, warm_up=True):
+        bundle = build_bundle(version, warm_up=warm_up)
+        gate.wait(timeout=5)
+        return bundle
+
+    monkeypatch.setattr(registry, "build_bundle", gated_build_bundle)
+    return gate
+
+
+class TestVersions:
+    """Versions disponibles et pointeur CURRENT."""
+
+    def test_incomplete_version_is_ignored(self, registry):
+        assert registry.list_versions() == ["v1", "v2"]
+
+    def test_current_selects_version(self, registry):
+        assert registry.resolve_target() == "v1"
+        assert registry.active.version == "v1"
+
+        registry.set_current("v2")
+
+        assert registry.resolve_target() == "v2"
+
+    def test_latest_version_without_current(self, registry_dir):
+        registry = ModelRegistry(
+            str(registry_dir), str(MODELS_DIR / "model.ubj"), backend="numpy"
+        )
+
+        assert registry.resolve_target() == "v2"
+
+    def test_unknown_current_falls_back_to_latest(self, registry):
+        registry.set_current("v9")
+
+        assert registry.resolve_target() == "v2"
+
+
+class TestActivate:
+    """Chargement en arrière-plan et substitution atomique."""
+
+    def test_requests_are_served_during_swap(self, registry, monkeypatch):
+        gate = gate_loading(registry, monkeypatch)
+
+        async def scenario():
+            in_flight = registry.active
+            activation = asyncio.create_task(registry.activate("v2"))
+            seen = []
+            # Requêtes servies pendant le chargement de v2
+            for _ in range(20):
+                await asyncio.sleep(0)
+                bundle = registry.active
+                bundle.engine.predict_features(PredictionFeatures())
+                seen.append(bundle.version)
+            loading = registry.status()["loading_version"]
+            with pytest.raises(ModelActivationInProgressError):
+                await registry.activate("v1")
+            gate.set()
+            await activation
+            # La requête commencée sur v1 se termine sur v1
+            in_flight.engine.predict_features(PredictionFeatures())
+            return in_flight.version, seen, loading
+
+        in_flight, seen, loading = asyncio.run(scenario())
+        assert in_flight == "v1"
+        assert seen == ["v1"] * 20
+        assert loading == "v2"
+        assert registry.active.version == "v2"
+        assert registry.status()["loading_version"] is None
+
+    def test_failed_load_keeps_active_bundle(self, registry, registry_dir):
+        broken = registry_dir / "v3"
+        broken.mkdir()
+        (broken / "model.ubj").write_bytes(b"not a model")
+        shutil.copy(MODELS_DIR / MEANS_FILENAME, broken / MEANS_FILENAME)
+        active = registry.active
+
+        with pytest.raises(Exception):
+            asyncio.run(registry.activate("v3"))
+
+        assert registry.active is active
+        assert registry.status()["last_error"].startswith("v3")
+
+        # Une activation réussie efface l'erreur
+        asyncio.run(registry.activate("v2"))
+        assert registry.active.version == "v2"
+        assert registry.status()["last_error"] is None
+
+    def test_unknown_version(self, registry):
+        with pytest.raises(ModelVersionNotFoundError):
+            asyncio.run(registry.activate("incomplete"))
+
+        assert registry.active.version == "v1"
+
+
+class TestWatch:
+    """Suivi de CURRENT par les workers."""
+
+    def test_watcher_activates_current(self, registry):
+        async def scenario():
+            registry.start_watcher(0.01)
+            registry.set_current("v2")
+            for _ in range(500):
+                if registry.active.version == "v2":
+                    break
+                await asyncio.sleep(0.01)
+            await registry.stop_watcher()
+            return registry.active.version
+
+        assert asyncio.run(scenario()) == "v2"
+
+    def test_failed_target_is_not_retried(self, registry, registry_dir, monkeypatch):
+        broken = registry_dir / "v3"
+        broken.mkdir()
+        (broken / "model.ubj").write_bytes(b"not a model")
+        shutil.copy(MODELS_DIR / MEANS_FILENAME, broken / MEANS_FILENAME)
+        attempts = []
+        build_bundle = registry.build_bundle
+
+        def counting_build_bundle(version, warm_up=True):
+            attempts.append(version)
+            return build_bundle(version, warm_up=warm_up)
+
+        monkeypatch.setattr(registry, "build_bundle", counting_build_bundle)
+
+        async def scenario():
+            registry.start_watcher(0.01)
+            registry.set_current("v3")
+            await asyncio.sleep(0.2)
+            await registry.stop_watcher()
+
+        asyncio.run(scenario())
+        assert attempts == ["v3"]
+        assert registry.active.version == "v1"
+
+
+class TestAdmin:
+    """Accès réservé au rôle ADMIN_ROLE."""
+
+    @pytest.mark.parametrize("role", ["home", "nurse", None])
+    def test_check_admin_rejects_other_roles(self, role):
+        with pytest.raises(HTTPException) as exc_info:
+            check_admin({"user_id": 1, "role": role})
+
+        assert exc_info.value.status_code == 403
+
+    def test_check_admin_accepts_admin_role(self):
+        payload = {"user_id": 1, "role": ADMIN_ROLE}
+
+        assert check_admin(payload) is payload
+
+    @pytest.mark.parametrize(
+        "method, url", [("get", "/admin/models/"), ("post", "/admin/models/v1/activate")]
+    )
+    def test_endpoints_reject_other_roles(self, client, method, url):
+        response = getattr(client, method)(url)
+
+        assert response.status_code == 403
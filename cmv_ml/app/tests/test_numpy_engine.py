@@ -0,0 +1,167 @@
+"""Tests de parité du backend NumPy avec le Booster XGBoost."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.schemas.features import PredictionFeatures
+from app.services.imputation_service import ImputationService
+from app.services.metrics import stage_duration
+from app.services.numpy_engine import NumpyTreePredictionEngine, load_model_document
+from app.services.prediction_engine import (
+    ModelNotLoadedError,
+    XGBoostPredictionEngine,
+)
+
+# La parité est vérifiée contre le Booster: xgboost est requis pour ces tests
+pytest.importorskip("xgboost")
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+MODEL_PATH = str(MODELS_DIR / "model.ubj")
+MEANS_PATH = str(MODELS_DIR / "feature_means.json")
+
+
+def _load(engine):
+    engine.load_model(MODEL_PATH)
+    engine.load_feature_means(MEANS_PATH)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def numpy_engine():
+    return _load(NumpyTreePredictionEngine())
+
+
+@pytest.fixture(scope="module")
+def xgboost_engine():
+    return _load(XGBoostPredictionEngine())
+
+
+def _synthetic_matrix(n_rows: int, missing_fraction: float, seed: int = 0):
+    """Matrice synthétique au format du modèle, NaN pour les continues manquantes."""
+    rng = np.random.default_rng(seed)
+    order = XGBoostPredictionEngine().get_feature_order()
+    matrix = np.empty((n_rows, len(order)), dtype=np.float32)
+    for j, name in enumerate(order):
+        if name in ImputationService.CONTINUOUS_FEATURES:
+            matrix[:, j] = rng.uniform(0.5, 200.0, n_rows)
+            matrix[rng.random(n_rows) < missing_fraction, j] = np.nan
+        elif name == "rcount":
+            matrix[:, j] = rng.integers(0, 6, n_rows)
+        else:
+            matrix[:, j] = rng.integers(0, 2, n_rows)
+    return matrix
+
+
+class TestNumpyEngineParity:
+    """Le backend NumPy doit reproduire les prédictions du Booster."""
+
+    @pytest.mark.parametrize("missing_fraction", [0.0, 0.3, 1.0])
+    def test_batch_matches_booster(
+        self, numpy_engine, xgboost_engine, missing_fraction
+    ):
+        """Sur un lot synthétique, les prédictions sont identiques au float32 près."""
+        matrix = _synthetic_matrix(2000, missing_fraction)
+
+        expected = xgboost_engine._execute_batch_prediction(matrix)
+        actual = numpy_engine._execute_batch_prediction(matrix)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-5)
+
+    def test_single_row_matches_booster(self, numpy_engine, xgboost_engine):
+        """Le chemin rapide predict_features donne la même valeur."""
+        features = PredictionFeatures(bmi=22.0, rcount=3, facid_E=1)
+
+        assert numpy_engine.predict_features(features) == pytest.approx(
+            xgboost_engine.predict_features(features), abs=1e-5
+        )
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        rcount=st.integers(min_value=0, max_value=5),
+        bmi=st.one_of(st.none(), st.floats(min_value=10.0, max_value=60.0)),
+        creatinine=st.one_of(st.none(), st.floats(min_value=0.1, max_value=10.0)),
+        facid_C=st.sampled_from([0, 1]),
+    )
+    def test_features_match_booster(
+        self, numpy_engine, xgboost_engine, rcount, bmi, creatinine, facid_C
+    ):
+        """Pour des features valides quelconques, les deux backends concordent."""
+        features = PredictionFeatures(
+            rcount=rcount, bmi=bmi, creatinine=creatinine, facid_C=facid_C
+        )
+
+        assert numpy_engine.predict_features_batch([features, features]) == (
+            pytest.approx(
+                xgboost_engine.predict_features_batch([features, features]),
+                abs=1e-5,
+            )
+        )
+
+
+def _imputation_count() -> int:
+    """Nombre d'observations de l'étape imputation dans l'histogramme."""
+    for line in stage_duration.render():
+        if line.startswith('cmv_ml_stage_duration_seconds_count{stage="imputation"}'):
+            return int(line.split()[-1])
+    return 0
+
+
+class TestImputedArray:
+    """Matrice déjà imputée par l'appelant (/predict-batch, /sensitivity)."""
+
+    def test_matches_predict_array(self, numpy_engine):
+        """Imputer puis predict_imputed_array équivaut à predict_array."""
+        matrix = _synthetic_matrix(200, 0.3)
+        clean, _ = numpy_engine.imputation_service.impute_array(
+            matrix, numpy_engine.get_feature_order()
+        )
+
+        np.testing.assert_array_equal(
+            numpy_engine.predict_imputed_array(clean),
+            numpy_engine.predict_array(matrix),
+        )
+
+    def test_does_not_impute_again(self, numpy_engine):
+        """Aucune seconde étape d'imputation n'est enregistrée."""
+        matrix = _synthetic_matrix(10, 0.0)
+        before = _imputation_count()
+
+        numpy_engine.predict_imputed_array(matrix)
+        assert _imputation_count() == before
+        numpy_engine.predict_array(matrix)
+        assert _imputation_count() == before + 1
+
+
+class TestNumpyEngineLoading:
+    """Chargement du modèle sans xgboost."""
+
+    def test_ubj_document_matches_json_export(self, xgboost_engine):
+        """Le décodeur UBJSON relit le même document que l'export JSON d'XGBoost."""
+        import json
+
+        document = load_model_document(MODEL_PATH)
+        expected = json.loads(xgboost_engine._model.save_raw("json"))
+
+        assert document["learner"]["feature_names"] == expected["learner"][
+            "feature_names"
+        ]
+        tree = document["learner"]["gradient_booster"]["model"]["trees"][0]
+        expected_tree = expected["learner"]["gradient_booster"]["model"]["trees"][0]
+        np.testing.assert_array_equal(
+            tree["split_conditions"],
+            np.asarray(expected_tree["split_conditions"], dtype=np.float32),
+        )
+
+    def test_predict_without_model_raises(self):
+        """Sans modèle chargé, la prédiction lève ModelNotLoadedError."""
+        with pytest.raises(ModelNotLoadedError):
+            NumpyTreePredictionEngine().predict_features(PredictionFeatures())
+
+    def test_missing_file_raises(self, tmp_path):
+        """Un chemin inexistant lève FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            NumpyTreePredictionEngine().load_model(str(tmp_path / "absent.ubj"))
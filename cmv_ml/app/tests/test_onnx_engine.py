@@ -0,0 +1,101 @@
+"""Tests de parité du backend ONNX Runtime avec le Booster XGBoost."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.prediction_engine import XGBoostPredictionEngine
+
+# Export et inférence ONNX, parité vérifiée contre le Booster
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("xgboost")
+
+from app.services.onnx_engine import OnnxPredictionEngine, export_onnx  # noqa: E402
+from benchmarks.synthetic import generate_features  # noqa: E402
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+MODEL_PATH = str(MODELS_DIR / "model.ubj")
+MEANS_PATH = str(MODELS_DIR / "feature_means.json")
+
+
+def _load(engine, model_path: str = MODEL_PATH):
+    engine.load_model(model_path)
+    engine.load_feature_means(MEANS_PATH)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def onnx_engine():
+    return _load(OnnxPredictionEngine())
+
+
+@pytest.fixture(scope="module")
+def xgboost_engine():
+    return _load(XGBoostPredictionEngine())
+
+
+class TestOnnxEngineParity:
+    """Le backend ONNX doit reproduire les prédictions du Booster."""
+
+    @pytest.mark.parametrize("missing_fraction", [0.0, 0.3, 1.0])
+    def test_synthetic_batch_matches_booster(
+        self, onnx_engine, xgboost_engine, missing_fraction
+    ):
+        """Sur le jeu synthétique des benchmarks, prédictions identiques au float32 près."""
+        features = generate_features(
+            500, missing_fraction, xgboost_engine.feature_means, seed=7
+        )
+
+        expected = xgboost_engine.predict_features_batch(features)
+        actual = onnx_engine.predict_features_batch(features)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-5)
+
+    def test_single_row_matches_booster(self, onnx_engine, xgboost_engine):
+        """Le chemin predict_features donne la même valeur."""
+        (features,) = generate_features(1, 0.5, xgboost_engine.feature_means)
+
+        assert onnx_engine.predict_features(features) == pytest.approx(
+            xgboost_engine.predict_features(features), abs=1e-5
+        )
+
+    def test_missing_values_follow_default_direction(self, onnx_engine, xgboost_engine):
+        """Sans imputation, les NaN suivent la même branche que dans le Booster."""
+        matrix = np.full((4, len(xgboost_engine.get_feature_order())), np.nan, np.float32)
+        matrix[:, 0] = [0, 1, 3, 5]
+
+        np.testing.assert_allclose(
+            onnx_engine._execute_batch_prediction(matrix),
+            xgboost_engine._execute_batch_prediction(matrix),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+
+
+class TestOnnxExport:
+    """Export du modèle et chargement du fichier ONNX."""
+
+    def test_exported_file_is_loaded(self, tmp_path, xgboost_engine):
+        """Le fichier exporté à côté du modèle est chargé et donne les mêmes prédictions."""
+        model_path = tmp_path / "model.ubj"
+        model_path.write_bytes(Path(MODEL_PATH).read_bytes())
+        onnx_path = export_onnx(str(model_path))
+
+        assert onnx_path == str(tmp_path / "model.onnx")
+        engine = _load(OnnxPredictionEngine(), str(model_path))
+        assert engine.model_version == xgboost_engine.model_version
+
+        features = generate_features(50, 0.3, xgboost_engine.feature_means, seed=1)
+        np.testing.assert_allclose(
+            engine.predict_features_batch(features),
+            xgboost_engine.predict_features_batch(features),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+
+    def test_missing_file_raises(self, tmp_path):
+        """Un chemin inexistant lève FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            OnnxPredictionEngine().load_model(str(tmp_path / "absent.ubj"))
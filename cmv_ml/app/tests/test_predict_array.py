@@ -0,0 +1,103 @@
+"""Tests de l'endpoint binaire POST /predictions/predict-array."""
+
+import numpy as np
+import pytest
+
+from app.routers import predictions
+from app.schemas.features import PredictionFeatures
+
+URL = "/predictions/predict-array"
+HEADERS = {"Content-Type": "application/octet-stream"}
+
+PATIENTS = [
+    PredictionFeatures(),
+    PredictionFeatures(gender=1, rcount=3, bmi=31.5, pulse=88, facid_E=1),
+    PredictionFeatures(hematocrit=11.2, sodium=136.0, rcount=None, asthma=1),
+]
+
+
+def to_body(matrix: np.ndarray) -> bytes:
+    return matrix.astype("<f4").tobytes()
+
+
+def feature_matrix(test_bundle, patients) -> np.ndarray:
+    """Matrice au format binaire: NaN là où le JSON envoie null."""
+    return test_bundle.engine.features_matrix(patients)
+
+
+def column(test_bundle, name: str) -> int:
+    return test_bundle.engine.get_feature_order().index(name)
+
+
+class TestPredictArray:
+    """Aller-retour binaire et équivalence avec /predict."""
+
+    def test_matches_predict(self, client, test_bundle):
+        response = client.post(
+            URL, content=to_body(feature_matrix(test_bundle, PATIENTS)), headers=HEADERS
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["x-model-version"] == "test"
+        values = np.frombuffer(response.content, dtype="<f4")
+        expected = [
+            client.post(
+                "/predictions/predict", json=patient.model_dump()
+            ).json()["predicted_length_of_stay"]
+            for patient in PATIENTS
+        ]
+        np.testing.assert_allclose(values, expected, rtol=1e-5, atol=1e-5)
+
+    def test_nan_rcount_is_accepted(self, client, test_bundle):
+        # rcount: null est accepté par le JSON, NaN l'est donc en binaire
+        matrix = feature_matrix(test_bundle, [PredictionFeatures(rcount=None)])
+        assert np.isnan(matrix[0, column(test_bundle, "rcount")])
+
+        response = client.post(URL, content=to_body(matrix), headers=HEADERS)
+
+        assert response.status_code == 200
+        assert len(response.content) == 4
+
+
+class TestPredictArrayErrors:
+    """Codes d'erreur de l'entrée binaire."""
+
+    def test_wrong_content_type(self, client, test_bundle):
+        body = to_body(feature_matrix(test_bundle, PATIENTS[:1]))
+
+        response = client.post(
+            URL, content=body, headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 415
+
+    @pytest.mark.parametrize("size", [0, 4, 27 * 4 + 4])
+    def test_bad_length(self, client, size):
+        response = client.post(URL, content=b"\0" * size, headers=HEADERS)
+
+        assert response.status_code == 400
+
+    def test_infinite_value(self, client, test_bundle):
+        matrix = feature_matrix(test_bundle, PATIENTS[:1])
+        matrix[0, column(test_bundle, "bmi")] = np.inf
+
+        response = client.post(URL, content=to_body(matrix), headers=HEADERS)
+
+        assert response.status_code == 400
+
+    def test_nan_in_binary_column(self, client, test_bundle):
+        matrix = feature_matrix(test_bundle, PATIENTS[:1])
+        matrix[0, column(test_bundle, "asthma")] = np.nan
+
+        response = client.post(URL, content=to_body(matrix), headers=HEADERS)
+
+        assert response.status_code == 400
+
+    def test_too_many_rows(self, client, test_bundle, monkeypatch):
+        monkeypatch.setattr(predictions, "PREDICT_ARRAY_MAX_ROWS", 2)
+        body = to_body(feature_matrix(test_bundle, PATIENTS))
+
+        response = client.post(URL, content=body, headers=HEADERS)
+
+        assert response.status_code == 413
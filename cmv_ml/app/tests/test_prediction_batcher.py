@@ -0,0 +1,165 @@
+"""Tests du regroupement des appels /predict en lots (micro-batching)."""
+
+import asyncio
+
+import pytest
+
+from app import main
+from app.schemas.features import PredictionFeatures
+from app.services.metrics import render_histogram
+from app.services.prediction_batcher import PredictionBatcher
+
+
+class RecordingEngine:
+    """Moteur factice: prédit l'hématocrite + offset et note chaque lot."""
+
+    def __init__(self, offset: float = 0.0, fail: bool = False) -> None:
+        self.offset = offset
+        self.fail = fail
+        self.batches: list[int] = []
+
+    def predict_features(self, features: PredictionFeatures) -> float:
+        return self.predict_features_batch([features])[0]
+
+    def predict_features_batch(self, batch: list[PredictionFeatures]) -> list[float]:
+        self.batches.append(len(batch))
+        if self.fail:
+            raise RuntimeError("inference failed")
+        return [features.hematocrit + self.offset for features in batch]
+
+
+def features(value: float) -> PredictionFeatures:
+    return PredictionFeatures(hematocrit=value)
+
+
+async def predict_all(batcher, requests):
+    """Soumet les requêtes (moteur, valeur) concurrentes, batcher démarré."""
+    await batcher.start()
+    try:
+        return await asyncio.gather(
+            *(batcher.predict(engine, features(value)) for engine, value in requests),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.stop()
+
+
+class TestPredictionBatcher:
+    """Coalescence, propagation des erreurs, groupes par moteur et arrêt."""
+
+    def test_concurrent_calls_share_one_batch(self):
+        engine = RecordingEngine()
+        batcher = PredictionBatcher(max_batch_size=64, max_wait_ms=50)
+        values = [float(v) for v in range(1, 9)]
+
+        results = asyncio.run(predict_all(batcher, [(engine, v) for v in values]))
+
+        # Un seul appel au modèle, chaque appelant reçoit sa propre ligne
+        assert engine.batches == [8]
+        assert results == values
+
+    def test_batch_size_is_bounded(self):
+        engine = RecordingEngine()
+        batcher = PredictionBatcher(max_batch_size=3, max_wait_ms=50)
+        values = [float(v) for v in range(1, 8)]
+
+        results = asyncio.run(predict_all(batcher, [(engine, v) for v in values]))
+
+        assert engine.batches == [3, 3, 1]
+        assert results == values
+
+    def test_exception_reaches_every_waiter(self):
+        engine = RecordingEngine(fail=True)
+        batcher = PredictionBatcher(max_batch_size=64, max_wait_ms=50)
+
+        results = asyncio.run(predict_all(batcher, [(engine, 1.0)] * 4))
+
+        assert engine.batches == [4]
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_engines_are_flushed_separately(self):
+        first, second = RecordingEngine(), RecordingEngine(offset=100.0)
+        batcher = PredictionBatcher(max_batch_size=64, max_wait_ms=50)
+        requests = [(first, 1.0), (second, 2.0), (first, 3.0), (second, 4.0)]
+
+        results = asyncio.run(predict_all(batcher, requests))
+
+        assert first.batches == [2]
+        assert second.batches == [2]
+        assert results == [1.0, 102.0, 3.0, 104.0]
+
+    def test_stop_serves_queued_requests(self):
+        async def scenario():
+            engine = RecordingEngine()
+            batcher = PredictionBatcher(max_batch_size=64, max_wait_ms=1000)
+            await batcher.start()
+            pending = asyncio.gather(
+                *(batcher.predict(engine, features(v)) for v in (1.0, 2.0, 3.0))
+            )
+            # Lot collecté, en attente de retardataires au moment de l'arrêt
+            await asyncio.sleep(0.05)
+            await batcher.stop()
+            return await asyncio.wait_for(pending, 1), engine.batches
+
+        results, batches = asyncio.run(scenario())
+        assert results == [1.0, 2.0, 3.0]
+        assert batches == [3]
+
+    @pytest.mark.parametrize("max_batch_size", [1, 64])
+    def test_direct_call_when_not_batching(self, max_batch_size):
+        async def scenario(batcher, engine):
+            if max_batch_size == 1:
+                await batcher.start()
+            try:
+                return await batcher.predict(engine, features(5.0))
+            finally:
+                await batcher.stop()
+
+        engine = RecordingEngine()
+        batcher = PredictionBatcher(max_batch_size=max_batch_size)
+
+        # Non démarré ou lots de taille 1: appel direct au moteur
+        assert asyncio.run(scenario(batcher, engine)) == 5.0
+        assert engine.batches == [1]
+        assert not batcher.is_running
+
+
+class TestBatchSizeMetrics:
+    """Histogramme des tailles de lots réalisées (GET /metrics)."""
+
+    def test_render_histogram(self):
+        engine = RecordingEngine()
+        batcher = PredictionBatcher(max_batch_size=3, max_wait_ms=50)
+        asyncio.run(predict_all(batcher, [(engine, float(v)) for v in range(1, 8)]))
+        sizes = batcher.batch_sizes
+
+        lines = render_histogram(
+            "batch_size",
+            "Batch sizes",
+            [({"queue": "predict"}, sizes.buckets(), sizes.items, sizes.flushes)],
+        )
+
+        # Lots [3, 3, 1], buckets 1, 2, 3 cumulés
+        assert lines[1] == "# TYPE batch_size histogram"
+        assert lines[2:] == [
+            'batch_size_bucket{queue="predict",le="1"} 1',
+            'batch_size_bucket{queue="predict",le="2"} 1',
+            'batch_size_bucket{queue="predict",le="3"} 3',
+            'batch_size_bucket{queue="predict",le="+Inf"} 3',
+            'batch_size_sum{queue="predict"} 7',
+            'batch_size_count{queue="predict"} 3',
+        ]
+
+    def test_exported_in_metrics(self, client, monkeypatch):
+        batcher = PredictionBatcher(max_batch_size=4)
+        for size in (1, 4, 4):
+            batcher.batch_sizes.record(size)
+        monkeypatch.setattr(main, "prediction_batcher", batcher)
+
+        text = client.get("/metrics").text
+
+        assert "# TYPE cmv_ml_batch_size histogram" in text
+        assert 'cmv_ml_batch_size_bucket{queue="predict",le="2"} 1' in text
+        assert 'cmv_ml_batch_size_bucket{queue="predict",le="4"} 3' in text
+        assert 'cmv_ml_batch_size_sum{queue="predict"} 9' in text
+        assert 'cmv_ml_batch_size_count{queue="validation"}' in text
@@ -0,0 +1,129 @@
+"""Tests du cache en mémoire des prédictions en attente de validation."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import prediction_cache
+from app.services.prediction_cache import InMemoryPredictionCache
+
+
+class Clock:
+    """Horloge monotone avancée à la main."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        prediction_cache, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+class TestExpiry:
+    """Expiration par le tas de TTL."""
+
+    def test_default_ttl_is_documented_30_minutes(self, clock):
+        cache = InMemoryPredictionCache()
+        prediction_id = uuid4()
+        asyncio.run(cache.store(prediction_id, 4.2))
+
+        clock.now += 30 * 60 - 1
+        assert asyncio.run(cache.get(prediction_id)) == 4.2
+        clock.now += 1
+        assert asyncio.run(cache.get(prediction_id)) is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+        assert len(cache) == 0
+
+    def test_write_purges_expired_entries(self, clock):
+        cache = InMemoryPredictionCache(ttl_minutes=1)
+        asyncio.run(cache.store_many([(uuid4(), 1.0), (uuid4(), 2.0)]))
+        clock.now += 30
+        survivor = uuid4()
+        asyncio.run(cache.store(survivor, 3.0))
+
+        clock.now += 30
+        asyncio.run(cache.store(uuid4(), 4.0))
+
+        # Les deux premières sont purgées sans avoir été relues
+        assert len(cache) == 2
+        assert cache.stats()["expirations"] == 2
+        assert asyncio.run(cache.get(survivor)) == 3.0
+
+    def test_rewrite_renews_ttl(self, clock):
+        cache = InMemoryPredictionCache(ttl_minutes=1)
+        prediction_id = uuid4()
+        asyncio.run(cache.store(prediction_id, 1.0))
+
+        clock.now += 30
+        asyncio.run(cache.store(prediction_id, 2.0))
+        # L'ancien élément du tas arrive à échéance: l'entrée réécrite reste
+        clock.now += 45
+        asyncio.run(cache.store(uuid4(), 3.0))
+
+        assert asyncio.run(cache.get(prediction_id)) == 2.0
+        assert cache.stats()["expirations"] == 0
+
+    def test_removed_entry(self, clock):
+        cache = InMemoryPredictionCache(ttl_minutes=1)
+        ids = [uuid4() for _ in range(3)]
+        asyncio.run(cache.store_many([(i, float(n)) for n, i in enumerate(ids)]))
+
+        asyncio.run(cache.remove(ids[0]))
+        asyncio.run(cache.remove_many(ids[1:2]))
+
+        assert asyncio.run(cache.get_many(ids)) == [None, None, 2.0]
+
+
+class TestMaxSize:
+    """Éviction quand le cache est plein."""
+
+    def test_oldest_entry_is_evicted(self, clock):
+        cache = InMemoryPredictionCache(max_size=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+
+        async def scenario():
+            await cache.store(first, 1.0)
+            clock.now += 1
+            await cache.store(second, 2.0)
+            clock.now += 1
+            # Réécrite, la première expire désormais après la seconde
+            await cache.store(first, 1.5)
+            await cache.store(third, 3.0)
+            return await cache.get_many([first, second, third])
+
+        assert asyncio.run(scenario()) == [1.5, None, 3.0]
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_rewrite_of_full_cache_does_not_evict(self, clock):
+        cache = InMemoryPredictionCache(max_size=2)
+        first, second = uuid4(), uuid4()
+        asyncio.run(cache.store_many([(first, 1.0), (second, 2.0)]))
+
+        asyncio.run(cache.store(second, 2.5))
+
+        assert asyncio.run(cache.get_many([first, second])) == [1.0, 2.5]
+        assert cache.stats()["evictions"] == 0
+
+    def test_heap_stays_bounded(self, clock):
+        cache = InMemoryPredictionCache(max_size=4)
+        prediction_id = uuid4()
+
+        for n in range(100):
+            asyncio.run(cache.store(prediction_id, float(n)))
+
+        # Éléments obsolètes des réécritures: tas reconstruit
+        assert len(cache._expiry_heap) <= 2 * 4
+        assert asyncio.run(cache.get(prediction_id)) == 99.0
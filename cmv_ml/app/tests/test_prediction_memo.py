@@ -0,0 +1,150 @@
+"""Tests de la mémoïsation des prédictions (empreinte et calculs en cours)."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.prediction_memo import PredictionMemo
+
+
+class GatedComputation:
+    """Calcul qui ne se termine qu'à l'ouverture de la barrière."""
+
+    def __init__(self, value: float = 4.2, error: Exception | None = None) -> None:
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self) -> float:
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class TestFingerprint:
+    """Empreinte du vecteur de features imputé."""
+
+    def test_depends_on_vector_and_model_version(self):
+        memo = PredictionMemo()
+        vector = np.arange(22, dtype=np.float32).tobytes()
+        other = np.arange(1, 23, dtype=np.float32).tobytes()
+
+        key = memo.fingerprint(vector, "v1")
+        assert key == memo.fingerprint(vector, "v1")
+        assert len(key) == 16
+        assert key != memo.fingerprint(other, "v1")
+        assert key != memo.fingerprint(vector, "v2")
+
+    def test_key_is_per_instance(self):
+        vector = np.zeros(22, dtype=np.float32).tobytes()
+
+        # Clé de hachage aléatoire: empreintes différentes d'un processus à l'autre
+        first, second = PredictionMemo(), PredictionMemo()
+        assert first.fingerprint(vector, "v1") != second.fingerprint(vector, "v1")
+
+
+class TestGetOrCompute:
+    """Cache LRU et fusion des calculs concurrents."""
+
+    def test_concurrent_misses_share_one_computation(self):
+        async def scenario():
+            memo = PredictionMemo()
+            compute = GatedComputation()
+            compute.gate = asyncio.Event()
+            pending = asyncio.gather(
+                *(memo.get_or_compute(b"key", compute) for _ in range(5))
+            )
+            await asyncio.sleep(0)
+            compute.gate.set()
+            return await pending, compute.calls, memo.stats()
+
+        results, calls, stats = asyncio.run(scenario())
+        assert results == [4.2] * 5
+        assert calls == 1
+        assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 0)
+
+    def test_computed_value_is_a_hit(self):
+        async def scenario():
+            memo = PredictionMemo()
+            compute = GatedComputation()
+            first = await memo.get_or_compute(b"key", compute)
+            second = await memo.get_or_compute(b"key", compute)
+            return first, second, compute.calls, memo.stats()
+
+        first, second, calls, stats = asyncio.run(scenario())
+        assert first == second == 4.2
+        assert calls == 1
+        assert (stats["misses"], stats["hits"], stats["size"]) == (1, 1, 1)
+
+    def test_failed_computation_is_not_cached(self):
+        async def scenario():
+            memo = PredictionMemo()
+            failing = GatedComputation(error=RuntimeError("inference failed"))
+            failing.gate = asyncio.Event()
+            pending = asyncio.gather(
+                *(memo.get_or_compute(b"key", failing) for _ in range(3)),
+                return_exceptions=True,
+            )
+            await asyncio.sleep(0)
+            failing.gate.set()
+            errors = await pending
+
+            # L'appel suivant recalcule au lieu de relire l'échec
+            compute = GatedComputation(value=5.0)
+            value = await memo.get_or_compute(b"key", compute)
+            return errors, failing.calls, value, compute.calls
+
+        errors, failed_calls, value, calls = asyncio.run(scenario())
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert failed_calls == 1
+        assert value == 5.0
+        assert calls == 1
+
+    def test_cancelled_caller_does_not_cancel_computation(self):
+        async def scenario():
+            memo = PredictionMemo()
+            compute = GatedComputation()
+            compute.gate = asyncio.Event()
+            first = asyncio.ensure_future(memo.get_or_compute(b"key", compute))
+            second = asyncio.ensure_future(memo.get_or_compute(b"key", compute))
+            await asyncio.sleep(0)
+            first.cancel()
+            compute.gate.set()
+            return await second, first.cancelled(), memo.stats()["size"]
+
+        value, cancelled, size = asyncio.run(scenario())
+        assert value == 4.2
+        assert cancelled
+        assert size == 1
+
+    def test_least_recently_used_is_evicted(self):
+        async def scenario():
+            memo = PredictionMemo(max_size=2)
+            for key in (b"a", b"b"):
+                await memo.get_or_compute(key, GatedComputation())
+            # "a" relu: "b" devient la plus ancienne
+            await memo.get_or_compute(b"a", GatedComputation())
+            await memo.get_or_compute(b"c", GatedComputation())
+            compute = GatedComputation()
+            await memo.get_or_compute(b"b", compute)
+            return compute.calls, memo.evictions
+
+        calls, evictions = asyncio.run(scenario())
+        assert calls == 1
+        assert evictions == 2
+
+    @pytest.mark.parametrize("max_size", [0, -1])
+    def test_disabled(self, max_size):
+        async def scenario():
+            memo = PredictionMemo(max_size=max_size)
+            compute = GatedComputation()
+            for _ in range(3):
+                await memo.get_or_compute(b"key", compute)
+            return memo.enabled, compute.calls, memo.stats()["size"]
+
+        assert asyncio.run(scenario()) == (False, 3, 0)
@@ -0,0 +1,192 @@
+"""Tests de la pagination par curseur de l'historique des prédictions."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.repositories.predictions_crud import PgPredictionsRepository
+from app.routers import predictions
+from app.sql.models import ValidatedPrediction
+from app.utils.database import Base
+from app.utils.pagination import decode_cursor, encode_cursor
+
+START = datetime(2026, 3, 1, 8, 0, 0)
+
+
+@pytest.fixture
+def db():
+    """Session sur une base SQLite en mémoire."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    """Repository neuf (cache des totaux vide) utilisé par l'endpoint."""
+    repository = PgPredictionsRepository(count_cache_seconds=60)
+    monkeypatch.setattr(predictions, "predictions_repository", repository)
+    return repository
+
+
+def add_predictions(db, count, user_id=1, day=0, distinct_dates=5):
+    """Ajoute count prédictions réparties sur distinct_dates dates égales."""
+    rows = [
+        ValidatedPrediction(
+            id=uuid4(),
+            predicted_value=float(i),
+            user_id=user_id,
+            validation_date=START + timedelta(days=day, hours=i % distinct_dates),
+            created_at=START,
+        )
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def get_page(db, limit=20, cursor=None, exact=False, **filters):
+    """Appelle l'endpoint GET /predictions/ avec tous ses paramètres."""
+    return asyncio.run(
+        predictions.get_predictions(
+            limit=limit,
+            cursor=cursor,
+            user_id=filters.get("user_id"),
+            date_from=filters.get("date_from"),
+            date_to=filters.get("date_to"),
+            exact=exact,
+            current_user={"id_user": 1},
+            db=db,
+        )
+    )
+
+
+def walk(db, limit=20, **filters):
+    """Parcourt toutes les pages et retourne les ids dans l'ordre lu."""
+    ids, cursor = [], None
+    while True:
+        page = get_page(db, limit=limit, cursor=cursor, **filters)
+        assert len(page.items) <= limit
+        ids.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+class TestCursor:
+    """Encodage et décodage du curseur opaque."""
+
+    def test_round_trip(self):
+        validation_date, prediction_id = START, uuid4()
+        cursor = encode_cursor(validation_date, prediction_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (validation_date, prediction_id)
+
+    @pytest.mark.parametrize(
+        "cursor", ["", "not a cursor", encode_cursor(START, uuid4())[:-3] + "@@@"]
+    )
+    def test_invalid_cursor_raises(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_invalid_cursor_is_bad_request(self, db, repository):
+        with pytest.raises(HTTPException) as exc_info:
+            get_page(db, cursor="not a cursor")
+
+        assert exc_info.value.status_code == 400
+
+
+class TestKeysetPagination:
+    """Parcours complet et filtres de GET /predictions/."""
+
+    def test_walk_with_tied_dates(self, db, repository):
+        # 23 lignes sur 5 dates: les égalités sont départagées par l'id
+        rows = add_predictions(db, 23)
+        expected = [
+            row.id
+            for row in sorted(
+                rows, key=lambda r: (r.validation_date, r.id.hex), reverse=True
+            )
+        ]
+
+        assert walk(db, limit=4) == expected
+
+    def test_last_page_has_no_cursor(self, db, repository):
+        add_predictions(db, 4)
+
+        page = get_page(db, limit=4)
+
+        assert len(page.items) == 4
+        assert page.next_cursor is None
+
+    def test_user_filter(self, db, repository):
+        mine = add_predictions(db, 7, user_id=1)
+        add_predictions(db, 5, user_id=2)
+
+        assert sorted(walk(db, user_id=1)) == sorted(row.id for row in mine)
+
+    def test_date_filters(self, db, repository):
+        add_predictions(db, 3, day=0)
+        second_day = add_predictions(db, 3, day=1)
+        add_predictions(db, 3, day=2)
+
+        # date_from inclus, date_to exclu
+        ids = walk(
+            db,
+            date_from=START + timedelta(days=1),
+            date_to=START + timedelta(days=2),
+        )
+
+        assert sorted(ids) == sorted(row.id for row in second_day)
+
+
+class TestCount:
+    """Total exact, en cache et total_is_exact."""
+
+    def test_cached_total_is_not_exact(self, db, repository):
+        add_predictions(db, 3)
+
+        assert repository.count(db) == (3, True)
+        add_predictions(db, 2)
+        # Total en cache: la ligne ajoutée n'est pas encore comptée
+        assert repository.count(db) == (3, False)
+        assert repository.count(db, exact=True) == (5, True)
+        assert repository.count(db) == (5, False)
+
+    def test_cache_is_per_filter(self, db, repository):
+        add_predictions(db, 3, user_id=1)
+        add_predictions(db, 2, user_id=2)
+
+        assert repository.count(db, user_id=1) == (3, True)
+        assert repository.count(db, user_id=2) == (2, True)
+        assert repository.count(db, user_id=1) == (3, False)
+
+    def test_no_cache(self, db):
+        repository = PgPredictionsRepository(count_cache_seconds=0)
+        add_predictions(db, 3)
+
+        assert repository.count(db) == (3, True)
+        assert repository.count(db) == (3, True)
+
+    def test_total_is_exact_in_response(self, db, repository):
+        add_predictions(db, 3)
+
+        first = get_page(db)
+        add_predictions(db, 1)
+        cached = get_page(db)
+        exact = get_page(db, exact=True)
+
+        assert (first.total, first.total_is_exact) == (3, True)
+        assert (cached.total, cached.total_is_exact) == (3, False)
+        assert (exact.total, exact.total_is_exact) == (4, True)
@@ -0,0 +1,86 @@
+"""Tests de l'analyse de sensibilité (grille développée en une matrice)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.features import PredictionFeatures, SensitivityRequest
+from app.services.numpy_engine import NumpyTreePredictionEngine
+from app.services.sensitivity import sensitivity_matrix
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+
+BASE = PredictionFeatures(bmi=25.0, pulse=72)
+BMI_GRID = [18.0, 25.0, 32.0, 40.0]
+CREATININE_GRID = [0.5, 1.0, 2.0]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = NumpyTreePredictionEngine()
+    engine.load_model(str(MODELS_DIR / "model.ubj"))
+    engine.load_feature_means(str(MODELS_DIR / "feature_means.json"))
+    return engine
+
+
+def _surface(engine, names, grids):
+    order = engine.get_feature_order()
+    base_matrix, _ = engine.imputation_service.impute_array(
+        engine.features_matrix([BASE]), order
+    )
+    matrix = sensitivity_matrix(
+        base_matrix[0], [order.index(name) for name in names], grids
+    )
+    return engine.predict_array(matrix).reshape([len(grid) for grid in grids])
+
+
+class TestSensitivityMatrix:
+    """Une seule évaluation de la grille égale un appel par point."""
+
+    def test_curve_matches_single_predictions(self, engine):
+        curve = _surface(engine, ["bmi"], [BMI_GRID])
+
+        expected = [
+            engine.predict_features(BASE.model_copy(update={"bmi": value}))
+            for value in BMI_GRID
+        ]
+        np.testing.assert_allclose(curve, expected, rtol=1e-6)
+
+    def test_surface_matches_single_predictions(self, engine):
+        surface = _surface(
+            engine, ["bmi", "creatinine"], [BMI_GRID, CREATININE_GRID]
+        )
+
+        assert surface.shape == (len(BMI_GRID), len(CREATININE_GRID))
+        for i, bmi in enumerate(BMI_GRID):
+            for j, creatinine in enumerate(CREATININE_GRID):
+                expected = engine.predict_features(
+                    BASE.model_copy(update={"bmi": bmi, "creatinine": creatinine})
+                )
+                assert surface[i, j] == pytest.approx(expected, rel=1e-6)
+
+
+class TestSensitivityRequest:
+    """Les valeurs de grille sont validées comme une requête /predict."""
+
+    @pytest.mark.parametrize(
+        "axes",
+        [
+            [{"feature": "unknown", "values": [1.0]}],
+            [{"feature": "bmi", "values": [-1.0]}],
+            [{"feature": "gender", "values": [2.0]}],
+            [{"feature": "bmi", "values": [20.0]}, {"feature": "bmi", "values": [30.0]}],
+        ],
+    )
+    def test_invalid_axes_rejected(self, axes):
+        with pytest.raises(ValidationError):
+            SensitivityRequest(features=BASE, axes=axes)
+
+    def test_values_normalized(self):
+        request = SensitivityRequest(
+            features=BASE, axes=[{"feature": "pulse", "values": [60.0, 90.0]}]
+        )
+
+        assert request.axes[0].values == [60, 90]
@@ -0,0 +1,33 @@
+"""Tests du nombre de workers lancés par app.server."""
+
+import pytest
+
+from app import server
+
+VALKEY = ("valkey", "valkey")
+
+
+@pytest.fixture(autouse=True)
+def four_cpus(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 4)
+
+
+class TestWorkerCount:
+    """Backends partagés requis pour plusieurs workers."""
+
+    def test_valkey_backends_use_available_cpus(self):
+        assert server.worker_count(0, VALKEY) == 4
+
+    def test_valkey_backends_use_requested_count(self):
+        assert server.worker_count(2, VALKEY) == 2
+
+    @pytest.mark.parametrize(
+        "backends", [("memory", "valkey"), ("valkey", "memory"), ("memory", "memory")]
+    )
+    def test_memory_backend_defaults_to_one_worker(self, backends):
+        assert server.worker_count(0, backends) == 1
+        assert server.worker_count(1, backends) == 1
+
+    def test_memory_backend_refuses_several_workers(self):
+        with pytest.raises(SystemExit):
+            server.worker_count(2, ("memory", "valkey"))
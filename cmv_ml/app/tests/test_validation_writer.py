@@ -0,0 +1,251 @@
+"""Tests de l'écriture groupée des validations et de l'endpoint /validate."""
+
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.repositories.async_predictions_crud import AsyncPgPredictionsRepository
+from app.routers import predictions
+from app.services.prediction_cache import InMemoryPredictionCache
+from app.services.validation_writer import ValidationWriter
+from app.sql.models import ValidatedPrediction
+from app.utils.database import Base
+
+
+async def create_session_factory():
+    """Base SQLite en mémoire, partagée par toutes les sessions."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def make_row(prediction_id=None) -> dict:
+    return {
+        "id": prediction_id or uuid4(),
+        "predicted_value": 4.5,
+        "user_id": 1,
+        "validation_date": datetime.now(timezone.utc),
+    }
+
+
+class FailingRepository:
+    """Repository dont l'écriture échoue toujours."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def insert_many(self, session, rows):
+        self.calls += 1
+        raise RuntimeError("database unavailable")
+
+
+class SlowRepository(AsyncPgPredictionsRepository):
+    """Repository dont l'écriture prend 50 ms."""
+
+    async def insert_many(self, session, rows):
+        await asyncio.sleep(0.05)
+        return await super().insert_many(session, rows)
+
+
+class TestInsertMany:
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING id sur SQLite."""
+
+    def test_returns_only_new_ids(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            repository = AsyncPgPredictionsRepository()
+            first, second = make_row(), make_row()
+            async with session_factory() as session:
+                inserted = await repository.insert_many(session, [first])
+            async with session_factory() as session:
+                again = await repository.insert_many(session, [first, second])
+                existing = await repository.existing_ids(
+                    session, [first["id"], second["id"], uuid4()]
+                )
+            await engine.dispose()
+            return first["id"], second["id"], inserted, again, existing
+
+        first_id, second_id, inserted, again, existing = asyncio.run(scenario())
+        assert inserted == {first_id}
+        assert again == {second_id}
+        assert existing == {first_id, second_id}
+
+
+class TestValidationWriter:
+    """Lots, dé-duplication, propagation des erreurs et vidage à l'arrêt."""
+
+    def test_single_validation_is_inserted(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            writer = ValidationWriter(session_factory, AsyncPgPredictionsRepository())
+            await writer.start()
+            row = make_row()
+            result = await writer.submit(row)
+            await writer.stop()
+            async with session_factory() as session:
+                stored = await session.get(ValidatedPrediction, row["id"])
+            await engine.dispose()
+            return result, stored
+
+        result, stored = asyncio.run(scenario())
+        assert result is True
+        assert stored is not None
+        assert stored.predicted_value == 4.5
+
+    def test_duplicate_in_same_batch(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            writer = ValidationWriter(
+                session_factory, AsyncPgPredictionsRepository(), max_wait_ms=50
+            )
+            await writer.start()
+            row = make_row()
+            results = await asyncio.gather(
+                writer.submit(row), writer.submit(dict(row))
+            )
+            stats = writer.stats()
+            await writer.stop()
+            await engine.dispose()
+            return results, stats
+
+        results, stats = asyncio.run(scenario())
+        # Première occurrence insérée, la suivante est un doublon
+        assert results == [True, False]
+        assert stats["duplicates"] == 1
+        assert stats["flushes"] == 1
+
+    def test_already_validated(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            writer = ValidationWriter(session_factory, AsyncPgPredictionsRepository())
+            row = make_row()
+            first = await writer.submit(row)
+            second = await writer.submit(row)
+            await engine.dispose()
+            return first, second
+
+        assert asyncio.run(scenario()) == (True, False)
+
+    def test_error_reaches_every_waiter(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            repository = FailingRepository()
+            writer = ValidationWriter(session_factory, repository, max_wait_ms=50)
+            await writer.start()
+            results = await asyncio.gather(
+                *(writer.submit(make_row()) for _ in range(3)),
+                return_exceptions=True,
+            )
+            await writer.stop()
+            await engine.dispose()
+            return results, repository.calls, writer.errors
+
+        results, calls, errors = asyncio.run(scenario())
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls == 1
+        assert errors == 1
+
+    def test_stop_writes_queued_rows(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            repository = AsyncPgPredictionsRepository()
+            writer = ValidationWriter(session_factory, repository, max_wait_ms=1000)
+            await writer.start()
+            rows = [make_row() for _ in range(3)]
+            pending = asyncio.gather(*(writer.submit(row) for row in rows))
+            # Lot collecté, en attente d'autres validations au moment de l'arrêt
+            await asyncio.sleep(0.05)
+            await writer.stop()
+            results = await asyncio.wait_for(pending, 1)
+            async with session_factory() as session:
+                existing = await repository.existing_ids(
+                    session, [row["id"] for row in rows]
+                )
+            await engine.dispose()
+            return results, len(existing)
+
+        assert asyncio.run(scenario()) == ([True, True, True], 3)
+
+    def test_stop_waits_for_running_write(self):
+        async def scenario():
+            engine, session_factory = await create_session_factory()
+            repository = SlowRepository()
+            writer = ValidationWriter(session_factory, repository, max_wait_ms=0)
+            await writer.start()
+            pending = asyncio.ensure_future(writer.submit(make_row()))
+            # Arrêt pendant l'INSERT: il doit aller à son terme
+            await asyncio.sleep(0.02)
+            await writer.stop()
+            result = await asyncio.wait_for(pending, 1)
+            await engine.dispose()
+            return result
+
+        assert asyncio.run(scenario()) is True
+
+
+class TestValidateEndpoint:
+    """Distinction 404 / 409 de POST /predictions/{id}/validate."""
+
+    @pytest.fixture
+    def validate(self, monkeypatch):
+        """Exécute l'endpoint avec un cache et une base de test."""
+
+        def run(cache, prediction_id, validate_twice=False):
+            async def scenario():
+                engine, session_factory = await create_session_factory()
+                writer = ValidationWriter(
+                    session_factory, AsyncPgPredictionsRepository()
+                )
+                monkeypatch.setattr(predictions, "prediction_cache", cache)
+                monkeypatch.setattr(predictions, "AsyncSessionLocal", session_factory)
+                monkeypatch.setattr(predictions, "validation_writer", writer)
+                outcomes = []
+                for _ in range(2 if validate_twice else 1):
+                    try:
+                        outcomes.append(
+                            await predictions.validate_prediction(
+                                prediction_id, current_user={"id_user": 7}
+                            )
+                        )
+                    except HTTPException as e:
+                        outcomes.append(e.status_code)
+                await engine.dispose()
+                return outcomes
+
+            return asyncio.run(scenario())
+
+        return run
+
+    def test_cached_prediction_is_validated(self, validate):
+        cache = InMemoryPredictionCache()
+        prediction_id = uuid4()
+        asyncio.run(cache.store(prediction_id, 3.2))
+
+        (response,) = validate(cache, prediction_id)
+        assert response["prediction_id"] == str(prediction_id)
+        assert response["predicted_value"] == 3.2
+        assert len(cache) == 0
+
+    def test_validated_twice_is_conflict(self, validate):
+        cache = InMemoryPredictionCache()
+        prediction_id = uuid4()
+        asyncio.run(cache.store(prediction_id, 3.2))
+
+        first, second = validate(cache, prediction_id, validate_twice=True)
+        assert first["predicted_value"] == 3.2
+        assert second == 409
+
+    def test_expired_prediction_is_not_found(self, validate):
+        # TTL nul: l'entrée a expiré dès sa lecture
+        cache = InMemoryPredictionCache(ttl_minutes=0)
+        prediction_id = uuid4()
+        asyncio.run(cache.store(prediction_id, 3.2))
+
+        assert validate(cache, prediction_id) == [404]
@@ -36,7 +36,70 @@ class MLSettings(BaseSettings):
 
     # Modèle ML
     MODEL_PATH: str = "./models/model.ubj"
+    # Registre versionné (un sous-répertoire par version), MODEL_PATH à défaut
+    MODEL_REGISTRY_DIR: str = "./models/registry"
+    # Surveillance du registre en secondes (0 = rechargement manuel uniquement)
+    MODEL_REGISTRY_POLL_SECONDS: float = 30.0
+    # Modèles par établissement (facilities/<lettre>/ à côté du modèle),
+    # taille cumulée maximale en mémoire (0 = modèle global uniquement)
+    FACILITY_POOL_MEMORY_MB: float = 512.0
+    # Rôle (claim "role" du jeton interne) autorisé sur les endpoints /admin
+    ADMIN_ROLE: str = "it"
     SHAP_ENABLED: bool = False
+    # Explications: native (pred_contribs), approx (approx_contribs), shap (TreeExplainer)
+    SHAP_MODE: Literal["native", "approx", "shap"] = "native"
+    # Backend d'inférence: xgboost (Booster), numpy (arbres compilés) ou onnx
+    # (onnxruntime CPU); numpy et onnx n'importent pas xgboost
+    PREDICTION_BACKEND: Literal["xgboost", "numpy", "onnx"] = "xgboost"
+
+    # Serveur de production (python -m app.server), 0 worker = selon les CPU
+    ML_HOST: str = "0.0.0.0"
+    ML_PORT: int = 8000
+    ML_WORKERS: int = 0
+
+    # Prédiction par lot — nombre maximal de patients par requête
+    PREDICT_BATCH_MAX_ITEMS: int = 1024
+    # Format binaire float32 (/predict-array) — nombre maximal de lignes
+    PREDICT_ARRAY_MAX_ROWS: int = 65_536
+    # Analyse de sensibilité (/sensitivity) — valeurs maximales par axe
+    SENSITIVITY_MAX_GRID_POINTS: int = 100
+
+    # Micro-batching des appels /predict concurrents
+    PREDICT_MICROBATCH_MAX_SIZE: int = 64
+    PREDICT_MICROBATCH_MAX_WAIT_MS: float = 2.0
+
+    # Pools de threads dédiés (inférence et SHAP), nthread XGBoost par pool
+    INFERENCE_POOL_SIZE: int = 4
+    INFERENCE_POOL_MAX_QUEUE: int = 256
+    INFERENCE_NTHREAD: int = 1
+    SHAP_POOL_SIZE: int = 1
+    SHAP_POOL_MAX_QUEUE: int = 16
+    SHAP_NTHREAD: int = 1
+
+    # Cache des prédictions en attente de validation
+    # memory: un seul worker; valkey: partagé entre workers
+    PREDICTION_CACHE_BACKEND: Literal["memory", "valkey"] = "memory"
+    PREDICTION_CACHE_TTL_MINUTES: int = 30
+    PREDICTION_CACHE_MAX_SIZE: int = 100_000
+
+    # Explications SHAP différées (GET /predictions/{id}/explain)
+    EXPLANATION_STORE_BACKEND: Literal["memory", "valkey"] = "memory"
+    EXPLANATION_TTL_MINUTES: int = 30
+    EXPLANATION_STORE_MAX_SIZE: int = 10_000
+
+    # Mémoïsation des prédictions par empreinte du vecteur (0 = désactivée)
+    PREDICTION_MEMO_MAX_SIZE: int = 10_000
+
+    # Durée de cache du total de GET /predictions (secondes, 0 = toujours exact)
+    PREDICTIONS_COUNT_CACHE_SECONDS: float = 60.0
+
+    # Écriture groupée des validations (INSERT multi-lignes)
+    VALIDATION_FLUSH_MAX_SIZE: int = 500
+    VALIDATION_FLUSH_MAX_WAIT_MS: float = 5.0
+
+    # Valkey
+    VALKEY_HOST: str = "redis"
+    VALKEY_PORT: int = 6379
 
     # HMAC — obligatoire, 64 caractères hexadécimaux
     HMAC: str
@@ -78,4 +141,36 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ENVIRONMENT = settings.ENVIRONMENT
 MODEL_PATH = settings.MODEL_PATH
+MODEL_REGISTRY_DIR = settings.MODEL_REGISTRY_DIR
+MODEL_REGISTRY_POLL_SECONDS = settings.MODEL_REGISTRY_POLL_SECONDS
+FACILITY_POOL_MEMORY_MB = settings.FACILITY_POOL_MEMORY_MB
+ADMIN_ROLE = settings.ADMIN_ROLE
 SHAP_ENABLED = settings.SHAP_ENABLED
+SHAP_MODE = settings.SHAP_MODE
+PREDICTION_BACKEND = settings.PREDICTION_BACKEND
+ML_HOST = settings.ML_HOST
+ML_PORT = settings.ML_PORT
+ML_WORKERS = settings.ML_WORKERS
+PREDICT_BATCH_MAX_ITEMS = settings.PREDICT_BATCH_MAX_ITEMS
+PREDICT_ARRAY_MAX_ROWS = settings.PREDICT_ARRAY_MAX_ROWS
+SENSITIVITY_MAX_GRID_POINTS = settings.SENSITIVITY_MAX_GRID_POINTS
+PREDICT_MICROBATCH_MAX_SIZE = settings.PREDICT_MICROBATCH_MAX_SIZE
+PREDICT_MICROBATCH_MAX_WAIT_MS = settings.PREDICT_MICROBATCH_MAX_WAIT_MS
+INFERENCE_POOL_SIZE = settings.INFERENCE_POOL_SIZE
+INFERENCE_POOL_MAX_QUEUE = settings.INFERENCE_POOL_MAX_QUEUE
+INFERENCE_NTHREAD = settings.INFERENCE_NTHREAD
+SHAP_POOL_SIZE = settings.SHAP_POOL_SIZE
+SHAP_POOL_MAX_QUEUE = settings.SHAP_POOL_MAX_QUEUE
+SHAP_NTHREAD = settings.SHAP_NTHREAD
+PREDICTION_CACHE_BACKEND = settings.PREDICTION_CACHE_BACKEND
+PREDICTION_CACHE_TTL_MINUTES = settings.PREDICTION_CACHE_TTL_MINUTES
+PREDICTION_CACHE_MAX_SIZE = settings.PREDICTION_CACHE_MAX_SIZE
+EXPLANATION_STORE_BACKEND = settings.EXPLANATION_STORE_BACKEND
+EXPLANATION_TTL_MINUTES = settings.EXPLANATION_TTL_MINUTES
+EXPLANATION_STORE_MAX_SIZE = settings.EXPLANATION_STORE_MAX_SIZE
+PREDICTION_MEMO_MAX_SIZE = settings.PREDICTION_MEMO_MAX_SIZE
+PREDICTIONS_COUNT_CACHE_SECONDS = settings.PREDICTIONS_COUNT_CACHE_SECONDS
+VALIDATION_FLUSH_MAX_SIZE = settings.VALIDATION_FLUSH_MAX_SIZE
+VALIDATION_FLUSH_MAX_WAIT_MS = settings.VALIDATION_FLUSH_MAX_WAIT_MS
+VALKEY_HOST = settings.VALKEY_HOST
+VALKEY_PORT = settings.VALKEY_PORT
@@ -1,5 +1,6 @@
 # Import des dépendances SQLAlchemy nécessaires
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 # Import des variables d'environnement
@@ -10,15 +11,26 @@ if ENVIRONMENT == "test":
     # En environnement de test, utilise une base SQLite en mémoire
     DATABASE_URL = "sqlite:///:memory:"
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
 else:
     # En production, vérifie que l'URL de la base est définie
     if DATABASE_URL is None:
         raise ValueError("DATABASE_URL must be set")
-    engine = create_engine(DATABASE_URL)
+    # ML_DATABASE_URL peut désigner l'un ou l'autre driver: psycopg2 pour
+    # le moteur synchrone (lectures, alembic), asyncpg pour les écritures
+    SYNC_DATABASE_URL = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    ASYNC_DATABASE_URL = SYNC_DATABASE_URL.replace(
+        "postgresql://", "postgresql+asyncpg://", 1
+    )
+    engine = create_engine(SYNC_DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
 
 # Création de la factory de sessions de base de données
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions asynchrones (écritures groupées des validations)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Création de la classe de base pour les modèles SQLAlchemy
 class Base(DeclarativeBase):
     pass
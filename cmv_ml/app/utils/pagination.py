@@ -0,0 +1,36 @@
+"""Curseurs opaques de la pagination par clé (keyset) de l'historique."""
+
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(validation_date: datetime, prediction_id: UUID) -> str:
+    """
+    Encode la position (validation_date, id) de la dernière ligne d'une page.
+
+    Args:
+        validation_date: Date de validation de la dernière ligne
+        prediction_id: Identifiant de la dernière ligne
+
+    Returns:
+        Jeton URL-safe à renvoyer tel quel pour obtenir la page suivante
+    """
+    raw = f"{validation_date.isoformat()}|{prediction_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        validation_date, prediction_id = raw.split("|")
+        return datetime.fromisoformat(validation_date), UUID(prediction_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
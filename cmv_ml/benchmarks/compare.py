@@ -0,0 +1,108 @@
+"""
+Compare two benchmark result files and fail on p95 regressions.
+
+Usage (from cmv_ml/):
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+
+Exit status is 1 when at least one case has its p95 latency above
+baseline * (1 + threshold) and slower by more than --min-delta-ms.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict[tuple, dict]:
+    """Résultats indexés par (nom, taille de lot, fraction manquante)."""
+    with open(path) as f:
+        report = json.load(f)
+    return {
+        (row["name"], row["batch_size"], row["missing_fraction"]): row
+        for row in report["results"]
+    }
+
+
+def compare(
+    baseline: dict[tuple, dict],
+    current: dict[tuple, dict],
+    threshold: float,
+    min_delta_ms: float,
+) -> tuple[list[dict], list[tuple]]:
+    """
+    Compare les p95 des cas communs.
+
+    Returns:
+        (comparaisons, cas présents dans un seul des deux fichiers)
+    """
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        base_p95 = baseline[key]["p95_ms"]
+        current_p95 = current[key]["p95_ms"]
+        change = (current_p95 - base_p95) / base_p95 if base_p95 > 0 else 0.0
+        rows.append(
+            {
+                "key": key,
+                "baseline_p95_ms": base_p95,
+                "current_p95_ms": current_p95,
+                "change": change,
+                "regression": change > threshold
+                and current_p95 - base_p95 > min_delta_ms,
+            }
+        )
+    unmatched = sorted(baseline.keys() ^ current.keys())
+    return rows, unmatched
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline", help="Résultats de référence (JSON)")
+    parser.add_argument("current", help="Résultats à comparer (JSON)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Hausse relative du p95 tolérée (défaut: 0.15 = +15%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.05,
+        help="Hausse absolue minimale pour signaler une régression (bruit)",
+    )
+    args = parser.parse_args(argv)
+
+    rows, unmatched = compare(
+        load_results(args.baseline),
+        load_results(args.current),
+        args.threshold,
+        args.min_delta_ms,
+    )
+
+    for row in rows:
+        name, batch_size, missing_fraction = row["key"]
+        marker = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{name:<24} batch={batch_size:<5} missing={missing_fraction:.1f} "
+            f"p95 {row['baseline_p95_ms']:9.3f}ms -> {row['current_p95_ms']:9.3f}ms "
+            f"({row['change']:+7.1%}) {marker}"
+        )
+    for name, batch_size, missing_fraction in unmatched:
+        print(
+            f"{name:<24} batch={batch_size:<5} missing={missing_fraction:.1f} "
+            "present in only one file"
+        )
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) regressed by more than "
+            f"{args.threshold:.0%} at p95",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""
+Inference benchmarks for the cmv_ml prediction path.
+
+Measures, in-process and for each batch size and fraction of missing
+continuous features:
+- impute: ImputationService.impute on every row of the batch;
+- impute_array: ImputationService.impute_array on the batch matrix;
+- predict: XGBoostPredictionEngine.predict (batch size 1) or predict_batch;
+- shap_native / shap_approx: pred_contribs explanations of the batch
+  (shap_treeexplainer too with --with-shap-package);
+- endpoint_predict: N concurrent POST /predictions/predict (micro-batched);
+- endpoint_predict_batch: one POST /predictions/predict-batch of N items;
+- endpoint_predict_array: one POST /predictions/predict-array of N float32 rows.
+
+Usage (from cmv_ml/, with the service configuration in the environment):
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.compare baseline.json bench.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Les explicateurs refusent de calculer si SHAP est désactivé
+os.environ.setdefault("SHAP_ENABLED", "true")
+
+from benchmarks.synthetic import generate_features  # noqa: E402
+
+DEFAULT_BATCH_SIZES = [1, 8, 64, 256, 1024]
+DEFAULT_MISSING_FRACTIONS = [0.0, 0.3, 0.7]
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Percentile par interpolation linéaire d'une liste triée."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def summarize(
+    name: str, batch_size: int, missing_fraction: float, samples_ms: list[float]
+) -> dict:
+    """Statistiques de latence d'un cas de benchmark."""
+    ordered = sorted(samples_ms)
+    mean = statistics.fmean(ordered)
+    return {
+        "name": name,
+        "batch_size": batch_size,
+        "missing_fraction": missing_fraction,
+        "iterations": len(ordered),
+        "mean_ms": mean,
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "rows_per_s": batch_size / (mean / 1000) if mean > 0 else 0.0,
+    }
+
+
+def measure(fn, iterations: int, warmup: int, setup=None) -> list[float]:
+    """Durées (ms) de fn() sur plusieurs itérations, après échauffement."""
+    samples = []
+    for i in range(warmup + iterations):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+async def measure_async(fn, iterations: int, warmup: int, setup=None) -> list[float]:
+    """Durées (ms) de await fn() sur plusieurs itérations, après échauffement."""
+    samples = []
+    for i in range(warmup + iterations):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        await fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def bench_engine(bundle, features, args) -> list[dict]:
+    """Imputation, prédiction et explications pour un lot de features."""
+    from app.services.shap_explainer import (
+        NativeContribsExplainer,
+        XGBoostShapExplainer,
+    )
+
+    engine = bundle.engine
+    imputation = engine.imputation_service
+    batch_size = len(features)
+    missing_fraction = features.missing_fraction
+    raw = [item.model_dump() for item in features]
+    clean = [imputation.impute(item)[0] for item in raw]
+    feature_order = engine.get_feature_order()
+    raw_matrix = engine.features_matrix(features)
+    results = []
+
+    def impute():
+        for item in raw:
+            imputation.impute(item)
+
+    results.append(
+        summarize(
+            "impute",
+            batch_size,
+            missing_fraction,
+            measure(impute, args.iterations, args.warmup),
+        )
+    )
+    results.append(
+        summarize(
+            "impute_array",
+            batch_size,
+            missing_fraction,
+            measure(
+                lambda: imputation.impute_array(raw_matrix, feature_order),
+                args.iterations,
+                args.warmup,
+            ),
+        )
+    )
+
+    if batch_size == 1:
+        predict = lambda: engine.predict(clean[0])  # noqa: E731
+    else:
+        predict = lambda: engine.predict_batch(clean)  # noqa: E731
+    results.append(
+        summarize(
+            "predict",
+            batch_size,
+            missing_fraction,
+            measure(predict, args.iterations, args.warmup),
+        )
+    )
+
+    # Explications: lues sur le Booster, absent du backend numpy
+    model = getattr(engine, "_model", None)
+    if not hasattr(model, "predict") or not hasattr(model, "get_score"):
+        return results
+
+    explainers = {
+        "shap_native": NativeContribsExplainer(model, feature_order),
+        "shap_approx": NativeContribsExplainer(model, feature_order, approximate=True),
+    }
+    if args.with_shap_package:
+        explainers["shap_treeexplainer"] = XGBoostShapExplainer(model, feature_order)
+
+    for name, explainer in explainers.items():
+        results.append(
+            summarize(
+                name,
+                batch_size,
+                missing_fraction,
+                measure(
+                    lambda: explainer.explain_batch(clean),
+                    args.iterations,
+                    args.warmup,
+                ),
+            )
+        )
+    return results
+
+
+async def bench_endpoint(client, headers, features, args) -> list[dict]:
+    """Endpoints /predict (requêtes concurrentes), /predict-batch et /predict-array."""
+    import numpy as np
+
+    from app.routers.predictions import ARRAY_DTYPE, ARRAY_MEDIA_TYPE, prediction_memo
+    from app.services.model_registry import model_registry
+
+    batch_size = len(features)
+    missing_fraction = features.missing_fraction
+    bodies = [item.model_dump() for item in features]
+    feature_order = model_registry.active.engine.get_feature_order()
+    array_body = np.array(
+        [
+            [np.nan if body[name] is None else body[name] for name in feature_order]
+            for body in bodies
+        ],
+        dtype=ARRAY_DTYPE,
+    ).tobytes()
+    array_headers = {**headers, "Content-Type": ARRAY_MEDIA_TYPE}
+
+    async def predict_concurrently():
+        responses = await asyncio.gather(
+            *(
+                client.post("/predictions/predict", json=body, headers=headers)
+                for body in bodies
+            )
+        )
+        for response in responses:
+            response.raise_for_status()
+
+    async def predict_batch():
+        response = await client.post(
+            "/predictions/predict-batch", json={"items": bodies}, headers=headers
+        )
+        response.raise_for_status()
+
+    async def predict_array():
+        response = await client.post(
+            "/predictions/predict-array", content=array_body, headers=array_headers
+        )
+        response.raise_for_status()
+
+    return [
+        summarize(
+            "endpoint_predict",
+            batch_size,
+            missing_fraction,
+            # Vider la mémoïsation: chaque itération calcule ses prédictions
+            await measure_async(
+                predict_concurrently,
+                args.iterations,
+                args.warmup,
+                setup=prediction_memo.clear,
+            ),
+        ),
+        summarize(
+            "endpoint_predict_batch",
+            batch_size,
+            missing_fraction,
+            await measure_async(predict_batch, args.iterations, args.warmup),
+        ),
+        summarize(
+            "endpoint_predict_array",
+            batch_size,
+            missing_fraction,
+            await measure_async(predict_array, args.iterations, args.warmup),
+        ),
+    ]
+
+
+class FeatureBatch(list):
+    """Lot de features synthétiques et sa fraction de valeurs manquantes."""
+
+    missing_fraction: float = 0.0
+
+
+def build_batches(bundle, args) -> list[FeatureBatch]:
+    """Génère un lot de features par couple (taille, fraction manquante)."""
+    batches = []
+    for missing_fraction in args.missing_fractions:
+        for batch_size in args.batch_sizes:
+            batch = FeatureBatch(
+                generate_features(
+                    batch_size,
+                    missing_fraction,
+                    bundle.engine.feature_means,
+                    seed=batch_size,
+                )
+            )
+            batch.missing_fraction = missing_fraction
+            batches.append(batch)
+    return batches
+
+
+async def run_endpoints(batches, args) -> list[dict]:
+    """Démarre l'application en process et mesure les endpoints."""
+    import httpx
+    from fastapi import FastAPI
+    from jose import jwt
+
+    from app.routers.predictions import prediction_batcher
+    from app.routers.predictions import router as predictions_router
+    from app.utils.config import ALGORITHM, SECRET_KEY
+
+    # Application minimale: le router de prédiction, sans la base de données
+    app = FastAPI()
+    app.include_router(predictions_router)
+    token = jwt.encode({"user_id": 0, "id_user": 0}, SECRET_KEY, algorithm=ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = []
+    await prediction_batcher.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for batch in batches:
+                results.extend(await bench_endpoint(client, headers, batch, args))
+    finally:
+        await prediction_batcher.stop()
+    return results
+
+
+def collect_metadata(bundle, args) -> dict:
+    """Contexte d'exécution, pour ne comparer que des résultats comparables."""
+    import numpy as np
+
+    from app.utils.config import PREDICTION_BACKEND, SHAP_MODE
+
+    try:
+        import xgboost
+
+        xgboost_version = xgboost.__version__
+    except ImportError:
+        xgboost_version = None
+
+    try:
+        import onnxruntime
+
+        onnxruntime_version = onnxruntime.__version__
+    except ImportError:
+        onnxruntime_version = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "model_version": bundle.version,
+        "prediction_backend": PREDICTION_BACKEND,
+        "shap_mode": SHAP_MODE,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "xgboost": xgboost_version,
+        "onnxruntime": onnxruntime_version,
+        "cpu_count": os.cpu_count(),
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="bench.json", help="Fichier JSON de sortie")
+    parser.add_argument(
+        "--batch-sizes",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=DEFAULT_BATCH_SIZES,
+        help="Tailles de lot, séparées par des virgules (défaut: 1,8,64,256,1024)",
+    )
+    parser.add_argument(
+        "--missing-fractions",
+        type=lambda value: [float(v) for v in value.split(",")],
+        default=DEFAULT_MISSING_FRACTIONS,
+        help="Fractions de features continues manquantes (défaut: 0,0.3,0.7)",
+    )
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--skip-endpoint", action="store_true", help="Ne pas mesurer les endpoints"
+    )
+    parser.add_argument(
+        "--with-shap-package",
+        action="store_true",
+        help="Mesurer aussi shap.TreeExplainer (package shap requis)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    from app.services.model_registry import model_registry
+
+    model_registry.load_initial()
+    bundle = model_registry.active
+    batches = build_batches(bundle, args)
+
+    results = []
+    for batch in batches:
+        results.extend(bench_engine(bundle, batch, args))
+        print(
+            f"engine   batch={len(batch):<5} missing={batch.missing_fraction:.1f} done",
+            file=sys.stderr,
+        )
+    if not args.skip_endpoint:
+        results.extend(asyncio.run(run_endpoints(batches, args)))
+        print("endpoints done", file=sys.stderr)
+
+    report = {"metadata": collect_metadata(bundle, args), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for row in results:
+        print(
+            f"{row['name']:<24} batch={row['batch_size']:<5} "
+            f"missing={row['missing_fraction']:.1f} "
+            f"p50={row['p50_ms']:9.3f}ms p95={row['p95_ms']:9.3f}ms "
+            f"rows/s={row['rows_per_s']:12.0f}"
+        )
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
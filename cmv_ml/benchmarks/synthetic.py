@@ -0,0 +1,71 @@
+"""Génération de features synthétiques pour les benchmarks.
+
+Les valeurs continues sont tirées autour des moyennes d'entraînement; une
+fraction configurable d'entre elles est laissée manquante (None) pour
+exercer l'imputation.
+"""
+
+import random
+
+from app.schemas.features import PredictionFeatures
+from app.services.imputation_service import ImputationService
+
+BINARY_FEATURES = [
+    "gender",
+    "dialysisrenalendstage",
+    "asthma",
+    "irondef",
+    "pneum",
+    "substancedependence",
+    "psychologicaldisordermajor",
+    "depress",
+    "psychother",
+    "fibrosisandother",
+    "malnutrition",
+    "hemo",
+]
+
+# Champs continus typés int dans PredictionFeatures
+INTEGER_FEATURES = {"pulse", "secondarydiagnosisnonicd9"}
+
+FACILITIES = ["facid_B", "facid_C", "facid_D", "facid_E"]
+
+
+def generate_features(
+    count: int,
+    missing_fraction: float,
+    feature_means: dict[str, float],
+    seed: int = 0,
+) -> list[PredictionFeatures]:
+    """
+    Génère des features patient valides.
+
+    Args:
+        count: Nombre de patients
+        missing_fraction: Probabilité qu'une feature continue soit manquante
+        feature_means: Moyennes d'entraînement des features continues
+        seed: Graine du générateur (résultats reproductibles)
+
+    Returns:
+        Liste de PredictionFeatures validées
+    """
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        values: dict = {name: int(rng.random() < 0.15) for name in BINARY_FEATURES}
+        values["rcount"] = rng.randint(0, 5)
+
+        # Établissement A = aucune colonne facid à 1
+        facility = rng.randrange(len(FACILITIES) + 1)
+        for i, name in enumerate(FACILITIES):
+            values[name] = int(facility == i + 1)
+
+        for name in ImputationService.CONTINUOUS_FEATURES:
+            if rng.random() < missing_fraction:
+                values[name] = None
+                continue
+            value = feature_means[name] * rng.uniform(0.7, 1.3)
+            values[name] = max(1, round(value)) if name in INTEGER_FEATURES else value
+
+        items.append(PredictionFeatures(**values))
+    return items
@@ -0,0 +1,53 @@
+"""recherche plein texte patients
+
+Revision ID: 3f2b8c91d4a7
+Revises: e5609137fac2
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b8c91d4a7'
+down_revision: Union[str, None] = 'e5609137fac2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nom, prénom et ville, pondérés pour le classement par pertinence
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(nom, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(prenom, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(ville, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Colonne générée: la table est réécrite (verrou exclusif le temps de
+    # l'opération), le vecteur est ensuite maintenu par PostgreSQL
+    op.execute(
+        "ALTER TABLE patient ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_patient_search_vector',
+            'patient',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_patient_search_vector',
+            table_name='patient',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("ALTER TABLE patient DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,76 @@
+"""cle autocompletion patients
+
+Revision ID: 9d1e7a6b2c04
+Revises: 3f2b8c91d4a7
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.normalization import normalize_search_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d1e7a6b2c04'
+down_revision: Union[str, None] = '3f2b8c91d4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column('patient', sa.Column('search_key', sa.String(), nullable=True))
+
+    # Clés des patients existants, calculées par l'application (la base n'a
+    # pas forcément l'extension unaccent), par lots dans l'ordre des id
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id_patient, nom, prenom FROM patient "
+                "WHERE id_patient > :last_id ORDER BY id_patient LIMIT :limit"
+            ),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text(
+                "UPDATE patient SET search_key = v.search_key "
+                "FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS text[])) "
+                "AS v(id_patient, search_key) "
+                "WHERE patient.id_patient = v.id_patient"
+            ),
+            {
+                'ids': [row.id_patient for row in rows],
+                'keys': [normalize_search_key(row.nom, row.prenom) for row in rows],
+            },
+        )
+        last_id = rows[-1].id_patient
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_patient_search_key_id_patient',
+            'patient',
+            ['search_key', 'id_patient'],
+            postgresql_ops={'search_key': 'text_pattern_ops'},
+            postgresql_include=['nom', 'prenom'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_patient_search_key_id_patient',
+            table_name='patient',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('patient', 'search_key')
@@ -0,0 +1,54 @@
+"""index derniere admission et documents
+
+Revision ID: b4e8f2a19c63
+Revises: 9d1e7a6b2c04
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8f2a19c63'
+down_revision: Union[str, None] = '9d1e7a6b2c04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Dernière admission d'un patient: premier élément de l'index
+        op.create_index(
+            'ix_admission_patient_id_created_at',
+            'admission',
+            ['patient_id', sa.text('created_at DESC'), sa.text('id_admission DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Documents d'un patient, joints à la même requête
+        op.create_index(
+            'ix_document_patient_id',
+            'document',
+            ['patient_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_document_patient_id',
+            table_name='document',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_admission_patient_id_created_at',
+            table_name='admission',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
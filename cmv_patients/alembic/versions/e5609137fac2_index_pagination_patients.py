@@ -0,0 +1,51 @@
+"""index pagination patients
+
+Revision ID: e5609137fac2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5609137fac2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index composites (champ de tri, id) de la pagination par clé
+INDEXES = {
+    'ix_patient_nom_id_patient': ['nom', 'id_patient'],
+    'ix_patient_prenom_id_patient': ['prenom', 'id_patient'],
+    'ix_patient_date_de_naissance_id_patient': ['date_de_naissance', 'id_patient'],
+    'ix_patient_email_id_patient': [sa.text("coalesce(email, '')"), 'id_patient'],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: pas de verrou d'écriture sur la table patient pendant la
+    # construction, ce qui impose de sortir de la transaction de migration
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                'patient',
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name='patient',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
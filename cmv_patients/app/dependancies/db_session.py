@@ -2,21 +2,16 @@ from app.utils.database import SessionLocal
 
 
 # Dépendance pour obtenir une session de base de données
-def get_db():
+async def get_db():
     """
-    Crée et gère une session de base de données.
+    Crée et gère une session asynchrone de base de données.
 
     Yields:
-        SessionLocal: Une session de base de données active
+        AsyncSession: Une session de base de données active
 
     Note:
-        La session est automatiquement fermée après utilisation grâce au bloc finally
+        La session est automatiquement fermée (connexion rendue au pool)
+        à la sortie du bloc async with
     """
-    # Création d'une nouvelle session de base de données
-    db = SessionLocal()
-    try:
-        # Retourne la session pour utilisation
+    async with SessionLocal() as db:
         yield db
-    finally:
-        # Fermeture de la session une fois terminée
-        db.close()
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 # Import des gestionnaires d'exceptions FastAPI
 from fastapi.exception_handlers import (
     http_exception_handler,
@@ -19,16 +21,23 @@ from .utils.database import engine
 from .sql import models
 from app.utils.config import ENVIRONMENT
 
-
-# Les migrations sont gérées par alembic
-if ENVIRONMENT != "production":
-    models.Base.metadata.create_all(bind=engine)
-
 # Initialisation du logger
 logger = LoggerSetup()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Les migrations sont gérées par alembic
+    if ENVIRONMENT != "production":
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+    yield
+    # Fermeture des connexions du pool
+    await engine.dispose()
+
+
 # Création de l'application FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Inclusion des routes de l'API
 app.include_router(api.router)
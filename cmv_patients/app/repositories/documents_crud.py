@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.sql.models import Document, DocumentType
 
@@ -9,7 +10,7 @@ from app.sql.models import Document, DocumentType
 class DocumentsCrud(ABC):
     @abstractmethod
     async def create_document(
-        self, db: Session, file_name: str, type_document: DocumentType, patient_id: int
+        self, db: AsyncSession, file_name: str, type_document: DocumentType, patient_id: int
     ) -> dict:
         pass
 
@@ -18,22 +19,24 @@ class DocumentsCrud(ABC):
 class PgDocumentsRepository(DocumentsCrud):
     # Méthode pour créer un document
     async def create_document(
-        self, db: Session, file_name: str, type_document: DocumentType, patient_id: int
+        self, db: AsyncSession, file_name: str, type_document: DocumentType, patient_id: int
     ) -> Document:
         document = Document(
             nom_fichier=file_name, type_document=type_document, patient_id=patient_id
         )
         db.add(document)
-        db.commit()
-        db.refresh(document)
+        await db.commit()
+        await db.refresh(document)
         return {"message": "document_created"}
 
     # Méthode pour récupérer un document par son ID
-    async def get_document_by_id(self, db: Session, document_id: int) -> Document:
-        return db.query(Document).filter(Document.id_document == document_id).first()
+    async def get_document_by_id(self, db: AsyncSession, document_id: int) -> Document:
+        return await db.scalar(
+            select(Document).where(Document.id_document == document_id)
+        )
 
     # Méthode pour supprimer un document par son ID
-    async def delete_document_by_id(self, db: Session, document_id: int) -> Document:
-        db.query(Document).filter(Document.id_document == document_id).delete()
-        db.commit()
+    async def delete_document_by_id(self, db: AsyncSession, document_id: int) -> Document:
+        await db.execute(delete(Document).where(Document.id_document == document_id))
+        await db.commit()
         return {"success": True, "message": "document_deleted"}
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.sql.models import OutboxEntry, OutboxStatus
 
@@ -8,7 +9,7 @@ from app.sql.models import OutboxEntry, OutboxStatus
 class PgOutboxRepository:
     """Repository CRUD pour la table outbox des compensations échouées."""
 
-    async def create_entry(self, db: Session, entry: OutboxEntry) -> OutboxEntry:
+    async def create_entry(self, db: AsyncSession, entry: OutboxEntry) -> OutboxEntry:
         """
         Crée une nouvelle entrée dans la table outbox.
         Args:
@@ -18,12 +19,12 @@ class PgOutboxRepository:
             OutboxEntry: L'entrée créée avec son ID généré
         """
         db.add(entry)
-        db.flush()
-        db.refresh(entry)
+        await db.flush()
+        await db.refresh(entry)
         return entry
 
     async def get_pending_entries(
-        self, db: Session, max_retries: int
+        self, db: AsyncSession, max_retries: int
     ) -> list[OutboxEntry]:
         """
         Récupère les entrées outbox en attente de retry.
@@ -33,18 +34,17 @@ class PgOutboxRepository:
         Returns:
             list[OutboxEntry]: Entrées avec statut PENDING et retry_count < max_retries
         """
-        return (
-            db.query(OutboxEntry)
-            .filter(
+        result = await db.scalars(
+            select(OutboxEntry).where(
                 OutboxEntry.status == OutboxStatus.PENDING,
                 OutboxEntry.retry_count < max_retries,
             )
-            .all()
         )
+        return list(result)
 
     async def update_status(
         self,
-        db: Session,
+        db: AsyncSession,
         entry_id: int,
         status: str,
         increment_retries: bool = False,
@@ -57,7 +57,7 @@ class PgOutboxRepository:
             status: Nouveau statut (pending, completed, failed)
             increment_retries: Si True, incrémente le compteur de tentatives
         """
-        entry = db.query(OutboxEntry).filter(OutboxEntry.id == entry_id).first()
+        entry = await db.scalar(select(OutboxEntry).where(OutboxEntry.id == entry_id))
         if entry is None:
             return
 
@@ -67,4 +67,4 @@ class PgOutboxRepository:
         if increment_retries:
             entry.retry_count += 1
 
-        db.flush()
+        await db.flush()
@@ -1,10 +1,38 @@
+import re
 from typing import List
 
 from app.schemas.patients import CreatePatient, PatientsNames
-from app.sql.models import Admission, Patient
+from app.sql.models import PATIENT_SEARCH_VECTOR, Patient
 from fastapi import HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, cast, func, literal_column, or_, select, text
+from sqlalchemy.dialects.postgresql import TSQUERY, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.utils.config import COUNT_ESTIMATE_MIN_ROWS
+from app.utils.normalization import normalize_search_key
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    order_by_clauses,
+    sort_key,
+)
+
+# Tri des résultats de recherche par pertinence
+RANK_FIELD = "pertinence"
+
+
+def prefix_tsquery(search: str) -> str | None:
+    """
+    Requête tsquery d'une saisie: chaque mot doit débuter un mot indexé.
+
+    Les mots sont découpés comme le fait to_tsvector('simple', ...) (suites
+    de lettres et de chiffres, en minuscules): la requête peut être passée
+    telle quelle en tsquery, et la saisie ne peut pas y injecter d'opérateurs.
+    """
+    words = re.findall(r"[^\W_]+", search.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
 
 
 # Implémentation PostgreSQL du repository de patients
@@ -13,11 +41,13 @@ class PgPatientsRepository:
 
     async def read_all_patients(
         self,
-        db: Session,
+        db: AsyncSession,
         page: int,
         limit: int,
         field: str = "nom",
         order: str = "asc",
+        cursor: str | None = None,
+        exact_total: bool = False,
     ) -> dict:
         """
         Récupère tous les patients avec pagination et tri
@@ -27,18 +57,32 @@ class PgPatientsRepository:
             limit: Nombre d'éléments par page
             field: Champ de tri
             order: Ordre de tri (asc/desc)
+            cursor: Curseur de la page suivante (remplace page)
+            exact_total: Compte exact plutôt qu'estimé
         Returns:
             dict: Dictionnaire contenant les données et le total
         """
-        return self.paginate_and_order(db, Patient, page, limit, field, order)
+        return await self.paginate_and_order(
+            db,
+            Patient,
+            page,
+            limit,
+            field,
+            order,
+            cursor=cursor,
+            exact_total=exact_total,
+        )
 
     async def get_patients_names(
-        self, db: Session, ids: list[PatientsNames]
+        self, db: AsyncSession, ids: list[PatientsNames]
     ) -> list[Patient]:
         patients_ids = [patient.patient_id for patient in ids]
-        return db.query(Patient).filter(Patient.id_patient.in_(patients_ids)).all()
+        result = await db.scalars(
+            select(Patient).where(Patient.id_patient.in_(patients_ids))
+        )
+        return list(result)
 
-    async def create_patient(self, db: Session, patient: CreatePatient) -> Patient:
+    async def create_patient(self, db: AsyncSession, patient: CreatePatient) -> Patient:
         """
         Crée un nouveau patient dans la base de données
         Args:
@@ -52,15 +96,15 @@ class PgPatientsRepository:
         # Ajout à la session
         db.add(db_patient)
         # Validation des changements
-        db.commit()
+        await db.commit()
         # Rafraîchissement pour obtenir l'ID généré
-        db.refresh(db_patient)
+        await db.refresh(db_patient)
         print(
             f"DB_PATIENT : {db_patient.nom} {db_patient.prenom} {db_patient.id_patient}"
         )
         return db_patient
 
-    async def check_patient_exists(self, db: Session, patient: Patient) -> bool:
+    async def check_patient_exists(self, db: AsyncSession, patient: Patient) -> bool:
         """
         Vérifie si un patient existe déjà avec les mêmes informations
         Args:
@@ -70,17 +114,17 @@ class PgPatientsRepository:
             bool: True si le patient existe, False sinon
         """
         # Recherche d'un patient avec les mêmes nom, prénom et date de naissance
-        patient = (
-            db.query(Patient)
-            .filter(Patient.nom == patient.nom)
-            .filter(Patient.prenom == patient.prenom)
-            .filter(Patient.date_de_naissance == patient.date_de_naissance)
-            .first()
+        patient = await db.scalar(
+            select(Patient)
+            .where(Patient.nom == patient.nom)
+            .where(Patient.prenom == patient.prenom)
+            .where(Patient.date_de_naissance == patient.date_de_naissance)
+            .limit(1)
         )
         return patient is not None
 
     async def update_patient(
-        self, db: Session, patient_id: int, data: Patient
+        self, db: AsyncSession, patient_id: int, data: Patient
     ) -> Patient:
         """
         Met à jour les données d'un patient
@@ -94,7 +138,9 @@ class PgPatientsRepository:
             HTTPException: Si le patient n'est pas trouvé
         """
         # Recherche du patient par son ID
-        patient = db.query(Patient).filter(Patient.id_patient == patient_id).first()
+        patient = await db.scalar(
+            select(Patient).where(Patient.id_patient == patient_id)
+        )
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="patient_not_found"
@@ -103,120 +149,265 @@ class PgPatientsRepository:
         for key, value in data.model_dump().items():
             setattr(patient, key, value)
         # Validation des changements
-        db.commit()
-        db.refresh(patient)
+        await db.commit()
+        await db.refresh(patient)
         return patient
 
     async def search_patients(
         self,
-        db: Session,
+        db: AsyncSession,
         search: str,
         page: int,
         limit: int,
         field: str = "nom",
         order: str = "asc",
+        cursor: str | None = None,
     ) -> dict:
         """
-        Recherche des patients selon des critères
+        Recherche des patients sur le nom, le prénom et la ville
+
+        Sous PostgreSQL, la recherche utilise l'index plein texte: chaque mot
+        saisi doit débuter un mot du nom, du prénom ou de la ville, et le tri
+        "pertinence" classe les résultats par ts_rank (nom > prénom > ville),
+        toujours du plus au moins pertinent. Les autres bases (tests) se
+        replient sur une recherche de sous-chaîne triée par nom. Une saisie
+        sans lettre ni chiffre (ex: "%%", "-") ne correspond à aucun patient.
         Args:
             db: Session de base de données
             search: Terme de recherche
             page: Numéro de la page
             limit: Nombre d'éléments par page
-            field: Champ de tri
+            field: Champ de tri, ou "pertinence"
             order: Ordre de tri
+            cursor: Curseur de la page suivante (remplace page)
         Returns:
             dict: Résultats de recherche paginés
         """
-        # Création du filtre de recherche sur le nom
-        filters = [Patient.nom.ilike(f"%{search}%")]
-        return self.paginate_and_order(db, Patient, page, limit, field, order, filters)
+        query_text = prefix_tsquery(search)
+        if query_text is None:
+            # Filtre tsquery vide sous PostgreSQL: tous les patients seraient lus
+            return {
+                "data": [],
+                "total": 0,
+                "total_estimated": False,
+                "next_cursor": None,
+            }
+
+        sort_column = None
+        if db.bind.dialect.name == "postgresql":
+            vector = literal_column(
+                f"{Patient.__tablename__}.{PATIENT_SEARCH_VECTOR}", TSVECTOR
+            )
+            # Paramètre de type tsquery: pas d'appel de fonction par
+            # ligne avec le plan générique d'une requête préparée
+            tsquery = cast(query_text, TSQUERY)
+            filters = [vector.op("@@")(tsquery)]
+            if field == RANK_FIELD:
+                sort_column = func.ts_rank(vector, tsquery, type_=Float)
+                order = "desc"
+        else:
+            pattern = f"%{search}%"
+            filters = [
+                or_(
+                    Patient.nom.ilike(pattern),
+                    Patient.prenom.ilike(pattern),
+                    Patient.ville.ilike(pattern),
+                )
+            ]
+        if field == RANK_FIELD and sort_column is None:
+            # Pas de classement possible: ordre alphabétique
+            field, order = "nom", "asc"
+        return await self.paginate_and_order(
+            db,
+            Patient,
+            page,
+            limit,
+            field,
+            order,
+            filters,
+            cursor=cursor,
+            sort_column=sort_column,
+        )
 
-    async def read_patient_by_id(self, db: Session, patient_id: int) -> Patient:
+    async def autocomplete_patients(
+        self, db: AsyncSession, q: str, limit: int
+    ) -> list:
+        """
+        Premiers patients dont le "nom prénom" normalisé commence par la saisie
+
+        La recherche est un intervalle [préfixe, préfixe suivant[ sur
+        search_key, lu dans l'ordre de l'index: une seule lecture d'index
+        par frappe, quel que soit le nombre de correspondances.
+        Args:
+            db: Session de base de données
+            q: Début du nom (puis du prénom) saisi
+            limit: Nombre maximum de résultats
+        Returns:
+            list: Lignes (id_patient, nom, prenom) triées par clé
+        """
+        prefix = normalize_search_key(q)
+        if not prefix:
+            return []
+        # Borne haute exclue: dernier caractère du préfixe incrémenté
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        query = select(Patient.id_patient, Patient.nom, Patient.prenom)
+        if db.bind.dialect.name == "postgresql":
+            # Opérateurs de text_pattern_ops, seuls à utiliser l'index
+            query = query.where(
+                Patient.search_key.op("~>=~")(prefix),
+                Patient.search_key.op("~<~")(upper),
+            ).order_by(
+                literal_column("patient.search_key USING ~<~"), Patient.id_patient
+            )
+        else:
+            query = query.where(
+                Patient.search_key >= prefix, Patient.search_key < upper
+            ).order_by(Patient.search_key, Patient.id_patient)
+        return list(await db.execute(query.limit(limit)))
+
+    async def read_patient_by_id(
+        self, db: AsyncSession, patient_id: int, with_admissions: bool = False
+    ) -> Patient:
         """
         Récupère un patient par son ID avec sa dernière admission
+
+        Le patient, sa dernière admission et ses documents sont lus en une
+        seule requête (jointures); pas de lazy loading sur une session
+        asynchrone.
         Args:
             db: Session de base de données
             patient_id: ID du patient
+            with_admissions: Charge aussi toutes les admissions (une requête de plus)
         Returns:
             Patient: Le patient trouvé avec sa dernière admission
         Raises:
             HTTPException: Si le patient n'est pas trouvé
         """
-        # Recherche du patient par son ID avec jointure sur les admissions
-        patient = db.query(Patient).filter(Patient.id_patient == patient_id).first()
+        query = (
+            select(Patient)
+            .where(Patient.id_patient == patient_id)
+            .options(
+                joinedload(Patient.latest_admission), joinedload(Patient.documents)
+            )
+            .execution_options(populate_existing=True)
+        )
+        if with_admissions:
+            query = query.options(selectinload(Patient.admissions))
+        # unique(): une ligne par document dans le résultat de la jointure
+        patient = (await db.scalars(query)).unique().first()
 
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="patient_not_found"
             )
 
-        # Récupération de la dernière admission
-        latest_admission = (
-            db.query(Admission)
-            .filter(Admission.patient_id == patient_id)
-            .order_by(Admission.created_at.desc())
-            .first()
-        )
-
-        # Ajout de la dernière admission au patient
-        patient.latest_admission = latest_admission
-
         print(f"PATIENT : {patient.nom} {patient.prenom}")
         return patient
 
-    def paginate_and_order(
-        self, db, model, page, limit, field, order, filters=None
+    async def paginate_and_order(
+        self,
+        db,
+        model,
+        page,
+        limit,
+        field,
+        order,
+        filters=None,
+        cursor: str | None = None,
+        exact_total: bool = False,
+        sort_column=None,
     ) -> dict:
         """
         Fonction utilitaire pour la pagination et le tri des résultats
+
+        Avec un curseur, la page est lue par clé (champ de tri, id) à partir
+        de la dernière ligne de la page précédente, en temps constant. Sans
+        curseur, la page est lue par OFFSET (accès direct à une page).
         Args:
             db: Session de base de données
             model: Modèle SQLAlchemy
-            page: Numéro de la page
+            page: Numéro de la page (ignoré si cursor est fourni)
             limit: Nombre d'éléments par page
             field: Champ de tri
             order: Ordre de tri
             filters: Filtres additionnels
+            cursor: Curseur renvoyé par la page précédente (next_cursor)
+            exact_total: Compte exact même sans filtre
+            sort_column: Expression de tri nommée field (colonne field par défaut)
         Returns:
-            dict: Résultats paginés et triés
+            dict: Résultats paginés et triés, total et curseur de la page suivante
         """
         # Validation des paramètres d'entrée
         limit = min(max(1, limit), 50)  # Limite entre 1 et 50
         page = max(1, page)  # Page minimum de 1
 
-        # Calcul de l'offset pour la pagination
-        offset = (page - 1) * limit
-
-        # Récupération du nombre total d'enregistrements
-        query = db.query(func.count(model.id_patient))
+        column = sort_column if sort_column is not None else getattr(model, field)
+        # La clé de tri est lue avec chaque ligne pour construire le curseur
+        query = select(model, sort_key(column))
         if filters:
-            query = query.filter(*filters)
-        total = query.scalar()
-
-        # Vérification que la page demandée existe
-        total_pages = (total + limit - 1) // limit
-        if page > total_pages:
-            page = 1
-            offset = 0
-
-        # Construction de la clause ORDER BY
-        order_by_model = getattr(model, field)
-        order_by_clause = (
-            order_by_model.desc() if order.lower() == "desc" else order_by_model.asc()
-        )
+            query = query.where(*filters)
+        query = query.order_by(*order_by_clauses(column, model.id_patient, order))
 
-        # Exécution de la requête paginée et triée
-        query = db.query(model)
-        if filters:
-            query = query.filter(*filters)
+        if cursor:
+            value, last_id = decode_cursor(cursor, field, order, column)
+            query = query.where(
+                keyset_condition(column, model.id_patient, order, value, last_id)
+            )
+        else:
+            query = query.offset((page - 1) * limit)
+
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, value = rows[-1]
+            next_cursor = encode_cursor(field, order, value, last.id_patient)
+
+        total, estimated = await self.count_patients(db, model, filters, exact_total)
 
-        query = query.order_by(order_by_clause).offset(offset).limit(limit)
-        result = query.all()
+        return {
+            "data": [row[0] for row in rows],
+            "total": total,
+            "total_estimated": estimated,
+            "next_cursor": next_cursor,
+        }
 
-        return {"data": result, "total": total}
+    async def count_patients(
+        self, db, model, filters=None, exact: bool = False
+    ) -> tuple[int, bool]:
+        """
+        Nombre de lignes correspondant aux filtres.
+
+        Sans filtre, le total d'une grande table est lu dans les statistiques
+        de PostgreSQL (pg_class.reltuples, mises à jour par ANALYZE et
+        l'autovacuum) plutôt que par un count(*) qui parcourt la table.
+        Args:
+            db: Session de base de données
+            model: Modèle SQLAlchemy
+            filters: Filtres additionnels
+            exact: Force le compte exact
+        Returns:
+            tuple: (total, True si le total est une estimation)
+        """
+        if not filters and not exact and db.bind.dialect.name == "postgresql":
+            estimate = await db.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:name)"
+                ),
+                {"name": model.__tablename__},
+            )
+            # Estimation absente (-1) ou peu fiable sur une petite table
+            if estimate is not None and estimate >= COUNT_ESTIMATE_MIN_ROWS:
+                return estimate, True
 
-    async def delete_patient(self, db: Session, patient_id: int):
+        query = select(func.count(model.id_patient))
+        if filters:
+            query = query.where(*filters)
+        return await db.scalar(query), False
+
+    async def delete_patient(self, db: AsyncSession, patient_id: int):
         """
         Supprime un patient de la base de données
         Args:
@@ -227,9 +418,16 @@ class PgPatientsRepository:
         Raises:
             HTTPException: Si le patient n'est pas trouvé
         """
-        query = db.query(Patient).filter(Patient.id_patient == patient_id).first()
+        # Les collections sont rechargées: l'unité de travail détache les
+        # documents et admissions restants sans lazy loading
+        query = await db.scalar(
+            select(Patient)
+            .where(Patient.id_patient == patient_id)
+            .options(selectinload(Patient.documents), selectinload(Patient.admissions))
+            .execution_options(populate_existing=True)
+        )
         if not query:
             raise HTTPException(status_code=404, detail="patient_not_found")
-        db.delete(query)
-        db.commit()
+        await db.delete(query)
+        await db.commit()
         return {"message": "patient_deleted"}
@@ -5,7 +5,7 @@ from typing import Annotated
 
 import httpx
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependancies.auth import check_authorization
 from app.dependancies.db_session import get_db
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 @router.post("/outbox/retry")
 async def retry_outbox_compensations(
     payload: Annotated[dict, Depends(check_authorization)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Rejoue les compensations pending de la table outbox.
 
@@ -3,7 +3,7 @@ from typing import Annotated
 from venv import logger
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependancies.auth import get_permissions
 from app.dependancies.db_session import get_db
@@ -26,7 +26,7 @@ async def get_admission_detail(
     request: Request,
     internal_payload: Annotated[InternalPayload, Depends(get_permissions)],
     admission_service=Depends(get_admissions_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Admission:
     return await admission_service.get_admission(db=db, admission_id=admission_id)
 
@@ -38,14 +38,14 @@ async def create_admission(
     internal_payload: Annotated[InternalPayload, Depends(get_permissions)],
     admission_service=Depends(get_admissions_service),
     patient_service=Depends(get_patients_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Crée une nouvelle admission pour un patient.
 
     Args:
         data (CreateAdmission): Les données de l'admission à créer
-        db (Session): La session de base de données
+        db (AsyncSession): La session de base de données
 
     Returns:
         dict: Les détails de l'admission créée
@@ -62,10 +62,8 @@ async def create_admission(
         admission = existing_patient.get("latest_admission")
         has_active_admission = admission and not admission.get("sorti_le")
     else:
-        has_active_admission = (
-            existing_patient.admissions
-            and existing_patient.admissions[0].sorti_le is None
-        )
+        admission = existing_patient.latest_admission
+        has_active_admission = admission and admission.sorti_le is None
     if has_active_admission:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="patient_already_admitted"
@@ -85,7 +83,7 @@ async def update_admission(
     data: Annotated[Admission, Body()],
     internal_payload: Annotated[InternalPayload, Depends(get_permissions)],
     admission_service=Depends(get_admissions_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Admission:
     return await admission_service.update_admission(
         db=db,
@@ -1,11 +1,12 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Body, Depends, Query, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependancies.auth import check_authorization, get_permissions
 from app.dependancies.db_session import get_db
 from app.schemas.patients import (
+    AutocompletePatientsParams,
     CreatePatient,
     DetailPatient,
     PatientsNames,
@@ -33,7 +34,7 @@ async def create_patient(
     request: Request,
     payload: Annotated[InternalPayload, Depends(check_authorization)],
     data: Annotated[CreatePatient, Body()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     patients_service=Depends(get_patients_service),
 ):
     """
@@ -41,7 +42,7 @@ async def create_patient(
 
     Args:
         data (Patient): Les données du patient à créer
-        db (Session): La session de base de données
+        db (AsyncSession): La session de base de données
 
     Returns:
         Patient: Les données du patient créé
@@ -93,6 +94,8 @@ async def read_patients(
         limit=params.limit,
         field=params.field,
         order=params.order,
+        cursor=params.cursor,
+        exact_total=params.exact_total,
     )
 
 
@@ -129,6 +132,39 @@ async def search_patients(
         limit=params.limit,
         field=params.field,
         order=params.order,
+        cursor=params.cursor,
+    )
+
+
+# Endpoint de suggestions de patients pendant la saisie
+@router.get("/autocomplete", response_model=list[PatientsNamesResponse])
+async def autocomplete_patients(
+    request: Request,
+    payload: Annotated[InternalPayload, Depends(check_authorization)],
+    params: Annotated[AutocompletePatientsParams, Query()],
+    patients_service=Depends(get_patients_service),
+    db=Depends(get_db),
+):
+    """
+    Suggère les patients dont le nom (puis le prénom) commence par la saisie,
+    sans tenir compte de la casse ni des accents.
+
+    Args:
+        request (Request): La requête HTTP
+        payload (InternalPayload): Les informations d'authentification
+        params (AutocompletePatientsParams): La saisie et le nombre de suggestions
+        patients_service: Le service de gestion des patients
+        db: La session de base de données
+
+    Returns:
+        list[PatientsNamesResponse]: Identifiants et noms complets des patients
+    """
+    logger.write_log(
+        f"{payload['role']} - {payload['user_id']} - {request.method} - autocomplete patients",
+        request,
+    )
+    return await patients_service.autocomplete_patients(
+        db=db, q=params.q, limit=params.limit
     )
 
 
@@ -140,7 +176,7 @@ async def read_patient(
     payload: Annotated[InternalPayload, Depends(check_authorization)],
     internal_token: str = Depends(get_permissions),
     patients_service=Depends(get_patients_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Récupère les informations détaillées d'un patient par son ID.
@@ -150,7 +186,7 @@ async def read_patient(
         patient_id (int): L'identifiant du patient
         payload (InternalPayload): Les informations d'authentification
         patients_service: Le service de gestion des patients
-        db (Session): La session de base de données
+        db (AsyncSession): La session de base de données
 
     Returns:
         DetailPatient: Les informations détaillées du patient
@@ -174,7 +210,7 @@ async def update_patient(
     data: Annotated[CreatePatient, Body()],
     payload: Annotated[InternalPayload, Depends(check_authorization)],
     patients_service=Depends(get_patients_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     logger.write_log(
         f"{payload['role']} - {payload['user_id']} - {request.method} - update patient {patient_id}",
@@ -199,7 +235,7 @@ async def delete_patient(
     payload: Annotated[InternalPayload, Depends(check_authorization)],
     internal_payload: Annotated[str, Depends(get_permissions)],
     patients_service=Depends(get_patients_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     logger.write_log(
         f"{payload['role']} - {payload['user_id']} - {request.method} - delete patient {patient_id}",
@@ -221,6 +257,6 @@ async def get_patients_names(
     payload: Annotated[InternalPayload, Depends(check_authorization)],
     data: Annotated[list[PatientsNames], Body()],
     patients_service=Depends(get_patients_service),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     return await patients_service.get_patients_names(db=db, ids=data)
@@ -84,6 +84,10 @@ class ReadAllPatients(BaseModel):
     data: list[PatientListItem]
     # Nombre total de patients
     total: int
+    # Vrai si le total est estimé (statistiques de la base) plutôt que compté
+    total_estimated: bool = False
+    # Curseur à passer pour obtenir la page suivante (None sur la dernière page)
+    next_cursor: str | None = None
 
 
 # Modèle utilisé pour les paramètres de pagination et de tri
@@ -96,6 +100,10 @@ class PatientsParams(BaseModel):
     field: str = Field(default="nom")
     # Ordre du tri (asc ou desc)
     order: str = Field(default="asc")
+    # Curseur de la page suivante (next_cursor), prioritaire sur page
+    cursor: str | None = Field(default=None, max_length=512)
+    # Compte exact du total (sinon estimé pour la liste complète)
+    exact_total: bool = Field(default=False)
 
     @field_validator("field")
     def validate_field(cls, value):
@@ -116,6 +124,17 @@ class ReservationResponse(BaseModel):
 class SearchPatientsParams(PatientsParams):
     # Terme de recherche
     search: str
+    # Par défaut, les résultats sont classés par pertinence
+    field: str = Field(default="pertinence")
+
+    @field_validator("field")
+    def validate_field(cls, value):
+        # Validation des champs de tri autorisés, pertinence comprise
+        if value not in ["pertinence", "nom", "prenom", "date_de_naissance", "email"]:
+            raise ValueError(
+                "La propriété 'field' doit être 'pertinence', 'nom', 'prenom', 'date_de_naissance' ou 'email'."
+            )
+        return value
 
     @field_validator("search")
     def validate_search(cls, value):
@@ -127,6 +146,21 @@ class SearchPatientsParams(PatientsParams):
         return value
 
 
+# Modèle utilisé pour les paramètres de l'autocomplétion
+class AutocompletePatientsParams(BaseModel):
+    # Début du nom (puis du prénom) saisi
+    q: str = Field(min_length=1, max_length=100)
+    # Nombre maximum de suggestions
+    limit: int = Field(default=10, ge=1, le=50)
+
+    @field_validator("q")
+    def validate_q(cls, value):
+        # Validation de la saisie avec l'expression régulière générique
+        if not re.match(generic_pattern, value):
+            raise ValueError("La propriété 'q' contient des caractères non autorisés.")
+        return value
+
+
 # Modèle utilisé pour retourner un document dans la liste des documents d'un patient
 class DocumentsListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
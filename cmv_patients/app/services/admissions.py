@@ -3,7 +3,7 @@ from datetime import datetime
 
 import httpx
 from fastapi import HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.repositories.outbox_crud import PgOutboxRepository
@@ -35,7 +35,7 @@ class AdmissionService:
     def __init__(self, admissions_repository: PgAdmissionsRepository):
         self.admissions_repository = admissions_repository
 
-    async def get_admission(self, db: Session, admission_id):
+    async def get_admission(self, db: AsyncSession, admission_id):
         admission = await self.admissions_repository.get_admission_by_id(
             db, admission_id
         )
@@ -45,7 +45,7 @@ class AdmissionService:
 
     async def create_admission(
         self,
-        db: Session,
+        db: AsyncSession,
         data: CreateAdmission,
         internal_payload: str,
         request,
@@ -98,7 +98,7 @@ class AdmissionService:
 
     async def update_admission(
         self,
-        db: Session,
+        db: AsyncSession,
         data,
         internal_payload: str,
         request,
@@ -136,11 +136,11 @@ class AdmissionService:
             )
 
         # Refresh and return the updated admission
-        db.refresh(admission)
+        await db.refresh(admission)
         return admission
 
     async def delete_admission(
-        self, db: Session, admission_id: int, internal_payload: str, request
+        self, db: AsyncSession, admission_id: int, internal_payload: str, request
     ):
         admission = await self.admissions_repository.get_admission_by_id(
             db, admission_id
@@ -5,7 +5,7 @@ from locale import locale_encoding_alias
 import boto3
 import httpx
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.repositories.documents_crud import PgDocumentsRepository
@@ -90,11 +90,13 @@ class PatientsService:
 
     async def read_all_patients(
         self,
-        db: Session,
+        db: AsyncSession,
         page: int,
         limit: int,
         field: str,
         order: str,
+        cursor: str | None = None,
+        exact_total: bool = False,
     ) -> dict:
         """
         Récupère la liste paginée de tous les patients
@@ -104,6 +106,8 @@ class PatientsService:
             limit: Nombre d'éléments par page
             field: Champ sur lequel trier
             order: Ordre de tri (asc/desc)
+            cursor: Curseur de la page suivante (remplace page)
+            exact_total: Compte exact plutôt qu'estimé
             user_id: ID de l'utilisateur faisant la requête
             role: Rôle de l'utilisateur
             request: Requête HTTP
@@ -112,11 +116,37 @@ class PatientsService:
         """
         # Appel au repository pour récupérer les patients avec pagination et tri
         return await self.patients_repository.read_all_patients(
-            db=db, page=page, limit=limit, field=field, order=order
+            db=db,
+            page=page,
+            limit=limit,
+            field=field,
+            order=order,
+            cursor=cursor,
+            exact_total=exact_total,
         )
 
+    async def autocomplete_patients(
+        self, db: AsyncSession, q: str, limit: int
+    ) -> list[PatientsNamesResponse]:
+        """
+        Suggestions de patients pour la saisie au clavier
+        Args:
+            db: Session de base de données
+            q: Début du nom (puis du prénom), casse et accents indifférents
+            limit: Nombre maximum de suggestions
+        Returns:
+            list[PatientsNamesResponse]: Identifiants et noms complets
+        """
+        rows = await self.patients_repository.autocomplete_patients(db, q, limit)
+        return [
+            PatientsNamesResponse(
+                patient_id=row.id_patient, full_name=f"{row.nom} {row.prenom}"
+            )
+            for row in rows
+        ]
+
     async def get_patients_names(
-        self, db: Session, ids: list[PatientsNames]
+        self, db: AsyncSession, ids: list[PatientsNames]
     ) -> list[PatientsNamesResponse]:
         response = await self.patients_repository.get_patients_names(db, ids)
         result = []
@@ -128,7 +158,7 @@ class PatientsService:
             )
         return result
 
-    async def detail_patient(self, db: Session, patient_id: int, payload: str):
+    async def detail_patient(self, db: AsyncSession, patient_id: int, payload: str):
         """
         Récupère les détails d'un patient spécifique
         Args:
@@ -147,11 +177,12 @@ class PatientsService:
         )
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
-        if patient.admissions and patient.admissions[0].ref_reservation:
+        admission = patient.latest_admission
+        if admission and admission.ref_reservation:
             async with httpx.AsyncClient() as client:
                 try:
                     response = await client.get(
-                        f"{CHAMBRES_SERVICE}/chambres/reservation/{patient.admissions[0].ref_reservation}",
+                        f"{CHAMBRES_SERVICE}/chambres/reservation/{admission.ref_reservation}",
                         headers={"Authorization": f"Bearer {payload}"},
                         follow_redirects=True,
                     )
@@ -162,7 +193,6 @@ class PatientsService:
                     data = response.json()
                     print(f"DATA: {data}")
 
-                    admission = patient.admissions[0]
                     return {
                         "id_patient": patient.id_patient,
                         "civilite": patient.civilite,
@@ -193,12 +223,13 @@ class PatientsService:
 
     async def search_patients(
         self,
-        db: Session,
+        db: AsyncSession,
         search: str,
         page: int,
         limit: int,
         field: str,
         order: str,
+        cursor: str | None = None,
     ) -> dict:
         """
         Recherche des patients selon des critères
@@ -209,6 +240,7 @@ class PatientsService:
             limit: Nombre d'éléments par page
             field: Champ sur lequel trier
             order: Ordre de tri (asc/desc)
+            cursor: Curseur de la page suivante (remplace page)
             user_id: ID de l'utilisateur faisant la requête
             role: Rôle de l'utilisateur
             request: Requête HTTP
@@ -217,10 +249,16 @@ class PatientsService:
         """
         # Appel au repository pour rechercher des patients avec pagination et tri
         return await self.patients_repository.search_patients(
-            db=db, search=search, page=page, limit=limit, field=field, order=order
+            db=db,
+            search=search,
+            page=page,
+            limit=limit,
+            field=field,
+            order=order,
+            cursor=cursor,
         )
 
-    async def create_patient(self, db: Session, data: Patient) -> Patient:
+    async def create_patient(self, db: AsyncSession, data: Patient) -> Patient:
         """
         Crée un nouveau patient
         Args:
@@ -240,7 +278,7 @@ class PatientsService:
         return await self.patients_repository.create_patient(db, data)
 
     async def update_patient(
-        self, db: Session, patient_id: int, data: Patient
+        self, db: AsyncSession, patient_id: int, data: Patient
     ) -> Patient:
         """
         Met à jour les données d'un patient existant
@@ -262,7 +300,7 @@ class PatientsService:
         return await self.patients_repository.update_patient(db, patient_id, data)
 
     async def delete_patient(
-        self, db: Session, patient_id: int, internal_payload: str, request
+        self, db: AsyncSession, patient_id: int, internal_payload: str, request
     ):
         """
         Supprime un patient
@@ -274,7 +312,9 @@ class PatientsService:
         Returns:
             dict: Message de confirmation
         """
-        patient = await self.patients_repository.read_patient_by_id(db, patient_id)
+        patient = await self.patients_repository.read_patient_by_id(
+            db, patient_id, with_admissions=True
+        )
         documents = patient.documents
         for document in documents:
             await self.delete_document_by_id(db, document.id_document)
@@ -287,7 +327,7 @@ class PatientsService:
 
     async def create_patient_document(
         self,
-        db: Session,
+        db: AsyncSession,
         file_contents: bytes,
         type_document: DocumentType,
         patient_id: int,
@@ -327,7 +367,7 @@ class PatientsService:
             patient_id=patient_id,
         )
 
-    async def get_patient_document(self, db: Session, document_id: int):
+    async def get_patient_document(self, db: AsyncSession, document_id: int):
         """
         Récupère un document d'un patient
         Args:
@@ -347,7 +387,7 @@ class PatientsService:
             )
         return await self._download_file_from_s3(document)
 
-    async def delete_patient_document(self, db: Session, document_id: int) -> dict:
+    async def delete_patient_document(self, db: AsyncSession, document_id: int) -> dict:
         """
         Supprime un document d'un patient
         Args:
@@ -418,7 +458,7 @@ class PatientsService:
             )
         return True
 
-    async def download_file_from_s3(self, db: Session, document_id: int):
+    async def download_file_from_s3(self, db: AsyncSession, document_id: int):
         """
         Télécharge un fichier depuis S3 AWS
         Args:
@@ -453,7 +493,7 @@ class PatientsService:
         file_obj.seek(0)
         return file_obj, existing_document.nom_fichier
 
-    async def delete_document_by_id(self, db: Session, document_id: int):
+    async def delete_document_by_id(self, db: AsyncSession, document_id: int):
         """
         Supprime un document par son ID
         Args:
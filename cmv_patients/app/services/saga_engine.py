@@ -6,7 +6,8 @@ from datetime import datetime, timedelta, timezone
 import httpx
 from fastapi import HTTPException, status
 from jose import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.repositories.outbox_crud import PgOutboxRepository
@@ -35,7 +36,7 @@ class SagaEngine:
 
     async def execute_close_admission(
         self,
-        db: Session,
+        db: AsyncSession,
         admission: Admission,
         headers: dict,
         sorti_le,
@@ -46,6 +47,9 @@ class SagaEngine:
         Étape 2 : Mettre à jour l'admission (vider ref_reservation, setter sorti_le)
         Étape 3 : Commit atomique
         """
+        # Lu avant tout rollback: les objets de la session sont alors expirés
+        # et ne peuvent pas être rechargés implicitement en asynchrone
+        admission_id = admission.id_admission
         try:
             # Étape 1 : Clôturer la réservation si non-ambulatoire
             if not admission.ambulatoire and admission.ref_reservation:
@@ -53,7 +57,7 @@ class SagaEngine:
                     db, admission, headers
                 )
                 if not close_succeeded:
-                    db.rollback()
+                    await db.rollback()
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="failed_to_close_reservation",
@@ -65,7 +69,7 @@ class SagaEngine:
             )
 
             # Étape 3 : Commit atomique
-            db.commit()
+            await db.commit()
 
             self.logger.info(
                 "Admission %s clôturée avec succès",
@@ -77,10 +81,10 @@ class SagaEngine:
             raise
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             self.logger.error(
                 "Échec du saga de clôture pour l'admission %s : %s",
-                admission.id_admission,
+                admission_id,
                 str(e),
             )
             raise HTTPException(
@@ -90,7 +94,7 @@ class SagaEngine:
 
     async def _close_reservation(
         self,
-        db: Session,
+        db: AsyncSession,
         admission: Admission,
         headers: dict,
     ) -> bool:
@@ -153,7 +157,7 @@ class SagaEngine:
 
     async def execute_delete_admission(
         self,
-        db: Session,
+        db: AsyncSession,
         admission: Admission,
         headers: dict,
     ) -> dict:
@@ -166,6 +170,7 @@ class SagaEngine:
         Si la compensation réussit (ou n'est pas nécessaire), supprime
         l'admission et commit atomiquement.
         """
+        admission_id = admission.id_admission
         try:
             # Étape 1 : Annuler la réservation si nécessaire
             if not admission.ambulatoire and admission.ref_reservation:
@@ -175,24 +180,24 @@ class SagaEngine:
                 if not cancel_succeeded:
                     # L'outbox a été insérée dans _cancel_reservation,
                     # on rollback tout et on lève une erreur
-                    db.rollback()
+                    await db.rollback()
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="failed_to_cancel_reservation",
                     )
 
             # Étape 2 : Supprimer l'admission (flush, pas commit)
-            db.query(Admission).filter(
-                Admission.id_admission == admission.id_admission
-            ).delete()
-            db.flush()
+            await db.execute(
+                delete(Admission).where(Admission.id_admission == admission_id)
+            )
+            await db.flush()
 
             # Étape 3 : Commit atomique (admission + éventuel outbox)
-            db.commit()
+            await db.commit()
 
             self.logger.info(
                 "Admission %s supprimée avec succès",
-                admission.id_admission,
+                admission_id,
             )
             return {"message": "admission_deleted"}
 
@@ -200,10 +205,10 @@ class SagaEngine:
             raise
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             self.logger.error(
                 "Échec du saga de suppression pour l'admission %s : %s",
-                admission.id_admission,
+                admission_id,
                 str(e),
             )
             raise HTTPException(
@@ -213,7 +218,7 @@ class SagaEngine:
 
     async def _cancel_reservation(
         self,
-        db: Session,
+        db: AsyncSession,
         admission: Admission,
         headers: dict,
     ) -> bool:
@@ -295,7 +300,7 @@ class SagaEngine:
 
     async def retry_pending_compensations(
         self,
-        db: Session,
+        db: AsyncSession,
         max_retries: int = 5,
     ) -> dict:
         """Rejoue les compensations pending de la table outbox.
@@ -354,8 +359,8 @@ class SagaEngine:
             await self.outbox_repository.update_status(
                 db, entry.id, OutboxStatus.PENDING, increment_retries=True
             )
-            db.flush()
-            db.refresh(entry)
+            await db.flush()
+            await db.refresh(entry)
 
             failures += 1
 
@@ -382,6 +387,6 @@ class SagaEngine:
                     error_msg,
                 )
 
-        db.commit()
+        await db.commit()
 
         return {"successes": successes, "failures": failures}
@@ -2,18 +2,25 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
+    and_,
+    event,
     func,
+    literal_column,
+    select,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, aliased, mapped_column, relationship
 
 from ..utils.database import Base
+from ..utils.normalization import normalize_search_key
 
 
 class Civilite(enum.Enum):
@@ -104,7 +111,8 @@ class Document(Base):
         ForeignKey(
             "patient.id_patient",
             ondelete="CASCADE",
-        )
+        ),
+        index=True,
     )
     patient: Mapped["Patient"] = relationship("Patient", back_populates="documents")
 
@@ -132,6 +140,9 @@ class Patient(Base):
     email: Mapped[str] = mapped_column(
         String, nullable=True
     )  # Adresse email (optionnelle)
+    search_key: Mapped[str] = mapped_column(
+        String, nullable=True
+    )  # "nom prénom" normalisé (autocomplétion), calculé à l'enregistrement
     created_at: Mapped[datetime] = mapped_column(
         DateTime(), server_default=func.now()
     )  # Date de création
@@ -141,11 +152,104 @@ class Patient(Base):
 
     # Relation many to one avec l'entité "Document"
     documents: Mapped[list["Document"]] = relationship(
-        "Document", back_populates="patient"
+        "Document", back_populates="patient", order_by="Document.id_document"
     )
     admissions: Mapped[list["Admission"]] = relationship(
         "Admission", back_populates="patient"
     )
+    # Dernière admission créée, en lecture seule (chargeable par jointure)
+    latest_admission: Mapped["Admission"] = relationship(
+        "Admission",
+        primaryjoin=lambda: and_(
+            Admission.patient_id == Patient.id_patient,
+            Admission.id_admission == latest_admission_id(Patient.id_patient),
+        ),
+        viewonly=True,
+    )
+
+
+def latest_admission_id(patient_id):
+    """
+    Sous-requête corrélée: id de la dernière admission d'un patient.
+
+    Lue sur l'index (patient_id, created_at DESC, id_admission DESC).
+    """
+    latest = aliased(Admission)
+    return (
+        select(latest.id_admission)
+        .where(latest.patient_id == patient_id)
+        .order_by(latest.created_at.desc(), latest.id_admission.desc())
+        .limit(1)
+        .correlate_except(latest)
+        .scalar_subquery()
+    )
+
+
+# Index composites (champ de tri, id) de la pagination par clé, un par champ
+# de tri autorisé; l'email nullable est trié sur coalesce(email, '')
+Index("ix_patient_nom_id_patient", Patient.nom, Patient.id_patient)
+Index("ix_patient_prenom_id_patient", Patient.prenom, Patient.id_patient)
+Index(
+    "ix_patient_date_de_naissance_id_patient",
+    Patient.date_de_naissance,
+    Patient.id_patient,
+)
+Index(
+    "ix_patient_email_id_patient",
+    func.coalesce(Patient.email, literal_column("''")),
+    Patient.id_patient,
+)
+# Admissions d'un patient de la plus récente à la plus ancienne (dernière
+# admission du détail patient)
+Index(
+    "ix_admission_patient_id_created_at",
+    Admission.patient_id,
+    Admission.created_at.desc(),
+    Admission.id_admission.desc(),
+)
+# Autocomplétion: préfixe de search_key (text_pattern_ops, indépendant de la
+# collation), nom et prénom inclus pour une lecture de l'index seul
+Index(
+    "ix_patient_search_key_id_patient",
+    Patient.search_key,
+    Patient.id_patient,
+    postgresql_ops={"search_key": "text_pattern_ops"},
+    postgresql_include=["nom", "prenom"],
+)
+
+
+@event.listens_for(Patient, "before_insert")
+@event.listens_for(Patient, "before_update")
+def update_patient_search_key(mapper, connection, target: Patient) -> None:
+    """Recalcule la clé d'autocomplétion à chaque création ou modification."""
+    target.search_key = normalize_search_key(target.nom, target.prenom)
+
+# Recherche plein texte (PostgreSQL uniquement): colonne tsvector générée à
+# partir du nom, du prénom et de la ville, pondérés A, B et C pour le
+# classement par pertinence, et indexée en GIN. La colonne n'est pas mappée:
+# elle est calculée par la base et n'est lue que par la recherche.
+PATIENT_SEARCH_VECTOR = "search_vector"
+PATIENT_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(nom, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(prenom, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(ville, '')), 'C')"
+)
+event.listen(
+    Patient.__table__,
+    "after_create",
+    DDL(
+        f"ALTER TABLE patient ADD COLUMN {PATIENT_SEARCH_VECTOR} tsvector "
+        f"GENERATED ALWAYS AS ({PATIENT_SEARCH_VECTOR_SQL}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Patient.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX ix_patient_search_vector ON patient "
+        f"USING gin ({PATIENT_SEARCH_VECTOR})"
+    ).execute_if(dialect="postgresql"),
+)
 
 
 class OutboxStatus(enum.Enum):
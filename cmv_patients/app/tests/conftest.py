@@ -4,8 +4,8 @@ from app.sql import models
 from app.utils.config import ALGORITHM, SECRET_KEY
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 from jose import jwt
 
@@ -14,31 +14,38 @@ from app.sql.models import Base
 from app.main import app
 
 # URL de la base de données de test en mémoire
-DATABASE_URL = "sqlite:///:memory:"
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-# Fixture pour créer le moteur SQLAlchemy
-@pytest.fixture(scope="session")
-def engine():
+# Fixture pour créer le moteur SQLAlchemy asynchrone (une boucle par test:
+# la connexion aiosqlite ne peut pas être partagée entre boucles)
+@pytest.fixture(scope="function")
+async def engine():
     print(f"DATABASE_URL : {DATABASE_URL}")
-    return create_engine(
+    engine = create_async_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    yield engine
+    await engine.dispose()
 
 
 # Fixture pour créer une session de base de données
 @pytest.fixture(scope="function")
-def db_session(engine):
-    Base.metadata.create_all(engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def db_session(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = async_sessionmaker(
+        engine, autoflush=False, expire_on_commit=False
+    )
     session = SessionLocal()
     try:
         yield session
     finally:
-        session.close()
-        Base.metadata.drop_all(engine)
+        await session.close()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
 
 
 # Fixture pour créer un client HTTP asynchrone
@@ -78,11 +85,8 @@ async def wrong_internal_token():
 # Fixture pour remplacer la dépendance de base de données par notre session de test
 @pytest.fixture(autouse=True)
 def override_dependency(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
+    async def override_get_db():
+        yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
     yield
@@ -91,7 +95,7 @@ def override_dependency(db_session):
 
 # Fixture pour créer un jeu de données de test avec des patients et des documents
 @pytest.fixture(scope="function")
-def patients(db_session):
+async def patients(db_session):
     # Création d'une liste de 20 patients
     patients: list[models.Patient] = []
     for i in range(0, 20):
@@ -122,11 +126,11 @@ def patients(db_session):
 
     # Sauvegarde des patients dans la base de données
     db_session.add_all(patients)
-    db_session.commit()
+    await db_session.commit()
 
     # Récupération du premier patient pour lui ajouter des documents
-    patient = (
-        db_session.query(models.Patient).filter(models.Patient.id_patient == 1).first()
+    patient = await db_session.scalar(
+        select(models.Patient).where(models.Patient.id_patient == 1)
     )
 
     # Création et association de 2 documents au premier patient
@@ -135,11 +139,11 @@ def patients(db_session):
         document = models.Document(
             nom_fichier=f"document_test_{i}",
             type_document="MISCELLANEOUS",
+            patient_id=patient.id_patient,
         )
         documents.append(document)
-    patient.documents = documents
 
     # Sauvegarde des modifications
-    db_session.add(patient)
-    db_session.commit()
+    db_session.add_all(documents)
+    await db_session.commit()
     return patients
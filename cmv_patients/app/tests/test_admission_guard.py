@@ -23,8 +23,8 @@ async def test_create_admission_rejected_when_admission_exists(
         date_de_naissance=datetime(1990, 1, 1),
     )
     db_session.add(patient)
-    db_session.commit()
-    db_session.refresh(patient)
+    await db_session.commit()
+    await db_session.refresh(patient)
 
     admission = Admission(
         patient_id=patient.id_patient,
@@ -34,7 +34,7 @@ async def test_create_admission_rejected_when_admission_exists(
         ref_reservation=None,
     )
     db_session.add(admission)
-    db_session.commit()
+    await db_session.commit()
 
     resp = await ac.post(
         "/api/admissions",
@@ -66,8 +66,8 @@ async def test_create_admission_allowed_when_no_admission(
         date_de_naissance=datetime(1990, 1, 1),
     )
     db_session.add(patient)
-    db_session.commit()
-    db_session.refresh(patient)
+    await db_session.commit()
+    await db_session.refresh(patient)
 
     resp = await ac.post(
         "/api/admissions",
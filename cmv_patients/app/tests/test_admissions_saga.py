@@ -11,6 +11,7 @@ import httpx
 import pytest
 from hypothesis import given, settings, HealthCheck
 from hypothesis import strategies as st
+from sqlalchemy import func, select
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.schemas.patients import CreateAdmission
@@ -39,7 +40,7 @@ def mock_request():
 
 
 @pytest.fixture
-def patient_in_db(db_session):
+async def patient_in_db(db_session):
     """Patient pré-inséré pour les tests d'admission."""
     patient = Patient(
         civilite="AUTRE",
@@ -52,7 +53,7 @@ def patient_in_db(db_session):
         date_de_naissance=datetime(1990, 1, 1),
     )
     db_session.add(patient)
-    db_session.commit()
+    await db_session.commit()
     return patient
 
 
@@ -211,8 +212,8 @@ async def test_prop_ambulatoire_roundtrip(
     assert httpx_mock.get_requests() == []
 
     # Cleanup: remove the admission so next Hypothesis example starts clean
-    db_session.delete(admission)
-    db_session.commit()
+    await db_session.delete(admission)
+    await db_session.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -275,8 +276,8 @@ async def test_prop_non_ambulatoire_roundtrip(
     assert admission.sortie_prevue_le == data.sortie_prevue_le
 
     # Cleanup: remove the admission so next Hypothesis example starts clean
-    db_session.delete(admission)
-    db_session.commit()
+    await db_session.delete(admission)
+    await db_session.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -327,7 +328,7 @@ async def test_prop_reservation_failure_prevents_creation(
         )
 
     # Verify that no admission was created in the database
-    admission_count = db_session.query(Admission).count()
+    admission_count = await db_session.scalar(select(func.count(Admission.id_admission)))
     assert admission_count == 0, (
         f"Expected 0 admissions after reservation failure (status={status_code}), "
         f"but found {admission_count}"
@@ -660,8 +661,8 @@ async def test_delete_returns_admission_deleted_message(
         ref_reservation=42,
     )
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
 
     # Mock the DELETE to Service_Chambres to return 200
     httpx_mock.add_response(
@@ -698,8 +699,8 @@ async def test_delete_ambulatoire_returns_admission_deleted(
         ref_reservation=None,
     )
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
 
     result = await admission_service.delete_admission(
         db=db_session,
@@ -770,8 +771,8 @@ async def test_prop_delete_with_reservation_cancellation(
         ref_reservation=reservation_id,
     )
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
     admission_id = admission.id_admission
 
     # 2. Mock the DELETE to Service_Chambres to return 200
@@ -802,9 +803,9 @@ async def test_prop_delete_with_reservation_cancellation(
     assert str(delete_requests[0].url) == expected_url
 
     # 5. Verify the admission is deleted from the DB (query by id returns None)
-    deleted = db_session.query(Admission).filter(
-        Admission.id_admission == admission_id
-    ).first()
+    deleted = await db_session.scalar(
+        select(Admission).where(Admission.id_admission == admission_id)
+    )
     assert deleted is None
 
     # 6. Verify the result is {"message": "admission_deleted"}
@@ -845,8 +846,8 @@ async def test_prop_delete_ambulatoire_no_http(
         ref_reservation=None,
     )
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
     admission_id = admission.id_admission
 
     # 2. Call delete_admission with the admission's ID
@@ -864,9 +865,9 @@ async def test_prop_delete_ambulatoire_no_http(
     assert httpx_mock.get_requests() == []
 
     # 5. Verify the admission is deleted from the DB
-    deleted = db_session.query(Admission).filter(
-        Admission.id_admission == admission_id
-    ).first()
+    deleted = await db_session.scalar(
+        select(Admission).where(Admission.id_admission == admission_id)
+    )
     assert deleted is None
 
 
@@ -900,6 +901,9 @@ async def test_prop_cancel_failure_preserves_admission(
     """
     from fastapi import HTTPException
 
+    # The saga rollback of the previous example expired the patient
+    await db_session.refresh(patient_in_db)
+
     # 1. Create a non-ambulatoire Admission directly in the DB with ref_reservation
     admission = Admission(
         patient_id=patient_in_db.id_patient,
@@ -909,8 +913,8 @@ async def test_prop_cancel_failure_preserves_admission(
         ref_reservation=reservation_id,
     )
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
     admission_id = admission.id_admission
 
     # 2. Mock the DELETE to Service_Chambres to return the generated error status_code
@@ -934,14 +938,14 @@ async def test_prop_cancel_failure_preserves_admission(
     assert exc_info.value.detail == "failed_to_cancel_reservation"
 
     # 5. Verify the admission is still in the DB (not deleted)
-    preserved = db_session.query(Admission).filter(
-        Admission.id_admission == admission_id
-    ).first()
+    preserved = await db_session.scalar(
+        select(Admission).where(Admission.id_admission == admission_id)
+    )
     assert preserved is not None, (
         f"Admission {admission_id} should still exist after cancel failure "
         f"(status_code={status_code})"
     )
 
     # Cleanup: remove the admission so next Hypothesis example starts clean
-    db_session.delete(preserved)
-    db_session.commit()
+    await db_session.delete(preserved)
+    await db_session.commit()
@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils.database import to_async_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (
+            "postgresql://u:p@db:5432/patients",
+            "postgresql+asyncpg://u:p@db:5432/patients",
+        ),
+        (
+            "postgresql+psycopg2://u:p@db:5432/patients",
+            "postgresql+asyncpg://u:p@db:5432/patients",
+        ),
+        (
+            "postgresql+psycopg://u:p@db:5432/patients",
+            "postgresql+asyncpg://u:p@db:5432/patients",
+        ),
+        (
+            "postgresql+asyncpg://u:p@db:5432/patients",
+            "postgresql+asyncpg://u:p@db:5432/patients",
+        ),
+        ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("sqlite+aiosqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+    ],
+)
+def test_to_async_url(url, expected):
+    """Test la conversion de l'URL vers le driver asynchrone, quel que soit le driver"""
+    assert to_async_url(url) == expected
+
+
+def test_to_async_url_conserve_le_mot_de_passe():
+    """Test que seul le schéma est remplacé (mot de passe contenant postgresql://)"""
+    url = "postgresql+psycopg2://u:postgresql://x@db/patients"
+
+    assert to_async_url(url) == "postgresql+asyncpg://u:postgresql://x@db/patients"
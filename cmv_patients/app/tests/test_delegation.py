@@ -15,6 +15,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import delete
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.repositories.documents_crud import PgDocumentsRepository
@@ -28,7 +29,7 @@ from app.sql.models import Admission, Patient
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_patient(db_session, patient_id=1) -> Patient:
+async def _make_patient(db_session, patient_id=1) -> Patient:
     """Insère un patient minimal en base et le retourne."""
     patient = Patient(
         id_patient=patient_id,
@@ -42,12 +43,12 @@ def _make_patient(db_session, patient_id=1) -> Patient:
         date_de_naissance=datetime(1990, 1, 1),
     )
     db_session.add(patient)
-    db_session.commit()
-    db_session.refresh(patient)
+    await db_session.commit()
+    await db_session.refresh(patient)
     return patient
 
 
-def _make_admission(
+async def _make_admission(
     db_session,
     patient_id=1,
     admission_id=None,
@@ -65,8 +66,8 @@ def _make_admission(
     if admission_id is not None:
         admission.id_admission = admission_id
     db_session.add(admission)
-    db_session.commit()
-    db_session.refresh(admission)
+    await db_session.commit()
+    await db_session.refresh(admission)
     return admission
 
 
@@ -95,19 +96,19 @@ class TestDeletePatientDelegation:
     ):
         """delete_patient doit appeler admission_service.delete_admission
         une fois par admission."""
-        patient = _make_patient(db_session, patient_id=1)
-        adm1 = _make_admission(db_session, patient_id=patient.id_patient, ambulatoire=False, ref_reservation=10)
-        adm2 = _make_admission(db_session, patient_id=patient.id_patient, ambulatoire=True, ref_reservation=None)
+        patient = await _make_patient(db_session, patient_id=1)
+        adm1 = await _make_admission(db_session, patient_id=patient.id_patient, ambulatoire=False, ref_reservation=10)
+        adm2 = await _make_admission(db_session, patient_id=patient.id_patient, ambulatoire=True, ref_reservation=None)
 
         expected_ids = sorted([adm1.id_admission, adm2.id_admission])
 
         # Side effect that actually removes the admission from DB so the
         # subsequent patient delete (CASCADE) doesn't hit a NOT NULL constraint.
         async def _fake_delete(db, admission_id, payload, request):
-            db.query(Admission).filter(
-                Admission.id_admission == admission_id
-            ).delete()
-            db.flush()
+            await db.execute(
+                delete(Admission).where(Admission.id_admission == admission_id)
+            )
+            await db.flush()
             return {"message": "admission_deleted"}
 
         mock_admission_service = AsyncMock(spec=AdmissionService)
@@ -130,14 +131,14 @@ class TestDeletePatientDelegation:
         self, db_session
     ):
         """delete_patient transmet db, admission_id, internal_payload et request."""
-        patient = _make_patient(db_session, patient_id=1)
-        adm = _make_admission(db_session, patient_id=patient.id_patient)
+        patient = await _make_patient(db_session, patient_id=1)
+        adm = await _make_admission(db_session, patient_id=patient.id_patient)
 
         async def _fake_delete(db, admission_id, payload, request):
-            db.query(Admission).filter(
-                Admission.id_admission == admission_id
-            ).delete()
-            db.flush()
+            await db.execute(
+                delete(Admission).where(Admission.id_admission == admission_id)
+            )
+            await db.flush()
             return {"message": "admission_deleted"}
 
         mock_admission_service = AsyncMock(spec=AdmissionService)
@@ -198,8 +199,8 @@ class TestAmbulatoryNoHttpCall:
         self, db_session
     ):
         """delete_admission sur une admission ambulatoire ne fait pas d'appel HTTP."""
-        patient = _make_patient(db_session, patient_id=1)
-        adm = _make_admission(
+        patient = await _make_patient(db_session, patient_id=1)
+        adm = await _make_admission(
             db_session,
             patient_id=patient.id_patient,
             ambulatoire=True,
@@ -10,6 +10,7 @@ Validates: Requirements 3.1
 from datetime import datetime
 
 import pytest
+from sqlalchemy import select
 
 from app.repositories.outbox_crud import PgOutboxRepository
 from app.sql.models import OutboxEntry, OutboxStatus
@@ -60,7 +61,7 @@ async def test_create_entry_is_queryable(outbox_repo, db_session):
 
     created = await outbox_repo.create_entry(db_session, entry)
 
-    found = db_session.query(OutboxEntry).filter(OutboxEntry.id == created.id).first()
+    found = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == created.id))
     assert found is not None
     assert found.compensation_type == "cancel_reservation"
     assert found.payload == {"reservation_id": 7}
@@ -96,7 +97,7 @@ async def test_get_pending_entries_returns_only_pending(outbox_repo, db_session)
     )
 
     db_session.add_all([pending, completed, failed])
-    db_session.flush()
+    await db_session.flush()
 
     results = await outbox_repo.get_pending_entries(db_session, max_retries=5)
 
@@ -130,7 +131,7 @@ async def test_get_pending_entries_filters_by_max_retries(outbox_repo, db_sessio
     )
 
     db_session.add_all([low_retry, at_threshold, over_threshold])
-    db_session.flush()
+    await db_session.flush()
 
     results = await outbox_repo.get_pending_entries(db_session, max_retries=5)
 
@@ -169,14 +170,14 @@ async def test_update_status_changes_status(outbox_repo, db_session):
         retry_count=0,
     )
     db_session.add(entry)
-    db_session.flush()
-    db_session.refresh(entry)
+    await db_session.flush()
+    await db_session.refresh(entry)
 
     await outbox_repo.update_status(
         db_session, entry.id, OutboxStatus.COMPLETED
     )
 
-    updated = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+    updated = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
     assert updated.status == OutboxStatus.COMPLETED
     assert updated.last_attempted_at is not None
 
@@ -193,14 +194,14 @@ async def test_update_status_increments_retry_count(outbox_repo, db_session):
         retry_count=2,
     )
     db_session.add(entry)
-    db_session.flush()
-    db_session.refresh(entry)
+    await db_session.flush()
+    await db_session.refresh(entry)
 
     await outbox_repo.update_status(
         db_session, entry.id, OutboxStatus.PENDING, increment_retries=True
     )
 
-    updated = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+    updated = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
     assert updated.retry_count == 3
     assert updated.status == OutboxStatus.PENDING
 
@@ -219,14 +220,14 @@ async def test_update_status_without_increment_keeps_retry_count(
         retry_count=3,
     )
     db_session.add(entry)
-    db_session.flush()
-    db_session.refresh(entry)
+    await db_session.flush()
+    await db_session.refresh(entry)
 
     await outbox_repo.update_status(
         db_session, entry.id, OutboxStatus.FAILED
     )
 
-    updated = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+    updated = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
     assert updated.retry_count == 3
     assert updated.status == OutboxStatus.FAILED
 
@@ -1,7 +1,12 @@
+from datetime import datetime
+
 # Import du module pytest pour les tests
 import pytest
+from sqlalchemy import event, select
 
+from app.repositories.patients_crud import prefix_tsquery
 from app.sql import models
+from app.utils.normalization import normalize_search_key
 
 
 @pytest.mark.asyncio
@@ -144,6 +149,89 @@ async def test_pagination_limit_extreme(ac, internal_token, patients):
     assert len(result["data"]) == 21
 
 
+async def _parcours_par_curseur(ac, headers, url):
+    """Parcourt toutes les pages en suivant next_cursor"""
+    ids, cursor = [], None
+    while True:
+        response = await ac.get(
+            url + (f"&cursor={cursor}" if cursor else ""), headers=headers
+        )
+        assert response.status_code == 200
+        result = response.json()
+        ids.extend(patient["id_patient"] for patient in result["data"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("field", ["nom", "prenom", "date_de_naissance", "email"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pagination_curseur_meme_ordre_que_les_pages(
+    ac, internal_token, patients, field, order
+):
+    """Test le parcours par curseur: mêmes patients, dans le même ordre, que par pages"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    url = f"/api/patients/?limit=5&field={field}&order={order}"
+
+    # Parcours par numéro de page
+    by_page = []
+    for page in range(1, 6):
+        response = await ac.get(f"{url}&page={page}", headers=headers)
+        by_page.extend(patient["id_patient"] for patient in response.json()["data"])
+
+    by_cursor = await _parcours_par_curseur(ac, headers, url)
+
+    assert by_cursor == by_page
+    assert sorted(by_cursor) == list(range(1, 22))
+
+
+@pytest.mark.asyncio
+async def test_search_curseur(ac, internal_token, patients):
+    """Test le parcours par curseur d'une recherche"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+
+    ids = await _parcours_par_curseur(
+        ac, headers, "/api/patients/search?search=test&limit=7"
+    )
+
+    # Les 20 patients nom_test_*, et "toto" par son prénom prenom_test_19
+    assert sorted(ids) == list(range(1, 22))
+
+
+@pytest.mark.asyncio
+async def test_pagination_curseur_invalide(ac, internal_token, patients):
+    """Test le rejet d'un curseur illisible ou émis pour un autre tri"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    response = await ac.get("/api/patients/?limit=5&field=nom", headers=headers)
+    cursor = response.json()["next_cursor"]
+
+    for url in (
+        "/api/patients/?cursor=pas_un_curseur",
+        f"/api/patients/?field=prenom&cursor={cursor}",
+        f"/api/patients/?field=nom&order=desc&cursor={cursor}",
+    ):
+        response = await ac.get(url, headers=headers)
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid_cursor"}
+
+
+@pytest.mark.asyncio
+async def test_pagination_page_hors_limites(ac, internal_token, patients):
+    """Test qu'une page au-delà de la dernière est vide (pas de retour à la page 1)"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    response = await ac.get("/api/patients/?limit=5&page=10", headers=headers)
+
+    result = response.json()
+
+    assert response.status_code == 200
+    assert result["data"] == []
+    assert result["next_cursor"] is None
+    # Petite table: total exact
+    assert result["total"] == 21
+    assert result["total_estimated"] is False
+
+
 @pytest.mark.asyncio
 async def test_search_patients(ac, internal_token, patients):
     """Test la recherche d'un patient spécifique"""
@@ -170,13 +258,135 @@ async def test_search_mass_patients(ac, internal_token, patients):
 
     result = response.json()
 
-    # Vérification des résultats multiples
+    # Vérification des résultats multiples (prénoms compris)
     assert response.status_code == 200
-    assert result["total"] == 20
+    assert result["total"] == 21
     assert len(result["data"]) == 10
     assert result["data"][0]["nom"] == "nom_test_0"
 
 
+@pytest.mark.asyncio
+async def test_search_prenom_et_ville(ac, internal_token, patients):
+    """Test la recherche sur le prénom et sur la ville"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+
+    response = await ac.get(
+        "/api/patients/search?search=prenom_test_3&field=prenom", headers=headers
+    )
+    assert [patient["prenom"] for patient in response.json()["data"]] == [
+        "prenom_test_3"
+    ]
+
+    response = await ac.get("/api/patients/search?search=gelos", headers=headers)
+    assert response.json()["total"] == 21
+
+
+@pytest.mark.asyncio
+async def test_tri_pertinence_reserve_a_la_recherche(ac, internal_token, patients):
+    """Test que le tri par pertinence n'est accepté que par la recherche"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+
+    response = await ac.get("/api/patients/?field=pertinence", headers=headers)
+    assert response.status_code == 422
+
+    response = await ac.get(
+        "/api/patients/search?search=toto&field=pertinence", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][0]["nom"] == "toto"
+
+
+@pytest.mark.asyncio
+async def test_search_sans_caractere_de_mot(ac, internal_token, patients):
+    """Test qu'une saisie sans lettre ni chiffre ne retourne aucun patient"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    for search in ("-", "().", "+"):
+        response = await ac.get(
+            "/api/patients/search", params={"search": search}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+        assert response.json()["data"] == []
+
+
+def test_prefix_tsquery():
+    """Test la construction de la requête plein texte depuis la saisie"""
+    assert prefix_tsquery("Ber nard") == "ber:* & nard:*"
+    assert prefix_tsquery("Jean-Pierre") == "jean:* & pierre:*"
+    assert prefix_tsquery("nom_test_3") == "nom:* & test:* & 3:*"
+    # Les opérateurs tsquery saisis sont ignorés
+    assert prefix_tsquery("a' & !b | (c)") == "a:* & b:* & c:*"
+    assert prefix_tsquery(" - ") is None
+
+
+@pytest.mark.asyncio
+async def test_autocomplete(ac, internal_token, patients):
+    """Test les suggestions par préfixe, triées et limitées"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    response = await ac.get(
+        "/api/patients/autocomplete?q=NOM_TEST_1&limit=3", headers=headers
+    )
+
+    assert response.status_code == 200
+    # nom_test_1 puis nom_test_10, nom_test_11, ... dans l'ordre de la clé
+    assert response.json() == [
+        {"patient_id": 2, "full_name": "nom_test_1 prenom_test_1"},
+        {"patient_id": 11, "full_name": "nom_test_10 prenom_test_10"},
+        {"patient_id": 12, "full_name": "nom_test_11 prenom_test_11"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_sans_accents(ac, internal_token, patients):
+    """Test que la saisie ignore casse et accents, y compris après modification"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    patient_data = {
+        "civilite": "Madame",
+        "nom": "Lefèvre",
+        "prenom": "Élodie",
+        "date_de_naissance": "1990-01-01",
+        "adresse": "1 rue du Test",
+        "code_postal": "75000",
+        "ville": "Paris",
+        "telephone": "0123456789",
+    }
+    response = await ac.put("/api/patients/21", headers=headers, json=patient_data)
+    assert response.status_code == 200
+
+    for q in ("lefevre", "LEFÈVRE él", "Lefevre-Elo"):
+        response = await ac.get(f"/api/patients/autocomplete?q={q}", headers=headers)
+        assert response.json() == [{"patient_id": 21, "full_name": "Lefèvre Élodie"}]
+
+    # L'ancien nom ne correspond plus
+    response = await ac.get("/api/patients/autocomplete?q=toto", headers=headers)
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_saisie_invalide(ac, internal_token, patients):
+    """Test le rejet d'une saisie vide ou d'une limite hors bornes"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    for url in (
+        "/api/patients/autocomplete?q=",
+        "/api/patients/autocomplete?q=ab&limit=0",
+        "/api/patients/autocomplete?q=ab&limit=51",
+    ):
+        response = await ac.get(url, headers=headers)
+        assert response.status_code == 422
+
+    # Aucun caractère de mot: aucune suggestion
+    response = await ac.get("/api/patients/autocomplete?q=-", headers=headers)
+    assert response.json() == []
+
+
+def test_normalize_search_key():
+    """Test la clé normalisée: minuscules, sans accents ni ponctuation"""
+    assert normalize_search_key("Lefèvre-Cœur", "Élodie") == "lefevre coeur elodie"
+    assert normalize_search_key("  D'Aubigné ", None) == "d aubigne"
+    assert normalize_search_key("Ünal", "Ærøskøbing") == "unal aeroskobing"
+
+
 @pytest.mark.asyncio
 async def test_no_data_found_from_search(ac, internal_token, patients):
     """Test la recherche ne retournant aucun résultat"""
@@ -254,6 +464,55 @@ async def test_get_patient_detail_success(ac, internal_token, patients):
     assert result["documents"][1]["nom_fichier"] == "document_test_1"
 
 
+@pytest.mark.asyncio
+async def test_get_patient_detail_derniere_admission(
+    ac, internal_token, patients, db_session, engine
+):
+    """Test que le détail renvoie l'admission la plus récente, en une requête"""
+    headers = {"Authorization": f"Bearer {internal_token}"}
+    # La plus récente est insérée en premier: l'ordre vient de created_at
+    db_session.add_all(
+        [
+            models.Admission(
+                patient_id=1,
+                entree_le=datetime(2026, 3, 1),
+                ambulatoire=True,
+                created_at=datetime(2026, 3, 1),
+            ),
+            models.Admission(
+                patient_id=1,
+                entree_le=datetime(2026, 1, 1),
+                ambulatoire=True,
+                sorti_le=datetime(2026, 1, 2),
+                created_at=datetime(2026, 1, 1),
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = await ac.get("/api/patients/detail/1", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    result = response.json()
+    assert response.status_code == 200
+    assert result["latest_admission"]["entree_le"] == "2026-03-01T00:00:00"
+    assert result["latest_admission"]["sorti_le"] is None
+    assert [document["nom_fichier"] for document in result["documents"]] == [
+        "document_test_0",
+        "document_test_1",
+    ]
+    # Patient, dernière admission et documents: une seule requête
+    assert len(statements) == 1
+
+
 @pytest.mark.asyncio
 async def test_create_patient_no_cookie(ac):
     """Test la création d'un patient sans authentification"""
@@ -428,7 +687,7 @@ async def test_update_patient_wrong_token(ac, wrong_internal_token):
 async def test_update_patient_success(ac, db_session, internal_token):
     """Test la mise à jour réussie d'un patient"""
 
-    patient = db_session.query(models.Patient).first()
+    patient = await db_session.scalar(select(models.Patient).limit(1))
     if not patient:
         print("NO PATIENT FOUND")
         return
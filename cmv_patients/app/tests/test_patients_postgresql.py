@@ -0,0 +1,148 @@
+"""
+Requêtes propres à PostgreSQL, compilées avec son dialecte.
+
+Les tests de l'application tournent sur aiosqlite: la recherche plein texte,
+l'autocomplétion text_pattern_ops et l'estimation reltuples n'y sont jamais
+exécutées. Les requêtes émises sont ici enregistrées par une session
+factice puis compilées pour PostgreSQL.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.patients_crud import PgPatientsRepository
+from app.utils.config import COUNT_ESTIMATE_MIN_ROWS
+
+
+class EmptyResult(list):
+    """Résultat sans ligne, parcouru ou lu par all()."""
+
+    def all(self) -> list:
+        return []
+
+
+class RecordingSession:
+    """Session PostgreSQL factice: enregistre les requêtes sans les exécuter."""
+
+    def __init__(self, estimate: int | None = None, total: int = 0):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.statements = []
+        self._estimate = estimate
+        self._total = total
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return EmptyResult()
+
+    async def scalar(self, statement, params=None):
+        self.statements.append(statement)
+        return self._estimate if "reltuples" in str(statement) else self._total
+
+    def compiled(self) -> list:
+        return [
+            statement.compile(dialect=postgresql.dialect())
+            for statement in self.statements
+        ]
+
+
+@pytest.mark.asyncio
+async def test_search_plein_texte_par_pertinence():
+    """Test le filtre tsvector @@ tsquery et le tri par ts_rank décroissant"""
+    db = RecordingSession()
+
+    await PgPatientsRepository().search_patients(
+        db, "Ber nard", 1, 10, field="pertinence", order="asc"
+    )
+
+    select_sql, count_sql = db.compiled()
+    assert (
+        "patient.search_vector @@ CAST(%(param_1)s AS TSQUERY)" in select_sql.string
+    )
+    assert select_sql.params["param_1"] == "ber:* & nard:*"
+    # Pertinence toujours décroissante, départagée par l'id
+    assert (
+        "ORDER BY ts_rank(patient.search_vector, CAST(%(param_1)s AS TSQUERY)) DESC"
+        in select_sql.string
+    )
+    assert "ilike" not in select_sql.string.lower()
+    assert "count(patient.id_patient)" in count_sql.string
+    assert "@@" in count_sql.string
+
+
+@pytest.mark.asyncio
+async def test_search_plein_texte_tri_par_champ():
+    """Test le tri par colonne quand la pertinence n'est pas demandée"""
+    db = RecordingSession()
+
+    await PgPatientsRepository().search_patients(db, "toto", 1, 10, field="prenom")
+
+    select_sql = db.compiled()[0].string
+    assert "@@" in select_sql
+    assert "ts_rank" not in select_sql
+    assert "ORDER BY patient.prenom ASC" in select_sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search", ["%%", "-", "  ", ""])
+async def test_search_sans_caractere_de_mot_sans_requete(search):
+    """Test qu'une tsquery vide ne lit pas toute la table"""
+    db = RecordingSession()
+
+    result = await PgPatientsRepository().search_patients(db, search, 1, 10)
+
+    assert result == {
+        "data": [],
+        "total": 0,
+        "total_estimated": False,
+        "next_cursor": None,
+    }
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_text_pattern_ops():
+    """Test les opérateurs et le tri utilisables par l'index text_pattern_ops"""
+    db = RecordingSession()
+
+    await PgPatientsRepository().autocomplete_patients(db, "Lefèvre É", 5)
+
+    (statement,) = db.compiled()
+    assert "patient.search_key ~>=~ %(search_key_1)s" in statement.string
+    assert "patient.search_key ~<~ %(search_key_2)s" in statement.string
+    assert "ORDER BY patient.search_key USING ~<~" in statement.string
+    assert statement.params["search_key_1"] == "lefevre e"
+    assert statement.params["search_key_2"] == "lefevre f"
+
+
+@pytest.mark.asyncio
+async def test_total_estime_par_reltuples():
+    """Test le total lu dans pg_class pour une grande table sans filtre"""
+    db = RecordingSession(estimate=COUNT_ESTIMATE_MIN_ROWS)
+
+    result = await PgPatientsRepository().read_all_patients(db, 1, 10)
+
+    assert (result["total"], result["total_estimated"]) == (
+        COUNT_ESTIMATE_MIN_ROWS,
+        True,
+    )
+    assert len(db.statements) == 2
+    assert "reltuples" in db.compiled()[1].string
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "estimate, exact_total",
+    [(COUNT_ESTIMATE_MIN_ROWS - 1, False), (-1, False), (None, True)],
+)
+async def test_total_exact(estimate, exact_total):
+    """Test le count(*) pour une petite table, sans statistiques ou à la demande"""
+    db = RecordingSession(estimate=estimate, total=42)
+
+    result = await PgPatientsRepository().read_all_patients(
+        db, 1, 10, exact_total=exact_total
+    )
+
+    assert (result["total"], result["total_estimated"]) == (42, False)
+    assert "count(patient.id_patient)" in db.compiled()[-1].string
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
+from sqlalchemy import select
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
 from app.repositories.outbox_crud import PgOutboxRepository
@@ -67,7 +68,7 @@ class TestSagaEngineDeleteAdmission:
         """Une admission ambulatoire ne déclenche pas d'appel HTTP."""
         admission = _make_admission(ambulatoire=True, ref_reservation=None)
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         http_client = AsyncMock(spec=httpx.AsyncClient)
 
@@ -84,7 +85,7 @@ class TestSagaEngineDeleteAdmission:
         """Annulation réussie (200) → admission supprimée, log INFO."""
         admission = _make_admission()
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -106,7 +107,7 @@ class TestSagaEngineDeleteAdmission:
         """Annulation avec 404 (réservation déjà annulée) → succès."""
         admission = _make_admission()
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -125,7 +126,8 @@ class TestSagaEngineDeleteAdmission:
         """Échec HTTP 500 → outbox insérée, rollback, HTTPException 400."""
         admission = _make_admission()
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
+        admission_id = admission.id_admission
 
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -139,10 +141,8 @@ class TestSagaEngineDeleteAdmission:
 
         assert exc_info.value.status_code == 400
         # L'admission doit toujours exister après rollback
-        remaining = (
-            db_session.query(Admission)
-            .filter(Admission.id_admission == admission.id_admission)
-            .first()
+        remaining = await db_session.scalar(
+            select(Admission).where(Admission.id_admission == admission_id)
         )
         assert remaining is not None
 
@@ -153,7 +153,7 @@ class TestSagaEngineDeleteAdmission:
         """Erreur réseau → outbox insérée, rollback, HTTPException 400."""
         admission = _make_admission()
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         http_client = AsyncMock(spec=httpx.AsyncClient)
         http_client.delete.side_effect = httpx.ConnectError("connection refused")
@@ -172,7 +172,7 @@ class TestSagaEngineDeleteAdmission:
         """Les headers Authorization, X-Real-IP, X-Forwarded-For sont transmis."""
         admission = _make_admission()
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -215,7 +215,7 @@ class TestSagaEngineDeleteAdmission:
         """Échec de compensation → logger.error appelé avec les bons détails."""
         admission = _make_admission(admission_id=99, ref_reservation=77)
         db_session.add(admission)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 503
@@ -265,7 +265,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Retry réussi (200) → statut COMPLETED, compteur successes incrémenté."""
         entry = _make_outbox_entry(retry_count=1)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -278,7 +278,7 @@ class TestSagaEngineRetryPendingCompensations:
         assert result["successes"] == 1
         assert result["failures"] == 0
 
-        refreshed = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+        refreshed = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
         assert refreshed.status == OutboxStatus.COMPLETED
 
     @pytest.mark.asyncio
@@ -288,7 +288,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Retry avec 404 (réservation déjà annulée) → COMPLETED."""
         entry = _make_outbox_entry(retry_count=0)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -308,7 +308,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Retry échoué → retry_count incrémenté, statut reste PENDING."""
         entry = _make_outbox_entry(retry_count=1)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -321,7 +321,7 @@ class TestSagaEngineRetryPendingCompensations:
         assert result["successes"] == 0
         assert result["failures"] == 1
 
-        refreshed = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+        refreshed = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
         assert refreshed.retry_count == 2
 
     @pytest.mark.asyncio
@@ -331,7 +331,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Seuil de retry atteint → statut FAILED, logger.critical appelé."""
         entry = _make_outbox_entry(retry_count=4)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -343,7 +343,7 @@ class TestSagaEngineRetryPendingCompensations:
 
         assert result["failures"] == 1
 
-        refreshed = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+        refreshed = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
         assert refreshed.status == OutboxStatus.FAILED
 
         # Vérifier que logger.critical a été appelé
@@ -358,7 +358,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Le retry utilise un token de service, pas le token utilisateur."""
         entry = _make_outbox_entry(retry_count=0)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -383,7 +383,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Erreur réseau pendant retry → retry_count incrémenté, PENDING conservé."""
         entry = _make_outbox_entry(retry_count=0)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         http_client = AsyncMock(spec=httpx.AsyncClient)
         http_client.delete.side_effect = httpx.ConnectError("connection refused")
@@ -394,7 +394,7 @@ class TestSagaEngineRetryPendingCompensations:
         assert result["failures"] == 1
         assert result["successes"] == 0
 
-        refreshed = db_session.query(OutboxEntry).filter(OutboxEntry.id == entry.id).first()
+        refreshed = await db_session.scalar(select(OutboxEntry).where(OutboxEntry.id == entry.id))
         assert refreshed.retry_count == 1
 
     @pytest.mark.asyncio
@@ -417,7 +417,7 @@ class TestSagaEngineRetryPendingCompensations:
         """Retry réussi → logger.info appelé."""
         entry = _make_outbox_entry(retry_count=0)
         db_session.add(entry)
-        db_session.commit()
+        await db_session.commit()
 
         mock_response = MagicMock()
         mock_response.status_code = 200
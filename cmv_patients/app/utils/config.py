@@ -25,6 +25,17 @@ class PatientsSettings(BaseSettings):
 
     # Base de données — obligatoire
     PATIENTS_DATABASE_URL: str
+    # Pool de connexions asyncpg (par worker)
+    PATIENTS_DB_POOL_SIZE: int = 10
+    PATIENTS_DB_MAX_OVERFLOW: int = 10
+    # Attente maximale d'une connexion libre, en secondes
+    PATIENTS_DB_POOL_TIMEOUT: float = 10.0
+    # Renouvellement des connexions, en secondes
+    PATIENTS_DB_POOL_RECYCLE: int = 1800
+    # Durée maximale d'une requête SQL, en secondes
+    PATIENTS_DB_COMMAND_TIMEOUT: float = 30.0
+    # En deçà, le total non filtré est compté exactement plutôt qu'estimé
+    PATIENTS_COUNT_ESTIMATE_MIN_ROWS: int = 10_000
 
     # JWT — SECRET_KEY obligatoire, ALGORITHM avec défaut
     SECRET_KEY: str
@@ -79,6 +90,12 @@ settings = PatientsSettings()
 
 # Aliases pour la compatibilité avec le code existant
 DATABASE_URL = settings.PATIENTS_DATABASE_URL
+DB_POOL_SIZE = settings.PATIENTS_DB_POOL_SIZE
+DB_MAX_OVERFLOW = settings.PATIENTS_DB_MAX_OVERFLOW
+DB_POOL_TIMEOUT = settings.PATIENTS_DB_POOL_TIMEOUT
+DB_POOL_RECYCLE = settings.PATIENTS_DB_POOL_RECYCLE
+DB_COMMAND_TIMEOUT = settings.PATIENTS_DB_COMMAND_TIMEOUT
+COUNT_ESTIMATE_MIN_ROWS = settings.PATIENTS_COUNT_ESTIMATE_MIN_ROWS
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ENVIRONMENT = settings.ENVIRONMENT
@@ -1,19 +1,61 @@
+import re
+
 # Import des dépendances SQLAlchemy nécessaires
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 # Import des variables d'environnement
-from .config import DATABASE_URL, ENVIRONMENT
+from .config import (
+    DATABASE_URL,
+    DB_COMMAND_TIMEOUT,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    ENVIRONMENT,
+)
 
 # Configuration de la base de données
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL must be set")
-engine = create_engine(DATABASE_URL)
+
+
+def to_async_url(url: str) -> str:
+    """Convertit l'URL de la base vers son driver asynchrone (asyncpg, aiosqlite)."""
+    # PATIENTS_DATABASE_URL peut désigner n'importe quel driver
+    # (postgresql+psycopg2:// pour alembic, postgresql+asyncpg://, ...)
+    url = re.sub(r"^sqlite(\+\w+)?://", "sqlite+aiosqlite://", url, count=1)
+    return re.sub(r"^postgresql(\+\w+)?://", "postgresql+asyncpg://", url, count=1)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    # Base SQLite en mémoire (tests): une seule connexion partagée
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={"command_timeout": DB_COMMAND_TIMEOUT},
+    )
 
 print(f"DATA BASE : {ENVIRONMENT} {DATABASE_URL}")
 
-# Création de la factory de sessions de base de données
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Création de la factory de sessions asynchrones: les objets restent
+# lisibles après commit, sans nouvelle requête (pas de lazy loading en async)
+SessionLocal = async_sessionmaker(
+    engine, autoflush=False, expire_on_commit=False
+)
 
 # Création de la classe de base pour les modèles SQLAlchemy
 class Base(DeclarativeBase):
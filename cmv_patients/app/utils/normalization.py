@@ -0,0 +1,39 @@
+"""
+Normalisation des noms pour la recherche insensible à la casse et aux accents.
+
+La même fonction calcule la clé stockée (Patient.search_key) et normalise la
+saisie de l'utilisateur, les deux sont donc toujours comparables.
+"""
+
+import re
+import unicodedata
+
+# Ligatures et lettres barrées, que la décomposition Unicode ne sépare pas
+_LIGATURES = str.maketrans(
+    {
+        "œ": "oe",
+        "Œ": "OE",
+        "æ": "ae",
+        "Æ": "AE",
+        "ß": "ss",
+        "ø": "o",
+        "Ø": "O",
+        "ł": "l",
+        "Ł": "L",
+        "đ": "d",
+        "Đ": "D",
+    }
+)
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_search_key(*parts: str | None) -> str:
+    """
+    Clé de recherche: minuscules, sans accents, mots séparés par une espace.
+
+    Exemple: ("Lefèvre-Cœur", "Élodie") -> "lefevre coeur elodie"
+    """
+    text = " ".join(part for part in parts if part).translate(_LIGATURES)
+    # NFKD: les lettres accentuées sont décomposées, les accents retirés
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _SEPARATORS.sub(" ", text.lower()).strip()
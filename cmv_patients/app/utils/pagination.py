@@ -0,0 +1,86 @@
+"""
+Pagination par clé (keyset) sur (champ de tri, identifiant).
+
+Le curseur encode la clé de tri et l'identifiant de la dernière ligne
+renvoyée: la page suivante est lue par une comparaison de tuples
+(champ, id) > (valeur, dernier id), servie par l'index composite du champ,
+en temps constant quelle que soit la profondeur.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, literal_column, tuple_
+
+
+def sort_key(column):
+    """
+    Expression de tri d'une colonne (ou d'une expression calculée).
+
+    Les colonnes nullables sont triées sur coalesce(colonne, '') pour que la
+    comparaison de tuples reste valide (et indexable) sur toutes les lignes.
+    """
+    if getattr(column, "nullable", False):
+        # Littéral, et non paramètre: l'expression doit être celle de l'index
+        return func.coalesce(column, literal_column("''"))
+    return column
+
+
+def order_by_clauses(column, id_column, order: str) -> list:
+    """Clause ORDER BY (clé de tri, id), dans le même sens."""
+    key = sort_key(column)
+    if order.lower() == "desc":
+        return [key.desc(), id_column.desc()]
+    return [key.asc(), id_column.asc()]
+
+
+def keyset_condition(column, id_column, order: str, value, last_id: int):
+    """Lignes strictement après (value, last_id) dans l'ordre de tri."""
+    row = tuple_(sort_key(column), id_column)
+    if order.lower() == "desc":
+        return row < tuple_(value, last_id)
+    return row > tuple_(value, last_id)
+
+
+def encode_cursor(field: str, order: str, value, last_id: int) -> str:
+    """Sérialise la position de la dernière ligne en curseur opaque."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([field, order.lower(), value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str, order: str, column) -> tuple:
+    """
+    Relit un curseur produit par encode_cursor.
+
+    Returns:
+        tuple: (valeur de la clé de tri, dernier id)
+    Raises:
+        HTTPException: Si le curseur est invalide ou a été émis pour un autre tri
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_field, cursor_order, value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        if cursor_field != field or cursor_order != order.lower():
+            raise ValueError("cursor sort mismatch")
+        if not isinstance(last_id, int):
+            raise ValueError("cursor id must be an integer")
+        python_type = column.type.python_type
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif python_type is float:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError("cursor value must be a number")
+            value = float(value)
+        elif not isinstance(value, str):
+            raise ValueError("cursor value must be a string")
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_cursor"
+        ) from e
+    return value, last_id
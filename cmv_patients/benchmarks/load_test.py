@@ -0,0 +1,261 @@
+"""
+Concurrent load test of the cmv_patients read endpoints.
+
+Runs the application in-process (httpx ASGITransport, one event loop, like
+one uvicorn worker) against the database of PATIENTS_DATABASE_URL, and
+measures throughput and latency under N concurrent clients for:
+- list: GET /api/patients/ (random page, sorted by nom);
+- search: GET /api/patients/search (random 3-letter prefix);
+- detail: GET /api/patients/detail/{id} (random patient).
+
+The database is seeded with --patients synthetic patients (half of them
+with a closed admission) if it holds fewer.
+
+Usage (from cmv_patients/, with the service configuration in the environment):
+    python -m benchmarks.load_test --concurrency 1,16,64 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ENDPOINTS = ("list", "search", "detail")
+SEED = 42
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Percentile par interpolation linéaire d'une liste triée."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def summarize(name: str, concurrency: int, duration_s: float, samples_ms: list[float]) -> dict:
+    """Débit et latences d'un endpoint pour un niveau de concurrence."""
+    ordered = sorted(samples_ms)
+    return {
+        "name": name,
+        "concurrency": concurrency,
+        "requests": len(ordered),
+        "requests_per_s": len(ordered) / duration_s,
+        "mean_ms": statistics.fmean(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) if ordered else 0.0,
+        "p95_ms": percentile(ordered, 0.95) if ordered else 0.0,
+        "p99_ms": percentile(ordered, 0.99) if ordered else 0.0,
+    }
+
+
+def seed_database(n_patients: int) -> int:
+    """Insère des patients synthétiques si la base en contient moins; retourne le total."""
+    from sqlalchemy import create_engine, func, insert, select
+
+    from app.sql.models import Admission, Base, Patient
+    from app.utils.config import DATABASE_URL
+    from app.utils.normalization import normalize_search_key
+
+    # Connexion synchrone (psycopg2), indépendante de la couche d'accès testée
+    engine = create_engine(
+        DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    )
+    Base.metadata.create_all(engine)
+    rng = random.Random(SEED)
+    syllables = ["ma", "ri", "lo", "du", "ber", "nard", "mon", "tes", "qui", "eu", "gar", "cia"]
+
+    def name() -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+
+    def patient() -> dict:
+        nom, prenom = name(), name()
+        return {
+            "civilite": rng.choice(["MONSIEUR", "MADAME", "AUTRE"]),
+            "nom": nom,
+            "prenom": prenom,
+            # Insertion en masse: pas d'événement ORM pour calculer la clé
+            "search_key": normalize_search_key(nom, prenom),
+            "date_de_naissance": datetime(1940, 1, 1)
+            + timedelta(days=rng.randint(0, 30_000)),
+            "adresse": f"{rng.randint(1, 200)} rue {name()}",
+            "code_postal": f"{rng.randint(1000, 95999):05d}",
+            "ville": name(),
+            "telephone": f"06{rng.randint(0, 99_999_999):08d}",
+        }
+
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count(Patient.id_patient))).scalar()
+        missing = n_patients - existing
+        for start in range(0, max(0, missing), 10_000):
+            rows = [patient() for _ in range(min(10_000, missing - start))]
+            ids = conn.execute(
+                insert(Patient).returning(Patient.id_patient), rows
+            ).scalars().all()
+            # Une admission clôturée pour un patient sur deux
+            admissions = [
+                {
+                    "patient_id": patient_id,
+                    "entree_le": datetime(2025, 1, 1) + timedelta(days=rng.randint(0, 300)),
+                    "sorti_le": datetime(2025, 11, 1),
+                    "ambulatoire": True,
+                }
+                for patient_id in ids[::2]
+            ]
+            if admissions:
+                conn.execute(insert(Admission), admissions)
+        total = conn.execute(select(func.count(Patient.id_patient))).scalar()
+    engine.dispose()
+    return total
+
+
+async def run_level(client, headers, concurrency: int, duration_s: float, max_id: int) -> list[dict]:
+    """Lance concurrency clients pendant duration_s secondes."""
+    rng = random.Random(SEED + concurrency)
+    samples: dict[str, list[float]] = {name: [] for name in ENDPOINTS}
+    errors = 0
+    prefixes = ["Ma", "Ri", "Lo", "Du", "Ber", "Mon", "Tes", "Gar"]
+
+    def request_for(endpoint: str) -> str:
+        if endpoint == "list":
+            return f"/api/patients/?page={rng.randint(1, 50)}&limit=20&field=nom&order=asc"
+        if endpoint == "search":
+            return f"/api/patients/search?search={rng.choice(prefixes)}&page=1&limit=20"
+        return f"/api/patients/detail/{rng.randint(1, max_id)}"
+
+    deadline = time.perf_counter() + duration_s
+
+    async def client_loop():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            endpoint = rng.choice(ENDPOINTS)
+            started = time.perf_counter()
+            response = await client.get(request_for(endpoint), headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code >= 500:
+                errors += 1
+            samples[endpoint].append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed_s = time.perf_counter() - started
+
+    results = [
+        summarize(name, concurrency, elapsed_s, samples[name]) for name in ENDPOINTS
+    ]
+    results.append(
+        summarize(
+            "all",
+            concurrency,
+            elapsed_s,
+            [sample for name in ENDPOINTS for sample in samples[name]],
+        )
+        | {"server_errors": errors}
+    )
+    return results
+
+
+async def run(args, max_id: int) -> list[dict]:
+    """Démarre l'application en process et mesure chaque niveau de concurrence."""
+    import httpx
+    from jose import jwt
+
+    from app.main import app
+    from app.utils.config import ALGORITHM, SECRET_KEY
+    from app.utils.database import engine
+
+    token = jwt.encode(
+        {
+            "user_id": 0,
+            "role": "home",
+            "source": "api_gateway",
+            "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    headers = {"Authorization": f"Bearer {token}", "X-Real-IP": "127.0.0.1"}
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Échauffement: connexions ouvertes, requêtes préparées
+        await run_level(client, headers, max(args.concurrency), 1.0, max_id)
+        for concurrency in args.concurrency:
+            results.extend(
+                await run_level(client, headers, concurrency, args.duration, max_id)
+            )
+            print(f"concurrency={concurrency} done", file=sys.stderr)
+    # Connexions rendues avant la fermeture de la boucle
+    await engine.dispose()
+    return results
+
+
+def git_commit() -> str | None:
+    """Commit courant, None hors dépôt git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_metadata(args, n_patients: int) -> dict:
+    """Contexte d'exécution, pour ne comparer que des résultats comparables."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "patients": n_patients,
+        "duration_s": args.duration,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="load.json", help="Fichier JSON de sortie")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[1, 16, 64],
+        help="Nombres de clients simultanés, séparés par des virgules (défaut: 1,16,64)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Secondes par niveau")
+    parser.add_argument("--patients", type=int, default=100_000)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    n_patients = seed_database(args.patients)
+    results = asyncio.run(run(args, n_patients))
+
+    report = {"metadata": collect_metadata(args, n_patients), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for row in results:
+        print(
+            f"{row['name']:<8} concurrency={row['concurrency']:<4} "
+            f"req/s={row['requests_per_s']:8.1f} "
+            f"p50={row['p50_ms']:8.2f}ms p95={row['p95_ms']:8.2f}ms "
+            f"p99={row['p99_ms']:8.2f}ms"
+        )
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark of the patient search on a large synthetic dataset.
+
+Compares, for a set of search terms, the latency of one search page
+(first page of 20 results and total count):
+- ilike: the former query, nom ILIKE '%term%' sorted by nom (sequential scan);
+- fulltext_rank: the full-text search over nom, prenom and ville, ranked by
+  relevance (GIN index on patient.search_vector);
+- fulltext_nom: the same full-text search sorted by nom.
+
+Requires PostgreSQL with the search_vector migration applied. The database
+of PATIENTS_DATABASE_URL is seeded with --patients synthetic patients (see
+benchmarks.load_test) if it holds fewer.
+
+Usage (from cmv_patients/, with the service configuration in the environment):
+    python -m benchmarks.search_benchmark --patients 1000000 --output search.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.load_test import git_commit, seed_database, summarize
+
+# Préfixe fréquent, préfixe rare, mot entier, deux mots, aucun résultat
+TERMS = ("ma", "gar", "mariber", "ber nard", "xyz")
+VARIANTS = ("ilike", "fulltext_rank", "fulltext_nom")
+
+
+async def search_once(repository, db, variant: str, term: str) -> dict:
+    """Une page de recherche (20 résultats et total) pour une variante."""
+    from app.sql.models import Patient
+
+    if variant == "ilike":
+        return await repository.paginate_and_order(
+            db, Patient, 1, 20, "nom", "asc", [Patient.nom.ilike(f"%{term}%")]
+        )
+    field = "pertinence" if variant == "fulltext_rank" else "nom"
+    return await repository.search_patients(db, term, 1, 20, field, "asc")
+
+
+async def run(args) -> list[dict]:
+    """Mesure chaque couple (variante, terme) args.repeat fois."""
+    from sqlalchemy import text
+
+    from app.repositories.patients_crud import PgPatientsRepository
+    from app.utils.database import SessionLocal, engine
+
+    repository = PgPatientsRepository()
+    results = []
+    async with SessionLocal() as db:
+        await db.execute(text("ANALYZE patient"))
+        for term in TERMS:
+            for variant in VARIANTS:
+                # Échauffement: cache de la base et requête préparée
+                page = await search_once(repository, db, variant, term)
+                samples = []
+                started_all = time.perf_counter()
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    await search_once(repository, db, variant, term)
+                    samples.append((time.perf_counter() - started) * 1000)
+                row = summarize(
+                    variant, 1, time.perf_counter() - started_all, samples
+                ) | {"term": term, "matches": page["total"]}
+                results.append(row)
+                print(f"{term!r} {variant} done", file=sys.stderr)
+    await engine.dispose()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="search.json", help="Fichier JSON de sortie")
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="Mesures par requête")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    n_patients = seed_database(args.patients)
+    results = asyncio.run(run(args))
+
+    metadata = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "patients": n_patients,
+        "repeat": args.repeat,
+        "cpu_count": os.cpu_count(),
+    }
+    with open(args.output, "w") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=2)
+
+    for row in results:
+        print(
+            f"{row['term']:<10} {row['name']:<14} matches={row['matches']:<8} "
+            f"p50={row['p50_ms']:8.2f}ms p95={row['p95_ms']:8.2f}ms"
+        )
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
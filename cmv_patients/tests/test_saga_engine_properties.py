@@ -13,8 +13,8 @@ import httpx
 import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Delete, delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from app.repositories.admissions_crud import PgAdmissionsRepository
@@ -58,22 +58,31 @@ ip_addresses = st.tuples(
 
 # We use a module-level engine so Hypothesis iterations each get a fresh
 # session via _fresh_session(), avoiding stale-state issues after rollback.
+# The aiosqlite connection is bound to an event loop: all tests of the
+# module share one loop.
 
-_ENGINE = create_engine(
-    "sqlite:///:memory:",
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+_ENGINE = create_async_engine(
+    "sqlite+aiosqlite:///:memory:",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-Base.metadata.create_all(_ENGINE)
-_SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=_ENGINE)
+_SessionFactory = async_sessionmaker(_ENGINE, autoflush=False, expire_on_commit=False)
+_schema_created = False
 
 
-def _fresh_session():
+async def _fresh_session():
     """Return a new session after cleaning all rows."""
+    global _schema_created
+    if not _schema_created:
+        async with _ENGINE.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_created = True
     session = _SessionFactory()
-    session.query(OutboxEntry).delete()
-    session.query(Admission).delete()
-    session.commit()
+    await session.execute(delete(OutboxEntry))
+    await session.execute(delete(Admission))
+    await session.commit()
     return session
 
 
@@ -99,11 +108,11 @@ def _make_admission(admission_id, patient_id, ref_reservation):
     )
 
 
-def _insert_admission(session, admission_id, patient_id, ref_reservation):
+async def _insert_admission(session, admission_id, patient_id, ref_reservation):
     adm = _make_admission(admission_id, patient_id, ref_reservation)
     session.add(adm)
-    session.commit()
-    session.refresh(adm)
+    await session.commit()
+    await session.refresh(adm)
     return adm
 
 
@@ -144,7 +153,7 @@ class TestProperty1LoggingStructure:
     ):
         """Pour toute compensation réussie (200/404), logger.info est appelé
         avec admission_id et compensation_type."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -153,7 +162,7 @@ class TestProperty1LoggingStructure:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
 
@@ -163,8 +172,8 @@ class TestProperty1LoggingStructure:
                 for c in info_calls
             ), f"Expected logger.info with admission_id={admission_id}, got: {info_calls}"
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -185,7 +194,7 @@ class TestProperty1LoggingStructure:
     ):
         """Pour toute compensation échouée (code != 200/404), logger.error est
         appelé avec admission_id, reservation_id, et le message d'erreur."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -194,7 +203,7 @@ class TestProperty1LoggingStructure:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception):
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
@@ -205,8 +214,8 @@ class TestProperty1LoggingStructure:
                 for c in error_calls
             ), f"Expected logger.error with ids, got: {error_calls}"
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -226,14 +235,14 @@ class TestProperty1LoggingStructure:
         error_msg,
     ):
         """Pour toute erreur réseau, logger.error est appelé avec les détails."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             http_client = AsyncMock(spec=httpx.AsyncClient)
             http_client.delete.side_effect = httpx.ConnectError(error_msg)
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception):
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
@@ -244,8 +253,8 @@ class TestProperty1LoggingStructure:
                 for c in error_calls
             ), f"Expected logger.error with ids"
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -274,7 +283,7 @@ class TestProperty2CancelBeforeDelete:
     ):
         """Pour toute admission non-ambulatoire avec ref_reservation,
         l'appel HTTP DELETE doit précéder la suppression de l'admission en DB."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             call_order = []
 
@@ -288,36 +297,25 @@ class TestProperty2CancelBeforeDelete:
 
             http_client.delete.side_effect = track_delete
 
-            original_query = session.query
-
-            def tracked_query(*args, **kwargs):
-                result = original_query(*args, **kwargs)
-                if args and args[0] is Admission:
-                    original_filter = result.filter
-
-                    def tracked_filter(*fargs, **fkwargs):
-                        filtered = original_filter(*fargs, **fkwargs)
-                        original_del = filtered.delete
-
-                        def tracked_del(*dargs, **dkwargs):
-                            call_order.append("db_delete")
-                            return original_del(*dargs, **dkwargs)
-
-                        filtered.delete = tracked_del
-                        return filtered
+            original_execute = session.execute
 
-                    result.filter = tracked_filter
-                return result
+            async def tracked_execute(statement, *args, **kwargs):
+                if (
+                    isinstance(statement, Delete)
+                    and statement.table.name == Admission.__tablename__
+                ):
+                    call_order.append("db_delete")
+                return await original_execute(statement, *args, **kwargs)
 
-            session.query = tracked_query
+            session.execute = tracked_execute
 
             logger = MagicMock(spec=logging.Logger)
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
 
-            session.query = original_query
+            session.execute = original_execute
 
             assert "http_delete" in call_order, "HTTP DELETE was never called"
             assert "db_delete" in call_order, "DB DELETE was never called"
@@ -325,8 +323,8 @@ class TestProperty2CancelBeforeDelete:
                 f"HTTP DELETE must happen BEFORE DB DELETE, order was: {call_order}"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -357,7 +355,7 @@ class TestProperty3RollbackOnCancelFailure:
     ):
         """Pour tout code HTTP != 200/404, le SagaEngine doit rollback
         et l'admission doit rester en base."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -366,24 +364,22 @@ class TestProperty3RollbackOnCancelFailure:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception) as exc_info:
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
 
             assert exc_info.value.status_code == 400
 
-            remaining = (
-                session.query(Admission)
-                .filter(Admission.id_admission == admission_id)
-                .first()
+            remaining = await session.scalar(
+                select(Admission).where(Admission.id_admission == admission_id)
             )
             assert remaining is not None, (
                 f"Admission {admission_id} should persist after rollback (HTTP {status_code})"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -402,31 +398,29 @@ class TestProperty3RollbackOnCancelFailure:
     ):
         """Pour toute erreur réseau, le SagaEngine doit rollback
         et l'admission doit rester en base."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             http_client = AsyncMock(spec=httpx.AsyncClient)
             http_client.delete.side_effect = httpx.ConnectError("network failure")
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception) as exc_info:
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
 
             assert exc_info.value.status_code == 400
 
-            remaining = (
-                session.query(Admission)
-                .filter(Admission.id_admission == admission_id)
-                .first()
+            remaining = await session.scalar(
+                select(Admission).where(Admission.id_admission == admission_id)
             )
             assert remaining is not None, (
                 f"Admission {admission_id} should persist after network error rollback"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -457,7 +451,7 @@ class TestProperty4OutboxInsertionOnFailure:
     ):
         """Pour tout échec HTTP, l'entrée outbox doit contenir le bon payload
         avec status PENDING et retry_count=0."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -469,7 +463,7 @@ class TestProperty4OutboxInsertionOnFailure:
             engine = _build_engine(
                 logger=logger, http_client=http_client, outbox_repo=outbox_repo
             )
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception):
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
@@ -483,8 +477,8 @@ class TestProperty4OutboxInsertionOnFailure:
             assert entry_arg.payload["admission_id"] == admission_id
             assert "endpoint" in entry_arg.payload
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -504,7 +498,7 @@ class TestProperty4OutboxInsertionOnFailure:
         error_msg,
     ):
         """Pour toute erreur réseau, l'entrée outbox doit contenir le bon payload."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             http_client = AsyncMock(spec=httpx.AsyncClient)
             http_client.delete.side_effect = httpx.ConnectError(error_msg)
@@ -514,7 +508,7 @@ class TestProperty4OutboxInsertionOnFailure:
             engine = _build_engine(
                 logger=logger, http_client=http_client, outbox_repo=outbox_repo
             )
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             with pytest.raises(Exception):
                 await engine.execute_delete_admission(session, adm, _DEFAULT_HEADERS)
@@ -527,8 +521,8 @@ class TestProperty4OutboxInsertionOnFailure:
             assert entry_arg.payload["reservation_id"] == reservation_id
             assert entry_arg.payload["admission_id"] == admission_id
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -559,7 +553,7 @@ class TestProperty7AtomicTransaction:
     ):
         """db.commit() doit être appelé exactement une fois, après toutes
         les étapes locales."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -568,15 +562,15 @@ class TestProperty7AtomicTransaction:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             commit_count = 0
             original_commit = session.commit
 
-            def counting_commit():
+            async def counting_commit():
                 nonlocal commit_count
                 commit_count += 1
-                original_commit()
+                await original_commit()
 
             session.commit = counting_commit
 
@@ -588,8 +582,8 @@ class TestProperty7AtomicTransaction:
                 f"Expected exactly 1 commit, got {commit_count}"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -609,7 +603,7 @@ class TestProperty7AtomicTransaction:
         status_code,
     ):
         """Quand la compensation échoue, db.commit() ne doit PAS être appelé."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -618,15 +612,15 @@ class TestProperty7AtomicTransaction:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             commit_count = 0
             original_commit = session.commit
 
-            def counting_commit():
+            async def counting_commit():
                 nonlocal commit_count
                 commit_count += 1
-                original_commit()
+                await original_commit()
 
             session.commit = counting_commit
 
@@ -639,8 +633,8 @@ class TestProperty7AtomicTransaction:
                 f"Expected 0 commits on failure, got {commit_count}"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -669,7 +663,7 @@ class TestProperty8FullRollbackOnException:
     ):
         """Sur toute exception pendant les étapes locales du saga,
         db.rollback() doit être appelé et aucune modification ne persiste."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = 200
@@ -678,18 +672,18 @@ class TestProperty8FullRollbackOnException:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             rollback_count = 0
             original_rollback = session.rollback
             original_flush = session.flush
 
-            def counting_rollback():
+            async def counting_rollback():
                 nonlocal rollback_count
                 rollback_count += 1
-                original_rollback()
+                await original_rollback()
 
-            def failing_flush():
+            async def failing_flush():
                 raise RuntimeError("simulated flush failure")
 
             session.rollback = counting_rollback
@@ -703,17 +697,15 @@ class TestProperty8FullRollbackOnException:
 
             assert rollback_count >= 1, "db.rollback() must be called on exception"
 
-            remaining = (
-                session.query(Admission)
-                .filter(Admission.id_admission == admission_id)
-                .first()
+            remaining = await session.scalar(
+                select(Admission).where(Admission.id_admission == admission_id)
             )
             assert remaining is not None, (
                 f"Admission {admission_id} must persist after rollback on exception"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         admission_id=admission_ids,
@@ -733,7 +725,7 @@ class TestProperty8FullRollbackOnException:
         status_code,
     ):
         """Sur échec d'annulation, rollback est appelé et l'admission persiste."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = status_code
@@ -742,15 +734,15 @@ class TestProperty8FullRollbackOnException:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             rollback_count = 0
             original_rollback = session.rollback
 
-            def counting_rollback():
+            async def counting_rollback():
                 nonlocal rollback_count
                 rollback_count += 1
-                original_rollback()
+                await original_rollback()
 
             session.rollback = counting_rollback
 
@@ -761,15 +753,13 @@ class TestProperty8FullRollbackOnException:
 
             assert rollback_count >= 1, "db.rollback() must be called on cancel failure"
 
-            remaining = (
-                session.query(Admission)
-                .filter(Admission.id_admission == admission_id)
-                .first()
+            remaining = await session.scalar(
+                select(Admission).where(Admission.id_admission == admission_id)
             )
             assert remaining is not None
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -805,7 +795,7 @@ class TestProperty9AuthHeaders:
         """Pour toute compensation HTTP, la requête doit inclure
         Authorization, X-Real-IP et X-Forwarded-For avec les valeurs
         transmises par l'appelant."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             mock_response = MagicMock()
             mock_response.status_code = 200
@@ -814,7 +804,7 @@ class TestProperty9AuthHeaders:
             logger = MagicMock(spec=logging.Logger)
 
             engine = _build_engine(logger=logger, http_client=http_client)
-            adm = _insert_admission(session, admission_id, patient_id, reservation_id)
+            adm = await _insert_admission(session, admission_id, patient_id, reservation_id)
 
             headers = {
                 "Authorization": token,
@@ -838,8 +828,8 @@ class TestProperty9AuthHeaders:
                 f"Expected X-Forwarded-For={forwarded_for}, got {sent_headers.get('X-Forwarded-For')}"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -852,7 +842,7 @@ retry_counts = st.integers(min_value=0, max_value=10)
 max_retries_values = st.integers(min_value=1, max_value=10)
 
 
-def _insert_outbox_entry(session, entry_id, retry_count, reservation_id, admission_id):
+async def _insert_outbox_entry(session, entry_id, retry_count, reservation_id, admission_id):
     """Insert an outbox entry with PENDING status for retry testing."""
     entry = OutboxEntry(
         id=entry_id,
@@ -867,8 +857,8 @@ def _insert_outbox_entry(session, entry_id, retry_count, reservation_id, admissi
         status=OutboxStatus.PENDING,
     )
     session.add(entry)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry)
     return entry
 
 
@@ -901,9 +891,9 @@ class TestProperty5RetryLifecycle:
 
         assume(retry_count < max_retries)
 
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, retry_count, reservation_id, admission_id
             )
 
@@ -917,14 +907,14 @@ class TestProperty5RetryLifecycle:
 
             result = await engine.retry_pending_compensations(session, max_retries)
 
-            session.refresh(entry)
+            await session.refresh(entry)
             assert entry.status == OutboxStatus.COMPLETED, (
                 f"Expected COMPLETED after successful retry, got {entry.status}"
             )
             assert result["successes"] >= 1
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         reservation_id=reservation_ids,
@@ -954,9 +944,9 @@ class TestProperty5RetryLifecycle:
         # After increment, retry_count+1 must still be < max_retries to stay PENDING
         assume(retry_count + 1 < max_retries)
 
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, retry_count, reservation_id, admission_id
             )
             original_retry_count = entry.retry_count
@@ -971,7 +961,7 @@ class TestProperty5RetryLifecycle:
 
             result = await engine.retry_pending_compensations(session, max_retries)
 
-            session.refresh(entry)
+            await session.refresh(entry)
             assert entry.retry_count == original_retry_count + 1, (
                 f"Expected retry_count={original_retry_count + 1}, "
                 f"got {entry.retry_count}"
@@ -982,8 +972,8 @@ class TestProperty5RetryLifecycle:
             )
             assert result["failures"] >= 1
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         reservation_id=reservation_ids,
@@ -1009,9 +999,9 @@ class TestProperty5RetryLifecycle:
         assume(retry_count < max_retries)
         assume(retry_count + 1 < max_retries)
 
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, retry_count, reservation_id, admission_id
             )
             original_retry_count = entry.retry_count
@@ -1024,12 +1014,12 @@ class TestProperty5RetryLifecycle:
 
             await engine.retry_pending_compensations(session, max_retries)
 
-            session.refresh(entry)
+            await session.refresh(entry)
             assert entry.retry_count == original_retry_count + 1
             assert entry.status == OutboxStatus.PENDING
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -1061,11 +1051,11 @@ class TestProperty6RetryThresholdReached:
         """Pour toute entrée outbox dont retry_count atteint max_retries
         après un échec, le statut doit passer à FAILED et logger.critical
         doit être appelé."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
             # Set retry_count to max_retries - 1 so that after increment
             # it reaches max_retries and triggers the threshold
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, max_retries - 1, reservation_id, admission_id
             )
 
@@ -1079,7 +1069,7 @@ class TestProperty6RetryThresholdReached:
 
             await engine.retry_pending_compensations(session, max_retries)
 
-            session.refresh(entry)
+            await session.refresh(entry)
             assert entry.status == OutboxStatus.FAILED, (
                 f"Expected FAILED when retry threshold reached, got {entry.status}"
             )
@@ -1087,8 +1077,8 @@ class TestProperty6RetryThresholdReached:
                 "logger.critical must be called when retry threshold is reached"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         reservation_id=reservation_ids,
@@ -1107,9 +1097,9 @@ class TestProperty6RetryThresholdReached:
     ):
         """Pour toute erreur réseau quand retry_count atteint le seuil,
         le statut doit passer à FAILED et logger.critical doit être appelé."""
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, max_retries - 1, reservation_id, admission_id
             )
 
@@ -1121,7 +1111,7 @@ class TestProperty6RetryThresholdReached:
 
             await engine.retry_pending_compensations(session, max_retries)
 
-            session.refresh(entry)
+            await session.refresh(entry)
             assert entry.status == OutboxStatus.FAILED, (
                 f"Expected FAILED on network error at threshold, got {entry.status}"
             )
@@ -1134,8 +1124,8 @@ class TestProperty6RetryThresholdReached:
                 str(entry.id) in c for c in critical_calls
             ), f"logger.critical should include entry id, got: {critical_calls}"
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -1173,9 +1163,9 @@ class TestProperty10ServiceTokenForRetries:
 
         assume(retry_count < max_retries)
 
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, retry_count, reservation_id, admission_id
             )
 
@@ -1205,8 +1195,8 @@ class TestProperty10ServiceTokenForRetries:
                 "Service token must not be empty after 'Bearer ' prefix"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()
 
     @given(
         reservation_id=reservation_ids,
@@ -1233,9 +1223,9 @@ class TestProperty10ServiceTokenForRetries:
 
         assume(retry_count < max_retries)
 
-        session = _fresh_session()
+        session = await _fresh_session()
         try:
-            entry = _insert_outbox_entry(
+            entry = await _insert_outbox_entry(
                 session, 1, retry_count, reservation_id, admission_id
             )
 
@@ -1264,5 +1254,5 @@ class TestProperty10ServiceTokenForRetries:
                 "Service token must not be empty after 'Bearer ' prefix"
             )
         finally:
-            session.rollback()
-            session.close()
+            await session.rollback()
+            await session.close()